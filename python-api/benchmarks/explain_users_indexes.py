@@ -0,0 +1,145 @@
+"""
+Benchmark: query plans of UserRepository query shapes before and after index reconciliation.
+
+Seeds a scratch database, runs explain() for every query shape with no secondary indexes,
+reconciles the declared indexes and runs explain() again.
+
+Usage:
+  poetry run python benchmarks/explain_users_indexes.py [--users 20000]
+
+Environment Variables:
+  MONGODB_URL  - MongoDB connection string (the scratch database 'opty_bench_indexes' is dropped afterwards)
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from dotenv import load_dotenv
+from opty_api.mongo.setup.indexes import reconcile_indexes
+from pymongo import ASCENDING
+from pymongo import AsyncMongoClient
+
+import argparse
+import asyncio
+import os
+import random
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+BENCH_DB_NAME = 'opty_bench_indexes'
+KEYSET_SORT = [('created_at', ASCENDING), ('_id', ASCENDING)]
+
+
+# --- CODE ---
+async def seed(collection, count: int) -> None:
+    """
+    Insert synthetic users.
+
+    :param collection: users collection
+    :param count: Number of users
+    """
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    await collection.insert_many([{
+        'supabase_id': f'sb-{i}',
+        'email': f'user{i}@bench.local',
+        'name': f'User {i}',
+        'role': 'supervisor' if i % 50 == 0 else 'user',
+        'is_active': random.random() > 0.1,
+        'created_at': start + timedelta(seconds=i),
+        'updated_at': start + timedelta(seconds=i),
+    } for i in range(count)])
+
+
+def query_shapes(count: int):
+    """
+    Build the query shapes issued by UserRepository.
+
+    :param count: Number of seeded users
+
+    :returns: List of (label, cursor factory)
+    """
+    middle = count // 2
+    return [
+        ('get_by_email', lambda c: c.find({'email': f'user{middle}@bench.local', 'is_active': True})),
+        ('get_by_supabase_id', lambda c: c.find({'supabase_id': f'sb-{middle}', 'is_active': True})),
+        ('get_all (skip)', lambda c: c.find({'is_active': True}).skip(middle // 2).limit(100)),
+        ('get_all_page', lambda c: c.find({'is_active': True}).sort(KEYSET_SORT).limit(101)),
+        ('get_by_role (skip)', lambda c: c.find({'role': 'supervisor', 'is_active': True}).skip(10).limit(100)),
+        ('get_by_role_page', lambda c: c.find({'role': 'supervisor', 'is_active': True}).sort(KEYSET_SORT).limit(101)),
+    ]
+
+
+def plan_stages(plan) -> str:
+    """
+    Flatten a winning plan into its stage chain.
+
+    :param plan: explain() winning plan
+
+    :returns: Stages from root to leaf, e.g. 'LIMIT <- FETCH <- IXSCAN'
+    """
+    stages = []
+    while plan:
+        stages.append(plan['stage'])
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+    return ' <- '.join(stages)
+
+
+async def report(collection, shapes) -> None:
+    """
+    Print the winning plan and examined counts of every query shape.
+
+    :param collection: users collection
+    :param shapes: Query shapes
+    """
+    print(f'  {"query":<22} {"keys":>8} {"docs":>8} {"ms":>6}  plan')
+    for label, build in shapes:
+        explain = await build(collection).explain()
+        stats = explain['executionStats']
+        winning_plan = explain['queryPlanner']['winningPlan']
+        plan = plan_stages(winning_plan.get('queryPlan', winning_plan))
+        print(f'  {label:<22} {stats["totalKeysExamined"]:>8} {stats["totalDocsExamined"]:>8} '
+              f'{stats["executionTimeMillis"]:>6}  {plan}')
+
+
+async def main(users: int) -> None:
+    """
+    Seed, explain, index and explain again.
+
+    :param users: Number of users to seed
+    """
+    client = AsyncMongoClient(os.getenv('MONGODB_URL', 'mongodb://localhost:27017'))
+    database = client[BENCH_DB_NAME]
+
+    try:
+        # Seed scratch collection
+        await client.drop_database(BENCH_DB_NAME)
+        await seed(database['users'], users)
+        shapes = query_shapes(users)
+
+        # Plans without secondary indexes
+        print(f'\nWithout indexes ({users} users):')
+        await report(database['users'], shapes)
+
+        # Plans with declared indexes
+        drift = await reconcile_indexes(database)
+        print(f'\nWith declared indexes (created: {drift["users"]["missing"]}):')
+        await report(database['users'], shapes)
+
+    # Drop scratch database
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        await client.close()
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Compare users query plans before and after indexing.')
+    parser.add_argument('--users', type=int, default=20000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.users))
@@ -0,0 +1,194 @@
+"""
+Fake Supabase Auth server for benchmarks.
+
+Implements the GoTrue endpoints the API calls, issuing and validating HS256 tokens locally with
+SUPABASE_JWT_SECRET, so load tests measure the API instead of the network and Supabase rate limits.
+
+Every email signs in with FAKE_SUPABASE_PASSWORD and gets a stable user ID (uuid5 of the email),
+so benchmark users only need a MongoDB profile. FAKE_SUPABASE_LATENCY_MS adds a fixed delay to
+every call to emulate the round trip to a hosted project. With FAKE_SUPABASE_DUPLICATE_SIGNUPS=1
+every signup creates a user of its own, even for a registered email, and deleted users are
+tracked, so registration races can be checked for leftover Supabase users.
+
+Usage:
+  poetry run uvicorn --app-dir benchmarks fake_supabase:app --port 9999
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from datetime import timezone
+from fastapi import FastAPI
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from jose import jwt
+from jose.exceptions import JWTError
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.mint_token import mint_token  # pylint: disable=C0413
+
+
+# --- TYPES ---
+from typing import Optional
+
+
+# --- CONSTANTS ---
+JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET', 'bench-secret')
+PASSWORD = os.getenv('FAKE_SUPABASE_PASSWORD', 'bench-password')
+LATENCY_SECONDS = float(os.getenv('FAKE_SUPABASE_LATENCY_MS', '0')) / 1000
+DUPLICATE_SIGNUPS = os.getenv('FAKE_SUPABASE_DUPLICATE_SIGNUPS') == '1'
+TOKEN_TTL = 3600
+
+
+# --- GLOBAL ---
+app = FastAPI(title='Fake Supabase Auth')
+
+# Emails registered through /signup
+registered = set()
+
+# Users created and not deleted since, by ID (duplicate signups only)
+users = {}
+
+
+# --- CODE ---
+def user_id(email: str) -> str:
+    """
+    Get the stable user ID of an email.
+
+    :param email: User email
+
+    :returns: UUID string
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, email))
+
+
+def user_payload(email: str, identities: bool = True, supabase_id: Optional[str] = None) -> dict:
+    """
+    Build a GoTrue user object.
+
+    :param email: User email
+    :param identities: Whether the user has an identity (False mimics an already registered email)
+    :param supabase_id: User ID, the stable one of the email by default
+
+    :returns: User JSON
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    supabase_id = supabase_id or user_id(email)
+    return {
+        'id': supabase_id,
+        'aud': 'authenticated',
+        'role': 'authenticated',
+        'email': email,
+        'app_metadata': {'provider': 'email', 'providers': ['email']},
+        'user_metadata': {},
+        'identities': [{
+            'id': supabase_id,
+            'identity_id': supabase_id,
+            'user_id': supabase_id,
+            'identity_data': {'email': email, 'sub': supabase_id},
+            'provider': 'email',
+            'created_at': now,
+            'updated_at': now,
+            'last_sign_in_at': now,
+        }] if identities else [],
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def error(status: int, code: str, message: str) -> JSONResponse:
+    """
+    Build a GoTrue error response.
+
+    :param status: HTTP status
+    :param code: GoTrue error code
+    :param message: Error message
+
+    :returns: JSON response
+    """
+    return JSONResponse({'code': status, 'error_code': code, 'msg': message}, status_code=status)
+
+
+@app.middleware('http')
+async def add_latency(request: Request, call_next):
+    """
+    Delay every call by FAKE_SUPABASE_LATENCY_MS.
+    """
+    if LATENCY_SECONDS:
+        await asyncio.sleep(LATENCY_SECONDS)
+    return await call_next(request)
+
+
+@app.get('/auth/v1/health')
+async def health():
+    """
+    GoTrue health.
+    """
+    return {'name': 'GoTrue', 'version': 'fake', 'description': 'Fake Supabase Auth for benchmarks'}
+
+
+@app.post('/auth/v1/signup')
+async def signup(request: Request):
+    """
+    Register an email; registering it twice answers like Supabase with email confirmation on.
+    """
+    email = (await request.json())['email']
+
+    # Duplicate signups: every call creates a new user
+    if DUPLICATE_SIGNUPS:
+        supabase_id = str(uuid.uuid4())
+        users[supabase_id] = email
+        return user_payload(email, supabase_id=supabase_id)
+
+    if email in registered:
+        return user_payload(email, identities=False)
+    registered.add(email)
+    return user_payload(email)
+
+
+@app.post('/auth/v1/token')
+async def token(request: Request):
+    """
+    Password grant: any email with the benchmark password signs in.
+    """
+    body = await request.json()
+    if request.query_params.get('grant_type') != 'password' or body.get('password') != PASSWORD:
+        return error(400, 'invalid_credentials', 'Invalid login credentials')
+
+    email = body['email']
+    issuer = f'{str(request.base_url).rstrip("/")}/auth/v1'
+    return {
+        'access_token': mint_token(user_id(email), JWT_SECRET, issuer=issuer, ttl=TOKEN_TTL, email=email),
+        'refresh_token': uuid.uuid4().hex,
+        'token_type': 'bearer',
+        'expires_in': TOKEN_TTL,
+        'expires_at': int(datetime.now(timezone.utc).timestamp()) + TOKEN_TTL,
+        'user': user_payload(email),
+    }
+
+
+@app.get('/auth/v1/user')
+async def get_user(request: Request):
+    """
+    Validate the bearer token and return its user.
+    """
+    access_token = request.headers.get('authorization', '').removeprefix('Bearer ')
+    try:
+        claims = jwt.decode(access_token, JWT_SECRET, algorithms=['HS256'], audience='authenticated')
+    except JWTError as e:
+        return error(401, 'bad_jwt', f'invalid JWT: {e}')
+    return user_payload(claims['email'])
+
+
+@app.delete('/auth/v1/admin/users/{supabase_id}')
+async def delete_user(supabase_id: str):
+    """
+    Delete a user.
+    """
+    users.pop(supabase_id, None)
+    return {}
@@ -0,0 +1,359 @@
+"""
+Benchmark: load test of the API against local stand-ins.
+
+Boots the fake Supabase Auth server (fake_supabase.py) and opty_api.main:app in subprocesses,
+seeds a scratch MongoDB database, then drives each scenario at a fixed concurrency and records
+throughput and latency percentiles:
+
+  login        POST /api/auth/login
+  me           GET  /api/auth/me
+  update_me    PUT  /api/auth/me
+  list_users   GET  /api/auth/users (supervisor)
+
+Results are written as JSON; passing a previous result as --baseline flags scenarios whose
+throughput dropped or latency grew by more than --max-regression percent (exit code 1).
+
+Usage:
+  poetry run python benchmarks/load.py [--requests 2000] [--concurrency 50] [--verification local]
+  poetry run python benchmarks/load.py --output benchmarks/baselines/load.json           # record baseline
+  poetry run python benchmarks/load.py --baseline benchmarks/baselines/load.json         # compare
+
+Environment Variables:
+  MONGODB_URL  - MongoDB connection string (the scratch database 'opty_bench_load' is dropped afterwards)
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from dotenv import load_dotenv
+from fake_supabase import PASSWORD
+from fake_supabase import user_id
+from pymongo import AsyncMongoClient
+from startup import free_port
+
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+BENCH_DB_NAME = 'opty_bench_load'
+JWT_SECRET = 'bench-secret-with-at-least-32-characters'
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# --- CODE ---
+def start_server(args: list, env: dict, port: int, probe: str, timeout: float = 60) -> subprocess.Popen:
+    """
+    Start a uvicorn server and wait until it answers.
+
+    :param args: uvicorn arguments selecting the app
+    :param env: Environment of the server process
+    :param port: Port to listen on
+    :param probe: Path polled until it answers 200
+    :param timeout: Seconds to wait for the server
+
+    :returns: Server process
+    """
+    server = subprocess.Popen(  # pylint: disable=R1732
+        [sys.executable, '-m', 'uvicorn', *args, '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+
+    # Poll until the first request succeeds
+    started_at = time.perf_counter()
+    with httpx.Client(base_url=f'http://127.0.0.1:{port}', timeout=1.0) as client:
+        while time.perf_counter() - started_at < timeout:
+            try:
+                if client.get(probe).status_code == 200:
+                    return server
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+
+    # Server never answered
+    server.terminate()
+    raise TimeoutError(f'{args[-1]} did not answer within {timeout}s')
+
+
+async def seed(mongodb_url: str, users: int) -> list:
+    """
+    Insert benchmark user profiles; the first one is a supervisor.
+
+    :param mongodb_url: MongoDB connection string
+    :param users: Number of users
+
+    :returns: Seeded emails
+    """
+    client = AsyncMongoClient(mongodb_url)
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    emails = [f'load{i}@bench.local' for i in range(users)]
+    try:
+        await client.drop_database(BENCH_DB_NAME)
+        await client[BENCH_DB_NAME]['users'].insert_many([{
+            'supabase_id': user_id(email),
+            'email': email,
+            'name': f'Load User {i}',
+            'phone': None,
+            'birthday': None,
+            'avatar_url': None,
+            'role': 'supervisor' if i == 0 else 'user',
+            'is_active': True,
+            'created_at': start + timedelta(seconds=i),
+            'updated_at': start + timedelta(seconds=i),
+        } for i, email in enumerate(emails)])
+    finally:
+        await client.close()
+    return emails
+
+
+async def drop(mongodb_url: str) -> None:
+    """
+    Drop the scratch database.
+
+    :param mongodb_url: MongoDB connection string
+    """
+    client = AsyncMongoClient(mongodb_url)
+    try:
+        await client.drop_database(BENCH_DB_NAME)
+    finally:
+        await client.close()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+
+    :param values: Sorted values
+    :param fraction: Percentile as a fraction (0.99 for p99)
+
+    :returns: Percentile value
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+async def run_scenario(client: httpx.AsyncClient, build, requests: int, concurrency: int) -> dict:
+    """
+    Send requests with a fixed number of concurrent workers.
+
+    :param client: HTTP client bound to the API
+    :param build: Callable(index) returning (method, url, kwargs) of a request
+    :param requests: Total number of requests
+    :param concurrency: Concurrent workers
+
+    :returns: Throughput, latency percentiles and error count
+    """
+    latencies = []
+    statuses = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            method, url, kwargs = build(index)
+            started_at = time.perf_counter()
+            try:
+                status = (await client.request(method, url, **kwargs)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started_at)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    # Run workers
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    # Summarize
+    latencies.sort()
+    return {
+        'requests': requests,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 0.90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+        'errors': sum(count for status, count in statuses.items() if status not in (200, 201)),
+        'statuses': {str(status): count for status, count in statuses.items()},
+    }
+
+
+async def drive(base_url: str, emails: list, requests: int, concurrency: int) -> dict:
+    """
+    Run every scenario against the API.
+
+    :param base_url: API URL
+    :param emails: Seeded emails, the first one is a supervisor
+    :param requests: Requests per scenario
+    :param concurrency: Concurrent workers
+
+    :returns: Results by scenario
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        # Log every user in once to get their tokens
+        tokens = {}
+        for email in emails:
+            response = await client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+            response.raise_for_status()
+            tokens[email] = {'Authorization': f'Bearer {response.json()["token"]["access_token"]}'}
+        users = [tokens[email] for email in emails]
+
+        scenarios = {
+            'login': lambda i: ('POST', '/api/auth/login',
+                                {'json': {'email': emails[i % len(emails)], 'password': PASSWORD}}),
+            'me': lambda i: ('GET', '/api/auth/me', {'headers': users[i % len(users)]}),
+            'update_me': lambda i: ('PUT', '/api/auth/me',
+                                    {'headers': users[i % len(users)], 'json': {'name': f'Load User {i % 7}'}}),
+            'list_users': lambda i: ('GET', '/api/auth/users', {'headers': users[0], 'params': {'limit': 100}}),
+        }
+
+        # Run scenarios one after the other
+        results = {}
+        for name, build in scenarios.items():
+            results[name] = await run_scenario(client, build, requests, concurrency)
+            result = results[name]
+            print(f'  {name:<12} {result["rps"]:>9.1f} req/s   p50 {result["p50_ms"]:>8.2f} ms   '
+                  f'p90 {result["p90_ms"]:>8.2f} ms   p99 {result["p99_ms"]:>8.2f} ms   errors {result["errors"]}')
+        return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Compare results with a baseline.
+
+    :param results: Results by scenario
+    :param baseline: Baseline results by scenario
+    :param max_regression: Tolerated change, in percent
+
+    :returns: Regression descriptions
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+
+        # Throughput must not drop, latencies must not grow
+        if result['rps'] < before['rps'] * (1 - max_regression / 100):
+            regressions.append(f'{name}: throughput {before["rps"]} -> {result["rps"]} req/s')
+        for metric in ('p50_ms', 'p99_ms'):
+            if result[metric] > before[metric] * (1 + max_regression / 100):
+                regressions.append(f'{name}: {metric} {before[metric]} -> {result[metric]}')
+        if result['errors'] > before['errors']:
+            regressions.append(f'{name}: errors {before["errors"]} -> {result["errors"]}')
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    Boot the stand-ins and the API, run the scenarios and report.
+
+    :param args: Parsed arguments
+
+    :returns: Exit code
+    """
+    mongodb_url = args.mongodb_url or os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
+    supabase_port, api_port = free_port(), free_port()
+    supabase_url = f'http://127.0.0.1:{supabase_port}'
+
+    # Fake Supabase environment
+    supabase_env = {
+        **os.environ,
+        'SUPABASE_JWT_SECRET': JWT_SECRET,
+        'FAKE_SUPABASE_LATENCY_MS': str(args.supabase_latency_ms),
+    }
+
+    # API environment: local stand-ins only
+    api_env = {
+        **os.environ,
+        'SUPABASE_URL': supabase_url,
+        'SUPABASE_KEY': 'bench.service.key',
+        'SUPABASE_JWT_SECRET': JWT_SECRET,
+        'AUTH_TOKEN_VERIFICATION': args.verification,
+        'MONGODB_URL': mongodb_url,
+        'MONGODB_DB_NAME': BENCH_DB_NAME,
+        'LOG_LEVEL': 'WARNING',
+        # Every virtual user logs in from 127.0.0.1: login limits would reject the run
+        'RATE_LIMIT_ENABLED': 'false',
+    }
+
+    servers = []
+    try:
+        # Seed MongoDB and boot servers
+        emails = asyncio.run(seed(mongodb_url, args.users))
+        servers.append(start_server(['--app-dir', BENCHMARKS_DIR, 'fake_supabase:app'],
+                                    supabase_env, supabase_port, '/auth/v1/health'))
+        servers.append(start_server(['opty_api.main:app'], api_env, api_port, '/api/health'))
+
+        # Run scenarios
+        print(f'\n{args.requests} requests per scenario, concurrency {args.concurrency}, '
+              f'{args.verification} token verification, Supabase latency {args.supabase_latency_ms} ms')
+        results = asyncio.run(drive(f'http://127.0.0.1:{api_port}', emails, args.requests, args.concurrency))
+
+    # Stop servers and drop scratch database
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+        asyncio.run(drop(mongodb_url))
+
+    # Machine-readable result
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'users': args.users,
+            'verification': args.verification,
+            'supabase_latency_ms': args.supabase_latency_ms,
+        },
+        'scenarios': results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f'\nresults written to {args.output}')
+
+    # Regression check
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline['scenarios'], args.max_regression)
+        if regressions:
+            print(f'\n❌ Regressions beyond {args.max_regression}% against {args.baseline}:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print(f'\n✅ No regression beyond {args.max_regression}% against {args.baseline}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Load test the API against local stand-ins.')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--users', type=int, default=200, help='Seeded users')
+    parser.add_argument('--verification', choices=['remote', 'local'], default='remote')
+    parser.add_argument('--supabase-latency-ms', type=float, default=0, help='Delay added by the fake Supabase')
+    parser.add_argument('--mongodb-url', help='Override MONGODB_URL')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare with a previous results file')
+    parser.add_argument('--max-regression', type=float, default=20, help='Tolerated change, in percent')
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Benchmark: decision overhead of the rate limiter.
+
+Measures RateLimiter.check on the in-memory backend for a single hot key, for many distinct keys
+(up to the eviction bound) and for rejected requests. With --mongodb, also measures the shared
+MongoDB backend, whose cost is one round trip per bucket.
+
+Usage:
+  poetry run python benchmarks/rate_limiter.py [--decisions 200000] [--mongodb]
+
+Environment Variables:
+  MONGODB_URL  - MongoDB connection string (the scratch database 'opty_bench_rate_limit' is dropped afterwards)
+"""
+
+# --- IMPORTS ---
+from dotenv import load_dotenv
+from opty_api.err.rate_limited_error import RateLimitedError
+from opty_api.utils.ratelimit import MemoryBackend
+from opty_api.utils.ratelimit import MongoBackend
+from opty_api.utils.ratelimit import RateLimiter
+from pymongo import AsyncMongoClient
+
+import argparse
+import asyncio
+import os
+import time
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+BENCH_DB_NAME = 'opty_bench_rate_limit'
+
+
+# --- CODE ---
+async def measure(limiter: RateLimiter, decisions: int, identity) -> float:
+    """
+    Time limiter decisions.
+
+    :param limiter: Rate limiter
+    :param decisions: Number of decisions
+    :param identity: Callable(index) returning the identities of a request
+
+    :returns: Mean decision time in microseconds
+    """
+    started_at = time.perf_counter()
+    for index in range(decisions):
+        try:
+            await limiter.check('login', identity(index))
+        except RateLimitedError:
+            pass
+    return (time.perf_counter() - started_at) / decisions * 1e6
+
+
+async def main(decisions: int, mongodb: bool) -> None:
+    """
+    Run the measurements.
+
+    :param decisions: Decisions per measurement
+    :param mongodb: Also measure the MongoDB backend
+    """
+    generous = {'login': {'ip': f'{decisions * 10}/second', 'user': f'{decisions * 10}/second'}}
+    strict = {'login': {'ip': '1/day'}}
+
+    cases = [
+        ('memory, hot key', RateLimiter(MemoryBackend(), generous),
+         lambda i: {'ip': '10.0.0.1', 'user': 'user@bench.local'}),
+        ('memory, 100k keys', RateLimiter(MemoryBackend(max_keys=100000), generous),
+         lambda i: {'ip': f'10.0.{i % 100000}', 'user': f'user{i % 100000}@bench.local'}),
+        ('memory, rejected', RateLimiter(MemoryBackend(), strict),
+         lambda i: {'ip': '10.0.0.1'}),
+    ]
+
+    # Measure in-memory backend
+    print(f'{"case":<22} {"us/decision":>12}')
+    for name, limiter, identity in cases:
+        print(f'{name:<22} {await measure(limiter, decisions, identity):>12.2f}')
+
+    # Measure MongoDB backend
+    if mongodb:
+        client = AsyncMongoClient(os.getenv('MONGODB_URL', 'mongodb://localhost:27017'))
+        try:
+            limiter = RateLimiter(MongoBackend(client[BENCH_DB_NAME]['rate_limits']), generous)
+            count = min(decisions, 2000)
+            print(f'{"mongodb, hot key":<22} {await measure(limiter, count, cases[0][2]):>12.2f}')
+        finally:
+            await client.drop_database(BENCH_DB_NAME)
+            await client.close()
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Measure rate limiter decision overhead.')
+    parser.add_argument('--decisions', type=int, default=200000)
+    parser.add_argument('--mongodb', action='store_true', help='Also measure the MongoDB backend')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.decisions, args.mongodb))
@@ -0,0 +1,186 @@
+"""
+Benchmark: concurrent registrations with duplicate emails.
+
+Fires bursts of concurrent register_user calls sharing the same email against the fake Supabase
+Auth server (fake_supabase.py, served in-process) and a scratch database with the declared unique
+indexes. The fake server gives every signup a Supabase user of its own, the worst case for the
+API: the race is decided by the profile insert alone. The check passes when exactly one profile
+per email is created, every other registration fails with AlreadyExistsError and the Supabase
+users of the losers are deleted again. For comparison it also counts how many of the concurrent
+callers would have passed the previous get_by_email pre-check.
+
+Usage:
+  poetry run python benchmarks/registration_race.py [--emails 50] [--concurrency 20]
+
+Environment Variables:
+  MONGODB_URL  - MongoDB connection string (the scratch database 'opty_bench_registration' is dropped afterwards)
+"""
+
+# --- IMPORTS ---
+from dotenv import load_dotenv
+
+import argparse
+import asyncio
+import httpx
+import os
+import sys
+import time
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+BENCH_DB_NAME = 'opty_bench_registration'
+
+# Settings read when the API and the fake server are imported: local stand-ins only
+os.environ.update({
+    'SUPABASE_URL': 'http://fake-supabase.local',
+    'SUPABASE_KEY': 'bench.service.key',
+    'MONGODB_URL': os.getenv('MONGODB_URL', 'mongodb://localhost:27017'),
+    'MONGODB_DB_NAME': BENCH_DB_NAME,
+    'LOG_LEVEL': 'WARNING',
+    'FAKE_SUPABASE_DUPLICATE_SIGNUPS': '1',
+})
+
+import fake_supabase  # pylint: disable=C0413
+
+from opty_api.app import container  # pylint: disable=C0413
+from opty_api.err.already_exists_error import AlreadyExistsError  # pylint: disable=C0413
+from opty_api.mongo.repositories.users import UserRepository  # pylint: disable=C0413
+from opty_api.mongo.setup.connection import MongoDBSetup  # pylint: disable=C0413
+from opty_api.services.auth.register import register_user  # pylint: disable=C0413
+from opty_api.utils.resilience import CallGuard  # pylint: disable=C0413
+from opty_api.utils.resilience import CircuitBreaker  # pylint: disable=C0413
+from supabase import AsyncClientOptions  # pylint: disable=C0413
+from supabase import acreate_client  # pylint: disable=C0413
+
+
+# --- CODE ---
+async def register(email: str) -> str:
+    """
+    Run one registration attempt.
+
+    :param email: Shared email address
+
+    :returns: 'created', 'conflict' or the unexpected error class name
+    """
+    try:
+        await register_user({
+            'email': email,
+            'password': fake_supabase.PASSWORD,
+            'name': 'Race User',
+            'phone': None,
+            'birthday': None,
+        })
+        return 'created'
+    except AlreadyExistsError:
+        return 'conflict'
+    except Exception as e:  # pylint: disable=W0718
+        return type(e).__name__
+
+
+async def precheck_passes(repository: UserRepository, email: str, concurrency: int) -> int:
+    """
+    Count concurrent callers a get_by_email pre-check would have let through.
+
+    :param repository: User repository
+    :param email: Email address not registered yet
+    :param concurrency: Concurrent callers
+
+    :returns: Number of callers that found no existing user
+    """
+    results = await asyncio.gather(*(repository.get_by_email(email) for _ in range(concurrency)))
+    return sum(1 for user in results if user is None)
+
+
+async def main(emails: int, concurrency: int) -> bool:
+    """
+    Hammer registration and verify uniqueness.
+
+    :param emails: Number of distinct emails
+    :param concurrency: Concurrent registrations per email
+
+    :returns: True if exactly one registration per email succeeded and no loser left a Supabase user
+    """
+    config = container['config']
+    mongodb = MongoDBSetup(db_name=BENCH_DB_NAME, mongodb_url=config.MONGODB_URL)
+    repository = UserRepository(mongodb)
+
+    # Supabase client talking to the fake server in-process
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_supabase.app))
+    supabase_client = await acreate_client(supabase_url=config.SUPABASE_URL, supabase_key=config.SUPABASE_KEY,
+                                           options=AsyncClientOptions(httpx_client=http_client))
+
+    # Services used by register_user
+    container.update({
+        'mongodb': mongodb,
+        'user_repository': repository,
+        'supabase_client': supabase_client,
+        'supabase_guard': CallGuard(
+            breaker=CircuitBreaker(failure_threshold=config.SUPABASE_BREAKER_FAILURE_THRESHOLD,
+                                   recovery_seconds=config.SUPABASE_BREAKER_RECOVERY_SECONDS),
+            timeouts=config.SUPABASE_TIMEOUTS,
+            default_timeout=config.SUPABASE_DEFAULT_TIMEOUT_SECONDS,
+            retries=config.SUPABASE_RETRIES,
+            backoff_seconds=config.SUPABASE_RETRY_BACKOFF_SECONDS,
+        ),
+    })
+
+    try:
+        # Fresh scratch database with the declared indexes
+        await mongodb.client.drop_database(BENCH_DB_NAME)
+        await mongodb.create_indexes()
+
+        # Callers the old check-then-insert flow would have let through
+        passed = await precheck_passes(repository, 'race-0@bench.local', concurrency)
+        print(f'pre-check: {passed}/{concurrency} concurrent callers saw no existing user')
+
+        # Concurrent duplicate registrations
+        started_at = time.perf_counter()
+        outcomes = await asyncio.gather(*(
+            register(f'race-{index}@bench.local')
+            for index in range(emails)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started_at
+
+        # Tally outcomes
+        counts = {outcome: outcomes.count(outcome) for outcome in set(outcomes)}
+        print(f'{len(outcomes)} registrations in {elapsed * 1000:.1f} ms: {counts}')
+
+        # Profiles per email
+        per_email = await (await mongodb.get_collection('users').aggregate([
+            {'$group': {'_id': '$email', 'count': {'$sum': 1}}},
+        ])).to_list()
+        profiles = await mongodb.get_collection('users').distinct('supabase_id')
+        print(f'profiles: {len(profiles)} (expected {emails})')
+
+        # Supabase users left: only the winners' ones
+        leftover = set(fake_supabase.users) - set(profiles)
+        print(f'supabase users: {len(fake_supabase.users)} (expected {emails}), '
+              f'{len(leftover)} left behind by failed registrations')
+
+        # Exactly one success per email, every other attempt a conflict that cleaned up after itself
+        return counts.get('created') == emails and counts.get('conflict') == emails * (concurrency - 1) \
+            and len(per_email) == emails and all(group['count'] == 1 for group in per_email) \
+            and set(fake_supabase.users) == set(profiles)
+
+    # Drop scratch database
+    finally:
+        await mongodb.client.drop_database(BENCH_DB_NAME)
+        await mongodb.close_db()
+        await http_client.aclose()
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Hammer registration with duplicate emails.')
+    parser.add_argument('--emails', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+
+    ok = asyncio.run(main(args.emails, args.concurrency))
+    print('OK' if ok else 'FAILED: uniqueness violated, unexpected errors or Supabase users left behind')
+    sys.exit(0 if ok else 1)
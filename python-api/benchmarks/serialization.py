@@ -0,0 +1,100 @@
+"""
+Benchmark: per-request JSON serialization cost of the API responses.
+
+Compares the previous response path (model_dump / jsonable_encoder / JSONResponse) with
+FastJSONResponse on representative payloads. No services are needed.
+
+Usage:
+  poetry run python benchmarks/serialization.py [--number 2000] [--users 100]
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from datetime import timezone
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from opty_api.models import ComponentHealth
+from opty_api.models import Health
+from opty_api.responders.responses import FastJSONResponse
+from opty_api.schemas.auth.login.endpoint import UserLoginResponse
+
+import argparse
+import timeit
+
+
+# --- CODE ---
+def make_user(index: int) -> dict:
+    """
+    Build a user document as returned by UserRepository.
+
+    :param index: User number
+
+    :returns: User document
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        'supabase_id': f'00000000-0000-0000-0000-{index:012d}',
+        'email': f'user{index}@example.com',
+        'name': f'User {index}',
+        'phone': '+5511999999999',
+        'birthday': '1990-01-01',
+        'avatar_url': None,
+        'created_at': now,
+        'updated_at': now,
+        'is_active': True,
+        'role': 'user',
+    }
+
+
+def make_cases(users: int) -> dict:
+    """
+    Build the (before, after) response factories of each benchmarked endpoint.
+
+    :param users: Number of users in the list payload
+
+    :returns: Case name -> (before, after) callables
+    """
+    token = {'access_token': 'x' * 600, 'refresh_token': 'y' * 40, 'token_type': 'bearer', 'expires_in': 3600}
+    user = make_user(0)
+    user_list = [make_user(index) for index in range(users)]
+    health = Health(status='OK', components={
+        'mongodb': ComponentHealth(status='OK', latency_ms=1.2),
+        'supabase': ComponentHealth(status='OK', latency_ms=35.4),
+    })
+
+    return {
+        'POST /login': (
+            lambda: JSONResponse(jsonable_encoder(UserLoginResponse(token=token, user=user).model_dump())),
+            lambda: FastJSONResponse(UserLoginResponse(token=token, user=user)),
+        ),
+        'GET /me': (
+            lambda: JSONResponse(jsonable_encoder(user)),
+            lambda: FastJSONResponse(user),
+        ),
+        f'GET /users ({users})': (
+            lambda: JSONResponse(jsonable_encoder(user_list)),
+            lambda: FastJSONResponse(user_list),
+        ),
+        'GET /health': (
+            lambda: JSONResponse(health.model_dump()),
+            lambda: FastJSONResponse(health),
+        ),
+    }
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Compare response serialization cost.')
+    parser.add_argument('--number', type=int, default=2000, help='Responses built per measurement')
+    parser.add_argument('--users', type=int, default=100, help='Users in the list payload')
+    args = parser.parse_args()
+
+    print(f'{"endpoint":<20} {"before (us)":>12} {"after (us)":>12} {"speedup":>8}')
+
+    # Measure each case, best of 5
+    for name, (before, after) in make_cases(args.users).items():
+        before_us = min(timeit.repeat(before, number=args.number, repeat=5)) / args.number * 1e6
+        after_us = min(timeit.repeat(after, number=args.number, repeat=5)) / args.number * 1e6
+        print(f'{name:<20} {before_us:>12.1f} {after_us:>12.1f} {before_us / after_us:>7.1f}x')
@@ -0,0 +1,110 @@
+"""
+Benchmark: time-to-first-request of the API.
+
+Starts uvicorn in a subprocess and measures the time until GET /api/health answers,
+then reports the startup duration the service recorded in GET /api/info.
+
+Usage:
+  poetry run python benchmarks/startup.py [--runs 5] [--mongodb-url mongodb://10.255.255.1:27017]
+
+Passing an unreachable --mongodb-url shows that boot is bounded by MONGODB_STARTUP_TIMEOUT_SECONDS
+instead of the driver's server selection timeout.
+"""
+
+# --- IMPORTS ---
+from dotenv import load_dotenv
+
+import argparse
+import httpx
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+
+# --- CODE ---
+def free_port() -> int:
+    """
+    Get a free local TCP port.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure(env: dict, timeout: float) -> dict:
+    """
+    Boot the API once and measure time-to-first-request.
+
+    :param env: Environment of the server process
+    :param timeout: Seconds to wait for the first successful request
+
+    :returns: Time to first request and reported startup duration, in seconds
+    """
+    port = free_port()
+    started_at = time.perf_counter()
+
+    # Start server
+    server = subprocess.Popen(  # pylint: disable=R1732
+        [sys.executable, '-m', 'uvicorn', 'opty_api.main:app', '--host', '127.0.0.1', '--port', str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        # Poll health until the first request succeeds
+        with httpx.Client(base_url=f'http://127.0.0.1:{port}', timeout=1.0) as client:
+            while time.perf_counter() - started_at < timeout:
+                try:
+                    response = client.get('/api/health')
+                    if response.status_code == 200:
+                        first_request = time.perf_counter() - started_at
+                        return {
+                            'first_request': first_request,
+                            'startup': client.get('/api/info').json()['extra'].get('startup_seconds'),
+                            'health': response.json()['status'],
+                        }
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+
+        # Server never answered
+        raise TimeoutError(f'Server did not answer within {timeout}s')
+
+    # Stop server
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Measure API time-to-first-request.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--mongodb-url', help='Override MONGODB_URL (e.g. an unreachable host)')
+    args = parser.parse_args()
+
+    # Server environment
+    server_env = dict(os.environ)
+    if args.mongodb_url:
+        server_env['MONGODB_URL'] = args.mongodb_url
+
+    # Measure runs
+    results = []
+    for run in range(args.runs):
+        result = measure(server_env, args.timeout)
+        results.append(result)
+        print(f'  run {run + 1}: first request {result["first_request"] * 1000:8.1f} ms   '
+              f'startup {result["startup"] * 1000:8.1f} ms   health {result["health"]}')
+
+    # Summary
+    print(f'\nmedian time-to-first-request: '
+          f'{statistics.median(r["first_request"] for r in results) * 1000:.1f} ms over {args.runs} runs')
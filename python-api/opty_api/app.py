@@ -5,17 +5,23 @@ Global service objects.
 # --- IMPORTS ---
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from opty_api.middlewares.deadline import DeadlineMiddleware
+from opty_api.middlewares.metrics import MetricsMiddleware
+from opty_api.middlewares.request_context import RequestContextMiddleware
 from opty_api.models import Config
 from opty_api.models import Health
 from opty_api.models import Info
+from opty_api.responders.responses import FastJSONResponse
 from opty_api.schemas.container import Container
+from opty_api.utils.log import setup_logging
 
 
 # --- CODE ---
 # FastAPI app
 app = FastAPI(
     title = 'Opty-Api',
-    description = 'This is a REST API backend for OPTY project'
+    description = 'This is a REST API backend for OPTY project',
+    default_response_class = FastJSONResponse,
 )
 
 # CORS Configuration
@@ -25,11 +31,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['X-Next-Cursor', 'Retry-After'],
 )
 
+# Request metrics
+app.add_middleware(MetricsMiddleware)
+
+# Request correlation and access log
+app.add_middleware(RequestContextMiddleware)
+
 # Configuration
 config = Config()
 
+# Request deadlines
+app.add_middleware(DeadlineMiddleware,
+                   default_seconds=config.REQUEST_DEADLINE_SECONDS,
+                   budgets=config.REQUEST_DEADLINES)
+
+# Logging
+log_handler = setup_logging(level=config.LOG_LEVEL, queue_size=config.LOG_QUEUE_SIZE, sampling=config.LOG_SAMPLING)
+
 # Info
 info = Info(
     name = app.title,
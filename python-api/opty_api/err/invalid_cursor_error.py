@@ -0,0 +1,14 @@
+"""
+Invalid cursor Error.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.opty_api_error import OptyApiError
+
+
+# --- CODE ---
+class InvalidCursorError(OptyApiError):
+    """
+    Invalid cursor Error.
+    """
+    message = 'Invalid Cursor Error'
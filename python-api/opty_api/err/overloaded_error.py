@@ -0,0 +1,26 @@
+"""
+Overloaded Error.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.opty_api_error import OptyApiError
+
+
+# --- CODE ---
+class OverloadedError(OptyApiError):
+    """
+    Overloaded Error.
+    """
+    message = 'Service Overloaded'
+
+    def __init__(self, detail: str, retry_after: float) -> None:
+        """
+        Initialize an overloaded error.
+
+        :param detail: Which backend was saturated.
+        :param retry_after: Seconds the client should wait before retrying.
+
+        :returns: None.
+        """
+        super().__init__(detail, retry_after)
+        self.retry_after = retry_after
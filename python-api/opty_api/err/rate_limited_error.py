@@ -0,0 +1,26 @@
+"""
+Rate limited Error.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.opty_api_error import OptyApiError
+
+
+# --- CODE ---
+class RateLimitedError(OptyApiError):
+    """
+    Rate limited Error.
+    """
+    message = 'Too Many Requests'
+
+    def __init__(self, detail: str, retry_after: float) -> None:
+        """
+        Initialize a rate limited error.
+
+        :param detail: Which limit was hit.
+        :param retry_after: Seconds until the request would be allowed.
+
+        :returns: None.
+        """
+        super().__init__(detail, retry_after)
+        self.retry_after = retry_after
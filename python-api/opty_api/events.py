@@ -7,43 +7,228 @@ from fastapi import FastAPI
 from opty_api import routers
 from opty_api.app import container
 from opty_api.app import health
+from opty_api.app import info
+from opty_api.app import log_handler
 from opty_api.mongo.repositories.users import UserRepository
 from opty_api.mongo.setup.connection import MongoDBSetup
+from opty_api.mongo.watchers.users import UserChangeWatcher
+from opty_api.utils.auth import token_flight
+from opty_api.utils.bulkhead import Bulkhead
+from opty_api.utils.cache import UserCache
+from opty_api.utils.http import ConnectionStats
+from opty_api.utils.http import build_http_client
+from opty_api.utils.log import shutdown_logging
+from opty_api.utils.metrics import registry
+from opty_api.utils.ratelimit import MemoryBackend
+from opty_api.utils.ratelimit import MongoBackend
+from opty_api.utils.ratelimit import RateLimiter
+from opty_api.utils.resilience import CallGuard
+from opty_api.utils.resilience import CircuitBreaker
+from opty_api.utils.tokens import LocalTokenVerifier
+from supabase import AsyncClientOptions
 from supabase import acreate_client
 
+import asyncio
+import time
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+
 
 # --- CODE ---
 async def on_startup(app: FastAPI) -> None:
     """
     Initialize the service on startup.
+    Backend initialization runs concurrently and never blocks the event loop.
     """
+    started_at = time.perf_counter()
+    config = container['config']
+
     # Mount routers
     routers.mount(app)
 
     # Initialize MongoDB
-    mongodb = MongoDBSetup(db_name=container['config'].MONGODB_DB_NAME,
-                           mongodb_url=container['config'].MONGODB_URL,)
+    mongodb = MongoDBSetup(db_name=config.MONGODB_DB_NAME,
+                           mongodb_url=config.MONGODB_URL,
+                           client_options=build_mongodb_options())
+
+    # Initialize resolved token cache
+    user_cache = None
+    if config.USER_CACHE_ENABLED:
+        user_cache = UserCache(max_size=config.USER_CACHE_MAX_SIZE,
+                               ttl_seconds=config.USER_CACHE_TTL_SECONDS)
+
+    # Initialize backend bulkheads
+    mongodb_bulkhead, supabase_bulkhead = None, None
+    if config.BULKHEAD_ENABLED:
+        mongodb_bulkhead = Bulkhead('mongodb',
+                                    max_concurrency=config.MONGODB_BULKHEAD_CONCURRENCY,
+                                    max_queue=config.MONGODB_BULKHEAD_QUEUE,
+                                    queue_timeout=config.BULKHEAD_QUEUE_TIMEOUT_SECONDS,
+                                    retry_after=config.BULKHEAD_RETRY_AFTER_SECONDS)
+        supabase_bulkhead = Bulkhead('supabase',
+                                     max_concurrency=config.SUPABASE_BULKHEAD_CONCURRENCY,
+                                     max_queue=config.SUPABASE_BULKHEAD_QUEUE,
+                                     queue_timeout=config.BULKHEAD_QUEUE_TIMEOUT_SECONDS,
+                                     retry_after=config.BULKHEAD_RETRY_AFTER_SECONDS)
 
     # Initialize repositories
-    user_repository = UserRepository(mongodb)
+    # Shared lookups serve several requests: they get the default budget rather than their first caller's
+    user_repository = UserRepository(mongodb,
+                                     user_cache=user_cache,
+                                     bulkhead=mongodb_bulkhead,
+                                     lookup_timeout=config.REQUEST_DEADLINE_SECONDS or None)
+
+    # Initialize rate limiter
+    rate_limiter = None
+    if config.RATE_LIMIT_ENABLED:
+        backend = MongoBackend(mongodb.get_collection('rate_limits')) if config.RATE_LIMIT_BACKEND == 'mongodb' \
+            else MemoryBackend(max_keys=config.RATE_LIMIT_MAX_KEYS)
+        rate_limiter = RateLimiter(backend, config.RATE_LIMIT_RULES)
+
+    # Initialize Supabase call guard
+    supabase_guard = CallGuard(
+        breaker=CircuitBreaker(failure_threshold=config.SUPABASE_BREAKER_FAILURE_THRESHOLD,
+                               recovery_seconds=config.SUPABASE_BREAKER_RECOVERY_SECONDS),
+        timeouts=config.SUPABASE_TIMEOUTS,
+        default_timeout=config.SUPABASE_DEFAULT_TIMEOUT_SECONDS,
+        retries=config.SUPABASE_RETRIES,
+        backoff_seconds=config.SUPABASE_RETRY_BACKOFF_SECONDS,
+        bulkhead=supabase_bulkhead,
+    )
+
+    # Initialize local token verifier
+    token_verifier = None
+    if config.AUTH_TOKEN_VERIFICATION == 'local':
+        token_verifier = build_token_verifier()
 
-    # Initialize supabase client
-    supabase_client = await acreate_client(supabase_url=container['config'].SUPABASE_URL,
-                                           supabase_key=container['config'].SUPABASE_KEY)
+    # Shared HTTP client for outbound calls (Supabase and readiness probe)
+    http_connection_stats = ConnectionStats()
+    http_client = build_http_client(config, http_connection_stats)
+
+    # Build indexes, create supabase client and fetch signing keys concurrently
+    mongodb_ready, supabase_client, _ = await asyncio.gather(
+        mongodb.initialize(timeout=config.MONGODB_STARTUP_TIMEOUT_SECONDS),
+        asyncio.wait_for(acreate_client(supabase_url=config.SUPABASE_URL, supabase_key=config.SUPABASE_KEY,
+                                        options=AsyncClientOptions(httpx_client=http_client)),
+                         timeout=config.SUPABASE_STARTUP_TIMEOUT_SECONDS),
+        token_verifier.start() if token_verifier else asyncio.sleep(0),
+    )
+
+    # Tail user changes of every process to keep the cache fresh
+    user_watcher = None
+    if user_cache and config.USER_CACHE_WATCH_ENABLED:
+        user_watcher = UserChangeWatcher(mongodb.get_collection('users'), user_cache)
+        user_watcher.start()
 
     # Update container
     container.update({
         'mongodb': mongodb,
         'user_repository': user_repository,
         'supabase_client': supabase_client,
+        'supabase_guard': supabase_guard,
+        'http_client': http_client,
+        'token_verifier': token_verifier,
+        'user_cache': user_cache,
+        'user_watcher': user_watcher,
+        'rate_limiter': rate_limiter,
     })
 
-    # Set app health as OK
-    health.status = 'OK'
+    # Export in-process stats on the metrics endpoint
+    registry.register_collector('mongo_pool', mongodb.pool_monitor.stats)
+    registry.register_collector('log', lambda: {'dropped': log_handler.dropped})
+    registry.register_collector('token_flight', token_flight.stats)
+    registry.register_collector('user_lookup_flight', user_repository.lookups.stats)
+    registry.register_collector('supabase_breaker', supabase_guard.breaker.stats)
+    registry.register_collector('http_client', http_connection_stats.stats)
+    if user_cache:
+        registry.register_collector('user_cache', user_cache.stats)
+    if user_watcher:
+        registry.register_collector('user_watcher', user_watcher.stats)
+    if config.BULKHEAD_ENABLED:
+        registry.register_collector('mongodb_bulkhead', mongodb_bulkhead.stats)
+        registry.register_collector('supabase_bulkhead', supabase_bulkhead.stats)
+
+    # Record startup duration
+    info.extra['startup_seconds'] = round(time.perf_counter() - started_at, 3)
+
+    # Set app health: MongoDB not ready yet is degraded, not fatal
+    health.status = 'OK' if mongodb_ready else 'WARNING'
 
 
-def on_shutdown(app: FastAPI) -> None:  #pylint: disable=W0613
+async def on_shutdown(app: FastAPI) -> None:  #pylint: disable=W0613
     """
     Run on service shutdown.
     """
-    pass
+
+    # Stop JWKS refresh
+    if container.get('token_verifier'):
+        container['token_verifier'].stop()
+
+    # Stop user change stream
+    if container.get('user_watcher'):
+        await container['user_watcher'].stop()
+
+    # Close MongoDB connections
+    if container.get('mongodb'):
+        await container['mongodb'].close_db()
+
+    # Close outbound HTTP connections (shared with the Supabase client)
+    if container.get('http_client'):
+        await container['http_client'].aclose()
+
+    # Flush pending log records
+    shutdown_logging()
+
+
+def build_mongodb_options() -> Dict[str, Any]:
+    """
+    Build MongoDB driver options from configuration.
+
+    :returns: AsyncMongoClient keyword options
+    """
+    config = container['config']
+
+    # Pool sizing and timeouts
+    options = {
+        'maxPoolSize': config.MONGODB_MAX_POOL_SIZE,
+        'minPoolSize': config.MONGODB_MIN_POOL_SIZE,
+        'serverSelectionTimeoutMS': config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        'readPreference': config.MONGODB_READ_PREFERENCE,
+    }
+
+    # Optional settings: keep driver defaults when unset
+    if config.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options['maxIdleTimeMS'] = config.MONGODB_MAX_IDLE_TIME_MS
+    if config.MONGODB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options['waitQueueTimeoutMS'] = config.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+    if config.MONGODB_COMPRESSORS:
+        options['compressors'] = config.MONGODB_COMPRESSORS
+
+    # Return options
+    return options
+
+
+def build_token_verifier() -> LocalTokenVerifier:
+    """
+    Build the local token verifier from configuration.
+
+    :returns: LocalTokenVerifier instance
+    """
+    config = container['config']
+
+    # Supabase Auth base URL
+    auth_url = f'{config.SUPABASE_URL.rstrip("/")}/auth/v1'
+
+    # Build verifier
+    return LocalTokenVerifier(
+        algorithms=config.SUPABASE_JWT_ALGORITHMS,
+        audience=config.SUPABASE_JWT_AUDIENCE,
+        issuer=config.SUPABASE_JWT_ISSUER or auth_url,
+        secret=config.SUPABASE_JWT_SECRET,
+        jwks_url=config.SUPABASE_JWKS_URL or f'{auth_url}/.well-known/jwks.json',
+        jwks_refresh_seconds=config.SUPABASE_JWKS_REFRESH_SECONDS,
+        leeway_seconds=config.SUPABASE_JWT_LEEWAY_SECONDS,
+    )
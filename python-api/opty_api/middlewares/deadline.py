@@ -0,0 +1,68 @@
+"""
+Request deadline middleware.
+"""
+
+# --- IMPORTS ---
+from opty_api.utils.context import set_request_deadline
+
+import time
+
+
+# --- TYPES ---
+from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from typing import Dict
+from typing import Optional
+
+
+# --- CODE ---
+class DeadlineMiddleware:
+    """
+    Gives every request a time budget, the deadline MongoDB and Supabase calls take their timeouts from.
+    Budgets are set per path prefix (the longest matching prefix wins); a budget of 0 disables the deadline.
+    """
+
+    def __init__(self, app: ASGIApp, default_seconds: float, budgets: Optional[Dict[str, float]] = None) -> None:
+        """
+        Initialize the middleware.
+
+        :param app: Wrapped ASGI application
+        :param default_seconds: Budget of paths without their own, 0 for none
+        :param budgets: Budget in seconds per path prefix
+        """
+        self.app = app
+        self.default_seconds = default_seconds
+        self.budgets = sorted((budgets or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+
+    def budget(self, path: str) -> float:
+        """
+        Get the budget of a request path.
+
+        :param path: Request path
+
+        :returns: Budget in seconds, 0 for none
+        """
+        for prefix, seconds in self.budgets:
+            if path.startswith(prefix):
+                return seconds
+        return self.default_seconds
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle an ASGI call.
+        """
+
+        # Not an HTTP request: pass through
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # Set request deadline
+        seconds = self.budget(scope['path'])
+        set_request_deadline(time.monotonic() + seconds if seconds > 0 else None)
+
+        await self.app(scope, receive, send)
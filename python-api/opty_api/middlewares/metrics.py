@@ -0,0 +1,67 @@
+"""
+Request metrics middleware.
+"""
+
+# --- IMPORTS ---
+from opty_api.utils.metrics import HTTP_REQUEST_DURATION
+from opty_api.utils.metrics import HTTP_REQUESTS_IN_FLIGHT
+
+import time
+
+
+# --- TYPES ---
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+
+# --- CODE ---
+class MetricsMiddleware:
+    """
+    Records in-flight requests and latency per route template and status code.
+    Requests that match no route share a single label so unknown paths cannot blow up cardinality.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the middleware.
+
+        :param app: Wrapped ASGI application
+        """
+        self.app = app
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle an ASGI call.
+        """
+
+        # Not an HTTP request: pass through
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started_at = time.perf_counter()
+
+        # Capture response status
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        # Record latency under the matched route template
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get('route')
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started_at,
+                                          scope['method'],
+                                          getattr(route, 'path', '<unmatched>'),
+                                          str(status))
@@ -0,0 +1,78 @@
+"""
+Request context middleware.
+"""
+
+# --- IMPORTS ---
+from opty_api.utils.context import start_request
+
+import logging
+import time
+import uuid
+
+
+# --- TYPES ---
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+class RequestContextMiddleware:
+    """
+    Assigns a correlation ID to every request and logs its outcome.
+    The ID is taken from the 'X-Request-ID' header when present and echoed in the response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the middleware.
+
+        :param app: Wrapped ASGI application
+        """
+        self.app = app
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle an ASGI call.
+        """
+
+        # Not an HTTP request: pass through
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # Get or create request ID
+        headers = dict(scope['headers'])
+        request_id = headers.get(b'x-request-id', b'').decode('latin-1')[:128] or uuid.uuid4().hex
+        started_at = time.perf_counter()
+        start_request(request_id, started_at)
+
+        status = 500
+
+        # Echo request ID and capture response status
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                message['headers'] = [*message.get('headers', []), (b'x-request-id', request_id.encode('latin-1'))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        # Log request outcome
+        finally:
+            route = scope.get('route')
+            logger.info('request completed', extra={
+                'method': scope['method'],
+                'route': getattr(route, 'path', scope['path']),
+                'status': status,
+                'latency_ms': round((time.perf_counter() - started_at) * 1000, 2),
+            })
@@ -10,7 +10,9 @@ from pydantic_settings import BaseSettings
 # --- TYPES ---
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Literal
+from typing import Optional
 
 
 # --- CODE ---
@@ -27,6 +29,131 @@ class Config(BaseSettings):
     MONGODB_URL: str
     MONGODB_DB_NAME: str
 
+    # MongoDB driver settings (sized per worker process)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGODB_COMPRESSORS: Optional[str] = None
+    MONGODB_READ_PREFERENCE: Literal['primary', 'primaryPreferred', 'secondary', 'secondaryPreferred',
+                                     'nearest'] = 'primary'
+
+    # Startup settings
+    MONGODB_STARTUP_TIMEOUT_SECONDS: float = 10
+    SUPABASE_STARTUP_TIMEOUT_SECONDS: float = 10
+
+    # Request deadline settings
+    # Budget in seconds per path prefix (longest prefix wins), 0 disables the deadline; MongoDB commands get
+    # what is left as maxTimeMS and Supabase timeouts are capped by it
+    REQUEST_DEADLINE_SECONDS: float = 10
+    REQUEST_DEADLINES: Dict[str, float] = {
+        '/api/auth/register': 20,
+        '/api/auth/users/export': 0,
+        '/api/auth/users/bulk': 30,
+        '/api/health': 0,
+        '/api/metrics': 0,
+    }
+
+    # Supabase call settings
+    # Timeouts are per operation (sign_up, sign_in_with_password, sign_in_with_oauth, get_user, admin.delete_user);
+    # only idempotent calls (get_user) are retried. The breaker opens after consecutive timeouts or 5xx errors
+    # and fails calls fast until a trial call succeeds SUPABASE_BREAKER_RECOVERY_SECONDS later
+    SUPABASE_TIMEOUTS: Dict[str, float] = {'sign_up': 10, 'get_user': 3}
+    SUPABASE_DEFAULT_TIMEOUT_SECONDS: float = 5
+    SUPABASE_RETRIES: int = 2
+    SUPABASE_RETRY_BACKOFF_SECONDS: float = 0.1
+    SUPABASE_BREAKER_FAILURE_THRESHOLD: int = 5
+    SUPABASE_BREAKER_RECOVERY_SECONDS: float = 30
+    # Compensating calls (deleting the Supabase user of a failed registration) ignore the request deadline
+    SUPABASE_COMPENSATION_TIMEOUT_SECONDS: float = 10
+
+    # Bulkhead settings (per worker process)
+    # Calls in flight per backend and callers allowed to wait for a slot; callers beyond the queue, or waiting
+    # longer than BULKHEAD_QUEUE_TIMEOUT_SECONDS, get 503 with Retry-After. Keep the MongoDB concurrency below
+    # MONGODB_MAX_POOL_SIZE and the Supabase one below HTTP_CLIENT_MAX_CONNECTIONS
+    BULKHEAD_ENABLED: bool = True
+    MONGODB_BULKHEAD_CONCURRENCY: int = 80
+    MONGODB_BULKHEAD_QUEUE: int = 200
+    SUPABASE_BULKHEAD_CONCURRENCY: int = 50
+    SUPABASE_BULKHEAD_QUEUE: int = 100
+    BULKHEAD_QUEUE_TIMEOUT_SECONDS: float = 2
+    BULKHEAD_RETRY_AFTER_SECONDS: float = 1
+
+    # Outbound HTTP client settings (shared by the Supabase client and readiness probe, per worker process)
+    # Keep-alive connections are reused across requests; HTTP/2 multiplexes calls over one connection
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 60
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 3
+    HTTP_CLIENT_READ_TIMEOUT_SECONDS: float = 10
+    HTTP_CLIENT_WRITE_TIMEOUT_SECONDS: float = 10
+    HTTP_CLIENT_POOL_TIMEOUT_SECONDS: float = 3
+
+    # Readiness check settings
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    HEALTH_CACHE_TTL_SECONDS: float = 5
+
+    # Logging settings
+    # LOG_SAMPLING keeps a fraction of records per level, e.g. {"INFO": 0.1}
+    LOG_LEVEL: str = 'INFO'
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLING: Dict[str, float] = {}
+
+    # Access token verification settings
+    # 'remote' validates every token against Supabase, 'local' verifies the JWT in-process
+    AUTH_TOKEN_VERIFICATION: Literal['remote', 'local'] = 'remote'
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    SUPABASE_JWT_ALGORITHMS: List[str] = ['HS256']
+    SUPABASE_JWT_AUDIENCE: str = 'authenticated'
+    SUPABASE_JWT_ISSUER: Optional[str] = None
+    SUPABASE_JWT_LEEWAY_SECONDS: int = 0
+    SUPABASE_JWKS_URL: Optional[str] = None
+    SUPABASE_JWKS_REFRESH_SECONDS: int = 600
+
+    # Resolved token cache settings
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60
+    # Invalidate entries from a change stream on 'users' so changes made by other workers and scripts apply at
+    # once (needs a replica set; without one, entries only expire by TTL)
+    USER_CACHE_WATCH_ENABLED: bool = True
+
+    # Pagination settings
+    USERS_PAGE_MAX_LIMIT: int = 500
+
+    # Export settings
+    # Documents fetched per cursor round trip and written per streamed chunk
+    USERS_EXPORT_BATCH_SIZE: int = 500
+
+    # Rate limiting settings
+    # Rules are '<requests>/<second|minute|hour|day>' per scope ('ip', 'user' = submitted email) per route;
+    # 'mongodb' shares buckets between workers and replicas
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal['memory', 'mongodb'] = 'memory'
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_RULES: Dict[str, Dict[str, str]] = {
+        'login': {'ip': '30/minute', 'user': '5/minute'},
+        'register': {'ip': '10/hour', 'user': '3/hour'},
+        'oauth': {'ip': '30/minute'},
+    }
+
+    # Production server settings (python -m opty_api.server)
+    # SERVER_WORKERS defaults to the number of usable CPU cores; SERVER_MAX_REQUESTS=0 disables recycling
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 80
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_PRELOAD: bool = True
+    # Proxies trusted to report the client address in X-Forwarded-For (comma-separated IPs or networks, '*' for
+    # any); rate limits key on that address, so set it to the load balancer's address when running behind one
+    SERVER_FORWARDED_ALLOW_IPS: str = '127.0.0.1'
+
     class Config:
         """
         Pydantic settings configuration.
@@ -34,12 +161,24 @@ class Config(BaseSettings):
         env_file = '.env'
 
 
+# Component health model
+class ComponentHealth(BaseModel):
+    """
+    Health of a backend dependency.
+    """
+    status: Literal['OK', 'WARNING', 'FAILURE', 'UNKNOWN'] = 'UNKNOWN'
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    circuit: Optional[Literal['closed', 'half_open', 'open']] = None
+
+
 # Health model
 class Health(BaseModel):
     """
     System health status.
     """
     status: Literal['OK', 'WARNING', 'FAILURE', 'UNKNOWN'] = 'UNKNOWN'
+    components: Dict[str, ComponentHealth] = {}
 
 
 # Info model
@@ -55,5 +194,6 @@ class Info(BaseModel):
 
 # --- Forward references ---
 Config.model_rebuild()
+ComponentHealth.model_rebuild()
 Health.model_rebuild()
 Info.model_rebuild()
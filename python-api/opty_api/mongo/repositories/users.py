@@ -5,21 +5,43 @@ User repository for MongoDB operations.
 # --- IMPORTS ---
 from datetime import datetime
 from datetime import timezone
+from opty_api.err.already_exists_error import AlreadyExistsError
 from opty_api.err.mongodb_unavailable_error import MongoUnavailableError
 from opty_api.err.not_found_error import NotFoundError
+from opty_api.schemas.user import User
+from opty_api.utils.bulkhead import Bulkhead
+from opty_api.utils.bulkhead import bulkheaded
+from opty_api.utils.cache import UserCache
+from opty_api.utils.context import get_request_user
+from opty_api.utils.context import is_request_user_fresh
+from opty_api.utils.context import set_request_user
+from opty_api.utils.cursor import decode_cursor
+from opty_api.utils.cursor import encode_cursor
+from opty_api.utils.deadline import mongo_deadline
+from opty_api.utils.metrics import MONGO_OPERATION_DURATION
+from opty_api.utils.metrics import timed
+from opty_api.utils.singleflight import SingleFlight
+from pymongo import ASCENDING
+from pymongo import ReturnDocument
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 
 # --- TYPES ---
-from opty_api.schemas.user import User
 from typing import Any
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 
 # --- CONSTANTS ---
 PROJECTION = {'_id': 0}
 
+# Maximum number of users addressed per round trip by bulk operations
+BULK_BATCH_SIZE = 1000
+
 
 # --- CODE ---
 class UserRepository:
@@ -28,13 +50,25 @@ class UserRepository:
     Handles all database interactions for the users collection.
     """
 
-    def __init__(self, client) -> None:
+    def __init__(self,
+                 client,
+                 user_cache: Optional[UserCache] = None,
+                 bulkhead: Optional[Bulkhead] = None,
+                 lookup_timeout: Optional[float] = None) -> None:
         """
         Initialize UserRepository with MongoDB client.
 
         :param client: MongoDB client instance
+        :param user_cache: Token cache to invalidate when a user changes
+        :param bulkhead: Concurrency limit of the operations, None for unbounded
+        :param lookup_timeout: Deadline of a shared lookup, in seconds, None for none
         """
         self.client = client
+        self.user_cache = user_cache
+        self.bulkhead = bulkhead
+
+        # Concurrent lookups of the same user share one query
+        self.lookups = SingleFlight(timeout=lookup_timeout)
 
 
     @property
@@ -45,14 +79,66 @@ class UserRepository:
         return self.client.get_collection('users')
 
 
+    def __invalidate(self, supabase_id: Optional[str] = None, email: Optional[str] = None) -> None:
+        """
+        Drop cached sessions of a changed user.
+
+        :param supabase_id: Supabase user ID
+        :param email: User email address
+        """
+        if self.user_cache:
+            self.user_cache.invalidate(supabase_id=supabase_id, email=email)
+
+        # Lookups in flight may predate the change: later callers must not join them
+        if supabase_id is not None:
+            self.lookups.discard(lambda key: key[0] == supabase_id)
+
+
+    @staticmethod
+    def __request_user(field: str, value: str, projection: Optional[Dict[str, int]]) -> Optional[User]:
+        """
+        Get the request identity if it is the user being looked up.
+
+        :param field: Lookup field ('supabase_id' or 'email')
+        :param value: Lookup value
+        :param projection: Requested projection, only the default one can be served
+
+        :returns: User already read from MongoDB for this request, None otherwise
+        """
+        user = get_request_user()
+        if user and is_request_user_fresh() and projection == PROJECTION and user.get(field) == value:
+            return user
+        return None
+
+
+    @staticmethod
+    def __refresh_request_user(field: str, value: str, user: Optional[User]) -> None:
+        """
+        Replace the request identity after its document changed.
+
+        :param field: Lookup field ('supabase_id' or 'email')
+        :param value: Lookup value
+        :param user: Updated user, None if it was deleted
+        """
+        request_user = get_request_user()
+        if request_user and request_user.get(field) == value:
+            set_request_user(user)
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def add_user(self, user: User) -> User:
         """
         Add a new user in MongoDB.
+        Uniqueness of email and supabase_id is enforced by the unique indexes, so concurrent
+        inserts of the same user cannot both succeed.
 
         :param user: User model instance
 
         :returns User: The created user
 
+        :raises AlreadyExistsError: If a user with the same email or Supabase ID exists
         :raises MongoUnavailableError: If insert fails
         """
         try:
@@ -67,14 +153,26 @@ class UserRepository:
             # insert user into MongoDB
             await self.__collection.insert_one(user)
 
+            # drop the generated _id, like every other read
+            user.pop('_id', None)
+
             # return the created user
             return user
 
+        # unique index violated: raise custom error
+        except DuplicateKeyError as e:
+            if 'email' in (e.details or {}).get('keyPattern', {}):
+                raise AlreadyExistsError('User with this email already exists') from e
+            raise AlreadyExistsError('User profile already exists') from e
+
         # error in create user: raise custom error
         except Exception as e:
             raise MongoUnavailableError(f'Failed to create user: {str(e)}') from e
 
 
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def get_by_email(self, email: str, projection: Optional[Dict[str, int]] = PROJECTION) -> Optional[User]:  # pylint: disable=W0102
         """
         Find user by email.
@@ -85,7 +183,14 @@ class UserRepository:
         :returns: User if found, None otherwise
 
         :raises MongoUnavailableError: If query fails
+        :raises DeadlineExceededError: If the request deadline passes before the lookup completes
         """
+
+        # user already resolved for this request: skip the read
+        request_user = self.__request_user('email', email, projection)
+        if request_user:
+            return request_user
+
         try:
 
             # query MongoDB for user by email
@@ -103,6 +208,7 @@ class UserRepository:
             raise MongoUnavailableError(f'Failed to find user by email: {str(e)}') from e
 
 
+    @timed(MONGO_OPERATION_DURATION)
     async def get_by_supabase_id(self,  # pylint: disable=W0102
                                  supabase_id: str,
                                  projection: Optional[Dict[str, int]] = PROJECTION) -> Optional[User]:
@@ -114,6 +220,35 @@ class UserRepository:
 
         :returns: User if found, None otherwise
 
+        :raises MongoUnavailableError: If query fails
+        :raises DeadlineExceededError: If the request deadline passes before the lookup completes
+        """
+
+        # user already resolved for this request: skip the read
+        request_user = self.__request_user('supabase_id', supabase_id, projection)
+        if request_user:
+            return request_user
+
+        # join an identical lookup already in flight
+        key = (supabase_id, tuple(sorted(projection.items())) if projection else None)
+        user_data = await self.lookups.do(key, lambda: self.__find_by_supabase_id(supabase_id, projection))
+
+        # return a copy per caller, the document is shared by every waiter
+        return dict(user_data) if user_data else None
+
+
+    @bulkheaded
+    @mongo_deadline
+    async def __find_by_supabase_id(self, supabase_id: str, projection: Optional[Dict[str, int]]) -> Optional[User]:
+        """
+        Query an active user by Supabase ID.
+        Runs as a shared lookup, under the lookup's own deadline and bulkhead slot.
+
+        :param supabase_id: Supabase user ID
+        :param projection: Fields to exclude in the result
+
+        :returns: User if found, None otherwise
+
         :raises MongoUnavailableError: If query fails
         """
         try:
@@ -132,6 +267,9 @@ class UserRepository:
             raise MongoUnavailableError(f'Failed to find user by Supabase ID: {str(e)}') from e
 
 
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def update_by_supabase_id(self, supabase_id: str, update_data: Dict[str, Any]) -> User:
         """
         Update user by Supabase ID.
@@ -139,40 +277,43 @@ class UserRepository:
         :param supabase_id: Supabase user ID
         :param update_data: Dictionary with fields to update
 
-        :returns: Updated User if found, None otherwise
+        :returns: Updated User
 
         :raises NotFoundError: If user not found
         :raises MongoUnavailableError: If update fails
         """
         try:
 
-            # get user by supabase_id
-            user = await self.get_by_supabase_id(supabase_id)
-
-            # user not found: raise custom error
-            if not user:
-                raise NotFoundError(f'User with supabase_id {supabase_id} not found.')
-
             # update timestamp
             update_data['updated_at'] = datetime.now(timezone.utc)
 
-            # Update in MongoDB
-            await self.__collection.update_one(
-                {'supabase_id': supabase_id},
-                {'$set': update_data}
+            # update active user and get the updated document in a single round trip
+            updated_user = await self.__collection.find_one_and_update(
+                {'supabase_id': supabase_id, 'is_active': True},
+                {'$set': update_data},
+                projection=PROJECTION,
+                return_document=ReturnDocument.AFTER,
             )
 
-            # get updated user
-            updated_user = await self.get_by_supabase_id(supabase_id)
-
-            # return updated user
-            return updated_user
-
         # error in update user: raise custom error
         except Exception as e:
-            raise MongoUnavailableError(f'Failed to update user by email: {str(e)}') from e
+            raise MongoUnavailableError(f'Failed to update user by Supabase ID: {str(e)}') from e
+
+        # drop cached sessions and refresh request identity
+        self.__invalidate(supabase_id=supabase_id)
+        self.__refresh_request_user('supabase_id', supabase_id, updated_user)
+
+        # user not found: raise custom error
+        if not updated_user:
+            raise NotFoundError(f'User with supabase_id {supabase_id} not found.')
 
+        # return updated user
+        return updated_user
 
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def update_by_email(self, email: str, update_data: Dict[str, Any]) -> User:
         """
         Update user by email.
@@ -180,66 +321,60 @@ class UserRepository:
         :param email: User email address
         :param update_data: Dictionary with fields to update
 
-        :returns: Updated User if found, None otherwise
+        :returns: Updated User
 
         :raises NotFoundError: If user not found
         :raises MongoUnavailableError: If update fails
         """
         try:
 
-            # get user by email
-            user = await self.get_by_email(email)
-
-            # user not found: raise custom error
-            if not user:
-                raise NotFoundError(f'User with email {email} not found.')
-
             # update timestamp
             update_data['updated_at'] = datetime.now(timezone.utc)
 
-            # Update in MongoDB
-            await self.__collection.update_one(
-                {'email': email},
-                {'$set': update_data}
+            # update active user and get the updated document in a single round trip
+            updated_user = await self.__collection.find_one_and_update(
+                {'email': email, 'is_active': True},
+                {'$set': update_data},
+                projection=PROJECTION,
+                return_document=ReturnDocument.AFTER,
             )
 
-            # get updated user
-            updated_user = await self.get_by_email(email)
-
-            # return updated user
-            return updated_user
-
         # error in update user: raise custom error
         except Exception as e:
             raise MongoUnavailableError(f'Failed to update user by email: {str(e)}') from e
 
+        # drop cached sessions and refresh request identity
+        self.__invalidate(supabase_id=updated_user.get('supabase_id') if updated_user else None, email=email)
+        self.__refresh_request_user('email', email, updated_user)
 
+        # user not found: raise custom error
+        if not updated_user:
+            raise NotFoundError(f'User with email {email} not found.')
+
+        # return updated user
+        return updated_user
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def delete_user(self, supabase_id: str) -> None:
         """
-        Delete user.
+        Delete user (soft delete).
 
         :param supabase_id: Supabase user ID
 
-        :returns: True if deleted, False otherwise
-
         :raises NotFoundError: If user not found
         :raises MongoUnavailableError: If delete fails
         """
         try:
 
-            # get user by supabase_id
-            user = await self.get_by_supabase_id(supabase_id)
-
-            # user not found: raise custom error
-            if not user:
-                raise NotFoundError(f'User with supabase_id {supabase_id} not found.')
-
-            # soft delete user by setting is_active to False
-            await self.__collection.update_one(
-                {'supabase_id': supabase_id},
+            # soft delete active user by setting is_active to False
+            result = await self.__collection.update_one(
+                {'supabase_id': supabase_id, 'is_active': True},
                 {'$set': {
                     'is_active': False,
-                    'updated_at': datetime.utcnow()
+                    'updated_at': datetime.now(timezone.utc)
                 }}
             )
 
@@ -247,7 +382,18 @@ class UserRepository:
         except Exception as e:
             raise MongoUnavailableError(f'Failed to delete user: {str(e)}') from e
 
+        # drop cached sessions and request identity
+        self.__invalidate(supabase_id=supabase_id)
+        self.__refresh_request_user('supabase_id', supabase_id, None)
+
+        # user not found: raise custom error
+        if result.matched_count == 0:
+            raise NotFoundError(f'User with supabase_id {supabase_id} not found.')
 
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def get_all(self,  # pylint: disable=W0102
                       skip: int = 0,
                       limit: int = 100,
@@ -276,6 +422,9 @@ class UserRepository:
             raise MongoUnavailableError(f'Failed to list users: {str(e)}') from e
 
 
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def get_by_role(self,  # pylint: disable=W0102
                           role: str,
                           skip: int = 0,
@@ -308,6 +457,165 @@ class UserRepository:
             raise MongoUnavailableError(f'Failed to find users by role: {str(e)}') from e
 
 
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
+    async def get_all_page(self,  # pylint: disable=W0102
+                           limit: int = 100,
+                           cursor: Optional[str] = None,
+                           projection: Optional[Dict[str, int]] = PROJECTION) -> Tuple[List[User], Optional[str]]:
+        """
+        Get a page of users using keyset pagination on (created_at, _id).
+
+        :param limit: Maximum number of documents to return
+        :param cursor: Cursor returned with the previous page, None for the first page
+        :param projection: Fields to exclude
+
+        :returns: List of User and the cursor of the next page (None on the last page)
+
+        :raises InvalidCursorError: If the cursor is malformed
+        :raises MongoUnavailableError: If query fails
+        """
+        return await self.__find_page({'is_active': True}, limit, cursor, projection, 'Failed to list users')
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
+    async def get_by_role_page(self,  # pylint: disable=W0102
+                               role: str,
+                               limit: int = 100,
+                               cursor: Optional[str] = None,
+                               projection: Optional[Dict[str, int]] = PROJECTION) -> Tuple[List[User], Optional[str]]:
+        """
+        Get a page of users with specific role using keyset pagination on (created_at, _id).
+
+        :param role: User role (user or supervisor)
+        :param limit: Maximum number of documents to return
+        :param cursor: Cursor returned with the previous page, None for the first page
+        :param projection: Fields to exclude
+
+        :returns: List of User and the cursor of the next page (None on the last page)
+
+        :raises InvalidCursorError: If the cursor is malformed
+        :raises MongoUnavailableError: If query fails
+        """
+        return await self.__find_page({'role': role, 'is_active': True}, limit, cursor, projection,
+                                      'Failed to find users by role')
+
+
+    async def __find_page(self,  # pylint: disable=R0913,R0917
+                          query: Dict[str, Any],
+                          limit: int,
+                          cursor: Optional[str],
+                          projection: Optional[Dict[str, int]],
+                          error_message: str) -> Tuple[List[User], Optional[str]]:
+        """
+        Run a keyset-paginated query ordered by (created_at, _id).
+
+        :param query: Base query filter
+        :param limit: Maximum number of documents to return
+        :param cursor: Cursor of the page to fetch, None for the first page
+        :param projection: Fields to exclude
+        :param error_message: Message of the raised error on failure
+
+        :returns: List of User and the cursor of the next page
+
+        :raises InvalidCursorError: If the cursor is malformed
+        :raises MongoUnavailableError: If query fails
+        """
+
+        # continue after the last returned sort key
+        if cursor:
+            created_at, object_id = decode_cursor(cursor)
+            query = {**query, '$or': [
+                {'created_at': {'$gt': created_at}},
+                {'created_at': created_at, '_id': {'$gt': object_id}},
+            ]}
+
+        # sort key fields are always fetched, requested exclusions are applied afterwards
+        fetch_projection = {field: value for field, value in (projection or {}).items()
+                            if field not in ('_id', 'created_at')}
+        if any(fetch_projection.values()):
+            fetch_projection.update({'_id': 1, 'created_at': 1})
+        hidden = [field for field in ('_id', 'created_at') if field in (projection or {}) and not projection[field]]
+
+        try:
+            # fetch one extra document to know whether a next page exists
+            db_cursor = self.__collection.find(query, fetch_projection or None) \
+                .sort([('created_at', ASCENDING), ('_id', ASCENDING)]) \
+                .limit(limit + 1)
+
+            # get list of users
+            users = await db_cursor.to_list(length=limit + 1)
+
+        # error in list users: raise custom error
+        except Exception as e:
+            raise MongoUnavailableError(f'{error_message}: {str(e)}') from e
+
+        # more documents left: build next page cursor from the last returned one
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            if users:
+                next_cursor = encode_cursor(users[-1]['created_at'], users[-1]['_id'])
+
+        # drop sort key fields the caller excluded
+        for user in users:
+            for field in hidden:
+                user.pop(field, None)
+
+        # return page
+        return users, next_cursor
+
+
+    async def iter_users(self,  # pylint: disable=W0102
+                         role: Optional[str] = None,
+                         is_active: Optional[bool] = True,
+                         projection: Optional[Dict[str, int]] = PROJECTION,
+                         batch_size: int = 500) -> AsyncIterator[User]:
+        """
+        Iterate over users without loading them all in memory.
+        Documents are fetched in batches and returned in insertion order (_id), which the default
+        index serves for every filter combination without an in-memory sort.
+
+        :param role: Only users with this role, None for every role
+        :param is_active: Only active (True) or inactive (False) users, None for both
+        :param projection: Fields to exclude or include
+        :param batch_size: Documents fetched per round trip
+
+        :returns: Async iterator of User
+
+        :raises MongoUnavailableError: If query fails
+        """
+
+        # build filter
+        query: Dict[str, Any] = {}
+        if role is not None:
+            query['role'] = role
+        if is_active is not None:
+            query['is_active'] = is_active
+
+        # open cursor
+        cursor = self.__collection.find(query, projection).sort('_id', ASCENDING).batch_size(batch_size)
+
+        try:
+            # yield documents as batches arrive
+            async for user in cursor:
+                yield user
+
+        # error in iterate users: raise custom error
+        except Exception as e:
+            raise MongoUnavailableError(f'Failed to iterate users: {str(e)}') from e
+
+        # release server cursor, also when the consumer stops early
+        finally:
+            await cursor.close()
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
     async def update_role(self, email: str, role: str) -> User:
         """
         Update user role.
@@ -320,14 +628,161 @@ class UserRepository:
         :raises MongoUnavailableError: If update fails
         :raises NotFoundError: If user not found
         """
+        return await self.update_by_email(email, {'role': role})
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
+    async def bulk_get_by_ids(self,  # pylint: disable=W0102
+                              supabase_ids: List[str],
+                              projection: Optional[Dict[str, int]] = PROJECTION) -> List[User]:
+        """
+        Find active users by Supabase ID, one query per batch.
+
+        :param supabase_ids: Supabase user IDs
+        :param projection: Fields to exclude in the result
+
+        :returns: List of User found, missing IDs are skipped
+
+        :raises MongoUnavailableError: If query fails
+        """
+        supabase_ids = list(dict.fromkeys(supabase_ids))
+        users = []
+
+        try:
+            for start in range(0, len(supabase_ids), BULK_BATCH_SIZE):
+                batch = supabase_ids[start:start + BULK_BATCH_SIZE]
+
+                # query MongoDB for the whole batch
+                cursor = self.__collection.find({'supabase_id': {'$in': batch}, 'is_active': True}, projection)
+                users.extend(await cursor.to_list(length=len(batch)))
+
+        # error in find users: raise custom error
+        except Exception as e:
+            raise MongoUnavailableError(f'Failed to find users by Supabase ID: {str(e)}') from e
+
+        # return users
+        return users
+
+
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
+    async def bulk_update_roles(self, roles: Dict[str, str]) -> Dict[str, str]:
+        """
+        Update the role of many users, two round trips per batch.
+
+        :param roles: New role (user or supervisor) by user email
+
+        :returns: Outcome by email: 'updated', 'unchanged' or 'not_found'
+
+        :raises MongoUnavailableError: If update fails
+        """
+        emails = list(roles)
+        results = {}
+
         try:
+            for start in range(0, len(emails), BULK_BATCH_SIZE):
+                batch = emails[start:start + BULK_BATCH_SIZE]
+                now = datetime.now(timezone.utc)
+
+                # read current roles of the batch
+                cursor = self.__collection.find(
+                    {'email': {'$in': batch}, 'is_active': True},
+                    {'_id': 0, 'email': 1, 'role': 1, 'supabase_id': 1},
+                )
+                current = {user['email']: user for user in await cursor.to_list(length=len(batch))}
+
+                # queue an update for every user whose role changes
+                operations = []
+                changed = []
+                for email in batch:
+                    user = current.get(email)
+                    if not user:
+                        results[email] = 'not_found'
+                    elif user.get('role') == roles[email]:
+                        results[email] = 'unchanged'
+                    else:
+                        results[email] = 'updated'
+                        changed.append(user)
+                        operations.append(UpdateOne(
+                            {'email': email, 'is_active': True},
+                            {'$set': {'role': roles[email], 'updated_at': now}},
+                        ))
+
+                # apply the batch in a single round trip
+                if operations:
+                    await self.__collection.bulk_write(operations, ordered=False)
+
+                # drop cached sessions of changed users
+                for user in changed:
+                    self.__invalidate(supabase_id=user.get('supabase_id'), email=user['email'])
+
+                # request identity changed: refresh its role
+                request_user = get_request_user()
+                if request_user and request_user.get('email') in {user['email'] for user in changed}:
+                    set_request_user({**request_user, 'role': roles[request_user['email']], 'updated_at': now},
+                                     fresh=is_request_user_fresh())
+
+        # error in update users: raise custom error
+        except Exception as e:
+            raise MongoUnavailableError(f'Failed to update user roles: {str(e)}') from e
 
-            # update user role by email
-            result = await self.update_by_email(email, {'role': role})
+        # return outcomes
+        return results
 
-            # return updated user
-            return result
 
-        # error in update user role: raise custom error
+    @bulkheaded
+    @timed(MONGO_OPERATION_DURATION)
+    @mongo_deadline
+    async def bulk_deactivate(self, supabase_ids: List[str]) -> Dict[str, str]:
+        """
+        Deactivate (soft delete) many users, two round trips per batch.
+
+        :param supabase_ids: Supabase user IDs
+
+        :returns: Outcome by Supabase ID: 'deactivated' or 'not_found'
+
+        :raises MongoUnavailableError: If update fails
+        """
+        supabase_ids = list(dict.fromkeys(supabase_ids))
+        results = {}
+
+        try:
+            for start in range(0, len(supabase_ids), BULK_BATCH_SIZE):
+                batch = supabase_ids[start:start + BULK_BATCH_SIZE]
+
+                # find which users of the batch are active
+                cursor = self.__collection.find(
+                    {'supabase_id': {'$in': batch}, 'is_active': True},
+                    {'_id': 0, 'supabase_id': 1, 'email': 1},
+                )
+                found = {user['supabase_id']: user for user in await cursor.to_list(length=len(batch))}
+
+                # soft delete them in a single round trip
+                if found:
+                    await self.__collection.update_many(
+                        {'supabase_id': {'$in': list(found)}, 'is_active': True},
+                        {'$set': {
+                            'is_active': False,
+                            'updated_at': datetime.now(timezone.utc)
+                        }}
+                    )
+
+                # record outcomes and drop cached sessions and request identity
+                for supabase_id in batch:
+                    user = found.get(supabase_id)
+                    if not user:
+                        results[supabase_id] = 'not_found'
+                        continue
+                    results[supabase_id] = 'deactivated'
+                    self.__invalidate(supabase_id=supabase_id, email=user.get('email'))
+                    self.__refresh_request_user('supabase_id', supabase_id, None)
+
+        # error in deactivate users: raise custom error
         except Exception as e:
-            raise MongoUnavailableError(f'Failed to update user role: {str(e)}') from e
+            raise MongoUnavailableError(f'Failed to deactivate users: {str(e)}') from e
+
+        # return outcomes
+        return results
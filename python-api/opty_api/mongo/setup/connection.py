@@ -3,32 +3,51 @@ MongoDB database configuration and connection.
 """
 
 # --- IMPORTS ---
+from opty_api.mongo.setup.indexes import IndexDrift
+from opty_api.mongo.setup.indexes import reconcile_indexes
+from opty_api.mongo.setup.monitoring import PoolMonitor
 from pymongo import AsyncMongoClient
-from pymongo import MongoClient
+
+import asyncio
+import logging
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
 from typing import Optional
 
 
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
 # --- CODE ---
 class MongoDBSetup:
     """
     MongoDB connection manager.
     """
 
-    def __init__(self, db_name: str, mongodb_url: str) -> None:
+    def __init__(self, db_name: str, mongodb_url: str, client_options: Optional[Dict[str, Any]] = None) -> None:
         """
         Initialize MongoDB connection manager.
+        No I/O happens here: call initialize() to check the server and build indexes.
 
         :param db_name: Name of the database
         :param mongodb_url: MongoDB connection URL
+        :param client_options: AsyncMongoClient keyword options (pool sizing, timeouts, compression...)
         """
         self.__db_name = db_name
         self.__mongodb_url = mongodb_url
+        self.__client_options = client_options or {}
+
+        self.pool_monitor = PoolMonitor(max_pool_size=self.__client_options.get('maxPoolSize', 100))
 
         self.client: Optional[AsyncMongoClient] = None
-        self.__client_sync: Optional[MongoClient] = None
+        self.index_drift: Dict[str, IndexDrift] = {}
+        self.ready = False
 
         self.connect_db()
-        self.create_indexes()
 
 
     def connect_db(self):
@@ -40,17 +59,17 @@ class MongoDBSetup:
         mongodb_url = self.__mongodb_url
 
         # Initialize MongoDB client
-        self.client = AsyncMongoClient(mongodb_url)
+        self.client = AsyncMongoClient(mongodb_url, event_listeners=[self.pool_monitor], **self.__client_options)
 
 
-    def close_db(self):
+    async def close_db(self):
         """
         Close MongoDB connection.
         """
 
         # Close the client if it exists
         if self.client:
-            self.client.close()
+            await self.client.close()
 
 
     def get_database(self):
@@ -71,29 +90,37 @@ class MongoDBSetup:
         return db[collection_name]
 
 
-    def create_indexes(self):
+    async def initialize(self, timeout: float) -> bool:
         """
-        Create indexes.
+        Check the server and build indexes without blocking the event loop.
+
+        :param timeout: Seconds to wait before giving up
+
+        :returns: True if MongoDB is ready
         """
         try:
-            # Get MongoDB configuration
-            mongodb_url = self.__mongodb_url
-            db_name = self.__db_name
+            await asyncio.wait_for(self.create_indexes(), timeout=timeout)
+            self.ready = True
 
-            # sync client only for index creation
-            self.__client_sync = MongoClient(mongodb_url)
+        # MongoDB too slow to answer: log warning
+        except asyncio.TimeoutError:
+            logger.warning('Could not create indexes: MongoDB did not answer within %ss', timeout)
 
-            # Get the database and collection
-            db = self.__client_sync[db_name]
-            users_collection = db["users"]
+        # error occurs during index creation: log warning
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Could not create indexes: %s', e)
 
-            # Create unique indices
-            users_collection.create_index("email", unique=True)
-            users_collection.create_index("supabase_id", unique=True)
+        # Return readiness
+        return self.ready
 
-            # Close sync client
-            self.__client_sync.close()
 
-        # error occurs during index creation: log warning
-        except Exception as e:  # pylint: disable=W0718
-            print(f'[WARNING   ] Could not create indexes: {str(e)}')
+    async def create_indexes(self):
+        """
+        Create declared indexes and record drift against the live ones.
+        """
+
+        # Check server is reachable
+        await self.client.admin.command('ping')
+
+        # Reconcile declared indexes
+        self.index_drift = await reconcile_indexes(self.get_database())
@@ -0,0 +1,156 @@
+"""
+MongoDB index registry.
+"""
+
+# --- IMPORTS ---
+from pymongo import ASCENDING
+from pymongo import IndexModel
+
+import logging
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import TypedDict
+
+
+# --- CONSTANTS ---
+# Index options compared when reconciling declared and live indexes
+COMPARED_OPTIONS = ('unique', 'sparse', 'partialFilterExpression', 'expireAfterSeconds')
+
+# Only active users are ever listed, so listing indexes skip deactivated accounts
+ACTIVE_ONLY = {'is_active': True}
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+# Declared indexes per collection
+INDEXES: Dict[str, List[IndexModel]] = {
+    'users': [
+
+        # get_by_email, update_by_email, update_role
+        IndexModel([('email', ASCENDING)], name='email_1', unique=True),
+
+        # get_by_supabase_id, update_by_supabase_id, delete_user
+        IndexModel([('supabase_id', ASCENDING)], name='supabase_id_1', unique=True),
+
+        # get_all (equality on is_active) and get_all_page (keyset sort on created_at, _id)
+        IndexModel(
+            [('is_active', ASCENDING), ('created_at', ASCENDING), ('_id', ASCENDING)],
+            name='is_active_1_created_at_1__id_1',
+        ),
+
+        # get_by_role and get_by_role_page
+        IndexModel(
+            [('role', ASCENDING), ('created_at', ASCENDING), ('_id', ASCENDING)],
+            name='active_role_1_created_at_1__id_1',
+            partialFilterExpression=ACTIVE_ONLY,
+        ),
+    ],
+    'rate_limits': [
+
+        # MongoBackend: drop idle buckets once fully refilled
+        IndexModel([('expires_at', ASCENDING)], name='expires_at_1', expireAfterSeconds=0),
+    ],
+}
+
+
+class IndexDrift(TypedDict):
+    """
+    Differences between declared and live indexes of a collection.
+    """
+    missing: List[str]
+    changed: List[str]
+    extra: List[str]
+
+
+def describe_index(index: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize an index definition for comparison.
+
+    :param index: IndexModel document or index_information() entry
+
+    :returns: Key pattern and compared options
+    """
+    description = {'key': [(field, int(direction)) for field, direction in dict(index['key']).items()]}
+
+    # Keep compared options, treating missing booleans as False
+    for option in COMPARED_OPTIONS:
+        value = index.get(option)
+        if option in ('unique', 'sparse'):
+            value = bool(value)
+        if value is not None:
+            description[option] = dict(value) if isinstance(value, dict) else value
+
+    # Return description
+    return description
+
+
+def diff_indexes(declared: List[IndexModel], live: Dict[str, Dict[str, Any]]) -> IndexDrift:
+    """
+    Compare declared indexes against the live ones.
+
+    :param declared: Declared indexes
+    :param live: Live indexes, as returned by index_information()
+
+    :returns: Index drift report
+    """
+    drift: IndexDrift = {'missing': [], 'changed': [], 'extra': []}
+    declared_names = set()
+
+    # Check every declared index
+    for model in declared:
+        name = model.document['name']
+        declared_names.add(name)
+
+        # Not created yet
+        if name not in live:
+            drift['missing'].append(name)
+
+        # Created with a different definition
+        elif describe_index(model.document) != describe_index(live[name]):
+            drift['changed'].append(name)
+
+    # Live indexes not declared (the default _id index is always there)
+    drift['extra'] = sorted(name for name in live if name not in declared_names and name != '_id_')
+
+    # Return report
+    return drift
+
+
+async def reconcile_indexes(database) -> Dict[str, IndexDrift]:
+    """
+    Create missing declared indexes and report drift.
+    Changed and extra indexes are only reported: dropping them is left to an operator.
+
+    :param database: Async pymongo database
+
+    :returns: Drift found per collection, before missing indexes were created
+    """
+    report = {}
+
+    for collection_name, declared in INDEXES.items():
+        collection = database[collection_name]
+
+        # Compare declared and live indexes
+        drift = diff_indexes(declared, await collection.index_information())
+        report[collection_name] = drift
+
+        # Create missing indexes
+        missing = [model for model in declared if model.document['name'] in drift['missing']]
+        if missing:
+            await collection.create_indexes(missing)
+
+        # Changed or extra indexes: log warning
+        if drift['changed'] or drift['extra']:
+            logger.warning('Index drift on "%s"', collection_name,
+                           extra={'collection': collection_name, 'changed_indexes': drift['changed'],
+                                  'extra_indexes': drift['extra']})
+
+    # Return drift report
+    return report
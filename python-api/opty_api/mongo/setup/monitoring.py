@@ -0,0 +1,147 @@
+"""
+MongoDB connection pool monitoring.
+"""
+
+# --- IMPORTS ---
+from pymongo.monitoring import ConnectionPoolListener
+
+
+# --- TYPES ---
+from typing import Dict
+
+
+# --- CODE ---
+class PoolMonitor(ConnectionPoolListener):  # pylint: disable=W0613
+    """
+    Connection pool listener keeping checkout wait time and utilisation counters.
+    """
+
+    def __init__(self, max_pool_size: int) -> None:
+        """
+        Initialize the monitor.
+
+        :param max_pool_size: Configured maxPoolSize, per server
+        """
+        self.max_pool_size = max_pool_size
+
+        self.pools = 0
+        self.connections_open = 0
+        self.connections_in_use = 0
+        self.checkouts_waiting = 0
+        self.checkouts = 0
+        self.checkouts_failed = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+
+
+    def pool_created(self, event) -> None:
+        """
+        A server pool was created.
+        """
+        self.pools += 1
+
+
+    def pool_ready(self, event) -> None:
+        """
+        A server pool became ready.
+        """
+        pass
+
+
+    def pool_cleared(self, event) -> None:
+        """
+        A server pool was cleared.
+        """
+        pass
+
+
+    def pool_closed(self, event) -> None:
+        """
+        A server pool was closed.
+        """
+        self.pools -= 1
+
+
+    def connection_created(self, event) -> None:
+        """
+        A connection was opened.
+        """
+        self.connections_open += 1
+
+
+    def connection_ready(self, event) -> None:
+        """
+        A connection finished its handshake.
+        """
+        pass
+
+
+    def connection_closed(self, event) -> None:
+        """
+        A connection was closed.
+        """
+        self.connections_open -= 1
+
+
+    def connection_check_out_started(self, event) -> None:
+        """
+        An operation started waiting for a connection.
+        """
+        self.checkouts_waiting += 1
+
+
+    def connection_check_out_failed(self, event) -> None:
+        """
+        An operation gave up waiting for a connection.
+        """
+        self.checkouts_waiting -= 1
+        self.checkouts_failed += 1
+        self.__record_wait(event)
+
+
+    def connection_checked_out(self, event) -> None:
+        """
+        An operation got a connection.
+        """
+        self.checkouts_waiting -= 1
+        self.connections_in_use += 1
+        self.checkouts += 1
+        self.__record_wait(event)
+
+
+    def connection_checked_in(self, event) -> None:
+        """
+        An operation returned its connection.
+        """
+        self.connections_in_use -= 1
+
+
+    def __record_wait(self, event) -> None:
+        """
+        Accumulate the time a checkout waited for a connection.
+
+        :param event: Checkout event carrying its duration
+        """
+        duration = getattr(event, 'duration', None) or 0.0
+        self.checkout_wait_seconds_total += duration
+        self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, duration)
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get pool counters.
+
+        :returns: Connection counts, checkout wait times and utilisation
+        """
+        capacity = self.max_pool_size * max(self.pools, 1)
+        return {
+            'connections_open': self.connections_open,
+            'connections_in_use': self.connections_in_use,
+            'checkouts_waiting': self.checkouts_waiting,
+            'checkouts': self.checkouts,
+            'checkouts_failed': self.checkouts_failed,
+            'checkout_wait_seconds_total': round(self.checkout_wait_seconds_total, 6),
+            'checkout_wait_seconds_avg': round(self.checkout_wait_seconds_total / max(self.checkouts, 1), 6),
+            'checkout_wait_seconds_max': round(self.checkout_wait_seconds_max, 6),
+            'utilisation': round(self.connections_in_use / capacity, 4) if capacity else 0.0,
+        }
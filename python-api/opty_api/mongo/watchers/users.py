@@ -0,0 +1,195 @@
+"""
+Change stream watcher of the users collection.
+
+Every worker keeps its own UserCache, and scripts such as promote_to_supervisor.py write to MongoDB
+directly, so a repository invalidating its own cache does not reach the other processes. The watcher
+tails a change stream on 'users' and invalidates local entries of every changed user, whichever
+process made the change.
+"""
+
+# --- IMPORTS ---
+from opty_api.utils.cache import UserCache
+from pymongo.errors import OperationFailure
+from pymongo.errors import PyMongoError
+
+import asyncio
+import logging
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+
+
+# --- CONSTANTS ---
+# Server error codes
+CHANGE_STREAM_HISTORY_LOST = 286
+CHANGE_STREAM_FATAL = 280
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+
+# Events ending the stream
+STREAM_ENDING = ('drop', 'rename', 'invalidate')
+
+# Events that can change a cached profile; inserts cannot be cached yet
+PIPELINE = [
+    {'$match': {'operationType': {'$in': ['update', 'replace', 'delete', *STREAM_ENDING]}}},
+    {'$project': {'operationType': 1, 'fullDocument.supabase_id': 1, 'fullDocument.email': 1}},
+]
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+class UserChangeWatcher:
+    """
+    Background task invalidating UserCache entries from the users change stream.
+    The resume token of the last handled event is kept, so after a dropped connection the stream
+    resumes where it stopped and no change is missed. When the server no longer has that point in
+    its oplog, the whole cache is cleared instead.
+    """
+
+    def __init__(self,
+                 collection,
+                 user_cache: UserCache,
+                 max_retry_seconds: float = 30) -> None:
+        """
+        Initialize the watcher.
+
+        :param collection: users collection
+        :param user_cache: Cache to invalidate
+        :param max_retry_seconds: Longest wait between reconnection attempts
+        """
+        self.collection = collection
+        self.user_cache = user_cache
+        self.max_retry_seconds = max_retry_seconds
+
+        self.resume_token: Optional[Mapping[str, Any]] = None
+        self.running = False
+
+        self.events = 0
+        self.reconnects = 0
+        self.resets = 0
+
+        self.__task: Optional[asyncio.Task] = None
+
+
+    def start(self) -> None:
+        """
+        Start tailing the change stream in the background.
+        """
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__watch_loop())
+
+
+    async def stop(self) -> None:
+        """
+        Stop tailing the change stream.
+        """
+        if self.__task:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+
+    def handle(self, change: Mapping[str, Any]) -> None:
+        """
+        Apply a change event to the cache.
+
+        :param change: Change stream event
+        """
+        self.events += 1
+        user = change.get('fullDocument')
+
+        # Changed user known: drop its entries
+        if change['operationType'] in ('update', 'replace') and user:
+            self.user_cache.invalidate(supabase_id=user.get('supabase_id'), email=user.get('email'))
+
+        # Deleted, since-deleted or dropped: the user is unknown, drop every entry
+        else:
+            self.user_cache.clear()
+
+        # Collection dropped or renamed: the stream cannot be resumed past this event
+        if change['operationType'] in STREAM_ENDING:
+            self.resume_token = None
+
+
+    async def __watch_loop(self) -> None:
+        """
+        Tail the change stream, reconnecting with backoff until stopped.
+        """
+        delay = 1.0
+        while True:
+            try:
+
+                # Stream ended on its own: open a new one at once
+                await self.__watch()
+                delay = 1.0
+                continue
+
+            # Change streams need a replica set: stop, cache entries still expire by TTL
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_NOT_SUPPORTED:
+                    logger.warning('Change streams not supported, user cache relies on TTL only: %s', e)
+                    return
+
+                # Resume point gone from the oplog: changes may be lost, clear the cache
+                if e.code in (CHANGE_STREAM_HISTORY_LOST, CHANGE_STREAM_FATAL):
+                    logger.warning('User change stream cannot resume, clearing user cache: %s', e)
+                    self.user_cache.clear()
+                    self.resume_token = None
+                    self.resets += 1
+                    continue
+                logger.warning('User change stream failed: %s', e)
+
+            # Connection lost: retry from the stored resume token
+            except PyMongoError as e:
+                logger.warning('User change stream interrupted: %s', e)
+
+            finally:
+                self.running = False
+
+            # Wait before reconnecting
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_seconds)
+
+
+    async def __watch(self) -> None:
+        """
+        Open the change stream and handle events until it ends.
+
+        :raises PyMongoError: If the stream fails
+        """
+        async with await self.collection.watch(PIPELINE,
+                                               full_document='updateLookup',
+                                               resume_after=self.resume_token) as stream:
+            self.running = True
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    self.handle(change)
+
+                    # Stream ending: open a new one from now
+                    if change['operationType'] in STREAM_ENDING:
+                        return
+
+                # Keep resume point, advanced by the server even while no user changes
+                self.resume_token = stream.resume_token
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get watcher counters.
+
+        :returns: Running flag, events handled, reconnections and cache resets
+        """
+        return {
+            'running': int(self.running),
+            'events': self.events,
+            'reconnects': self.reconnects,
+            'resets': self.resets,
+        }
@@ -9,17 +9,55 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from opty_api.app import app
 from opty_api.err.already_exists_error import AlreadyExistsError
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
 from opty_api.err.empty_update_error import EmptyUpdateError
+from opty_api.err.invalid_cursor_error import InvalidCursorError
 from opty_api.err.mongodb_unavailable_error import MongoUnavailableError
 from opty_api.err.not_found_error import NotFoundError
+from opty_api.err.overloaded_error import OverloadedError
+from opty_api.err.rate_limited_error import RateLimitedError
 from opty_api.err.supabase_error import SupabaseError
+from opty_api.utils.context import get_request_started_at
+from opty_api.utils.metrics import ERRORS
 from supabase_auth.errors import AuthApiError
 
+import logging
+import math
+import time
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
 
 # --- CODE ---
+def log_fields(request: Request, error: Exception) -> Dict[str, Any]:
+    """
+    Build the structured log fields of a failed request.
+
+    :param request: http request.
+    :param error: exception instance.
+
+    :returns: route, error class and latency fields.
+    """
+    route = request.scope.get('route')
+    started_at = get_request_started_at()
+    return {
+        'method': request.scope['method'],
+        'route': getattr(route, 'path', request.scope['path']),
+        'error': type(error).__name__,
+        'latency_ms': round((time.perf_counter() - started_at) * 1000, 2) if started_at else None,
+    }
+
+
 @app.exception_handler(AlreadyExistsError)
 async def already_exists_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: AlreadyExistsError
 ) -> JSONResponse:
     """
@@ -30,8 +68,9 @@ async def already_exists_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.args[1]}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -42,7 +81,7 @@ async def already_exists_error_handler(
 
 @app.exception_handler(EmptyUpdateError)
 async def empty_update_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: EmptyUpdateError
 ) -> JSONResponse:
     """
@@ -53,8 +92,33 @@ async def empty_update_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.args[1]}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
+
+    # fail request
+    return JSONResponse(
+        {'error': error.message},
+        status_code = 400,
+    )
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_error_handler(
+    request: Request,
+    error: InvalidCursorError
+) -> JSONResponse:
+    """
+    Handle InvalidCursorError exceptions.
+
+    :param request: http request.
+    :param error: InvalidCursorError instance.
+
+    :returns: JSONResponse with 'error' field describing the exception.
+    """
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -63,9 +127,59 @@ async def empty_update_error_handler(
     )
 
 
+@app.exception_handler(RateLimitedError)
+async def rate_limited_error_handler(
+    request: Request,
+    error: RateLimitedError
+) -> JSONResponse:
+    """
+    Handle RateLimitedError exceptions.
+
+    :param request: http request.
+    :param error: RateLimitedError instance.
+
+    :returns: JSONResponse with 'error' field and a 'Retry-After' header.
+    """
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.warning(error.args[1], extra=log_fields(request, error))
+
+    # fail request
+    return JSONResponse(
+        {'error': error.message},
+        status_code = 429,
+        headers = {'Retry-After': str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded_error_handler(
+    request: Request,
+    error: OverloadedError
+) -> JSONResponse:
+    """
+    Handle OverloadedError exceptions.
+
+    :param request: http request.
+    :param error: OverloadedError instance.
+
+    :returns: JSONResponse with 'error' field and a 'Retry-After' header.
+    """
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.warning(error.args[1], extra=log_fields(request, error))
+
+    # fail request
+    return JSONResponse(
+        {'error': error.message},
+        status_code = 503,
+        headers = {'Retry-After': str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
 @app.exception_handler(AuthApiError)
 async def auth_api_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: AuthApiError
 ) -> JSONResponse:
     """
@@ -76,8 +190,9 @@ async def auth_api_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.message}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.message, extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -88,7 +203,7 @@ async def auth_api_error_handler(
 
 @app.exception_handler(MongoUnavailableError)
 async def database_unavailable_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: MongoUnavailableError
 ) -> JSONResponse:
     """
@@ -99,8 +214,9 @@ async def database_unavailable_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.args[1]}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -111,7 +227,7 @@ async def database_unavailable_error_handler(
 
 @app.exception_handler(NotFoundError)
 async def not_found_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: NotFoundError
 ) -> JSONResponse:
     """
@@ -122,8 +238,9 @@ async def not_found_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.args[1]}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -134,7 +251,7 @@ async def not_found_error_handler(
 
 @app.exception_handler(SupabaseError)
 async def supabase_error_handler(
-    request: Request,  # pylint: disable=W0613
+    request: Request,
     error: SupabaseError
 ) -> JSONResponse:
     """
@@ -145,8 +262,9 @@ async def supabase_error_handler(
 
     :returns: JSONResponse with 'error' field describing the exception.
     """
-    # log error
-    print(f'[ERROR     ] {error.args[1]}')
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.error(error.args[1], extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -155,6 +273,30 @@ async def supabase_error_handler(
     )
 
 
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_error_handler(
+    request: Request,
+    error: DeadlineExceededError
+) -> JSONResponse:
+    """
+    Handle DeadlineExceededError exceptions.
+
+    :param request: http request.
+    :param error: DeadlineExceededError instance.
+
+    :returns: JSONResponse with 'error' field describing the exception.
+    """
+    # count and log error
+    ERRORS.inc(type(error).__name__)
+    logger.warning(error.args[1], extra=log_fields(request, error))
+
+    # fail request
+    return JSONResponse(
+        {'error': error.message},
+        status_code = 504,
+    )
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(
     request: Request,
@@ -174,8 +316,10 @@ async def http_exception_handler(
     status = error.status_code
     detail = error.detail
 
-    # log errors
-    print(f'[ERROR     ] Request "{method} {path}" failed with {status}: {detail}')
+    # count and log errors
+    ERRORS.inc(type(error).__name__)
+    logger.error('Request "%s %s" failed with %s: %s', method, path, status, detail,
+                 extra=log_fields(request, error))
 
     # fail request
     return JSONResponse(
@@ -216,8 +360,10 @@ async def request_validation_error_handler(
     status = 422
     detail = '\n'.join(errors)
 
-    # log errors
-    print(f'[ERROR     ] Validation request "{method} {path}" failed with status {status}: {detail}')
+    # count and log errors
+    ERRORS.inc(type(error).__name__)
+    logger.error('Validation request "%s %s" failed with status %s: %s', method, path, status, detail,
+                 extra=log_fields(request, error))
 
     # Return proper error message.
     return JSONResponse({'error': '\n'.join(errors)}, status_code = 422)
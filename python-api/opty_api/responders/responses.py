@@ -0,0 +1,65 @@
+"""
+Response classes.
+"""
+
+# --- IMPORTS ---
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+import orjson
+
+
+# --- TYPES ---
+from typing import Any
+
+
+# --- CODE ---
+def orjson_default(obj: Any) -> Any:
+    """
+    Serialize values orjson does not handle natively.
+
+    :param obj: Value to serialize
+
+    :returns: JSON compatible value
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    return str(obj)
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes in a single pass.
+
+    :param content: Models, TypedDicts, lists, datetimes and other JSON compatible values
+
+    :returns: JSON bytes
+    """
+
+    # Models serialize themselves through their compiled schema
+    if isinstance(content, BaseModel):
+        return to_json(content)
+
+    # Plain data: orjson
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized in a single pass.
+
+    Content is rendered straight to bytes by orjson, or by pydantic-core for models, so handlers
+    can return models, TypedDicts and datetimes without going through jsonable_encoder first.
+    Unknown types (e.g. ObjectId) are serialized with str().
+    """
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize the response content.
+
+        :param content: Response content
+
+        :returns: JSON bytes
+        """
+        return render_json(content)
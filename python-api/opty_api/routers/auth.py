@@ -5,20 +5,29 @@ Authentication endpoints.
 # --- IMPORTS ---
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
 from fastapi import status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from opty_api.app import container
+from opty_api.responders.responses import FastJSONResponse
 from opty_api.services.auth.create_profile import create_user_profile
-from opty_api.services.auth.login import login_user
+from opty_api.services.auth.export import EXPORT_FIELDS
+from opty_api.services.auth.export import export_users
 from opty_api.services.auth.login import login_with_oauth
+from opty_api.services.auth.login import login_with_profile
 from opty_api.services.auth.register import register_user
 from opty_api.services.auth.update import update_user_profile
 from opty_api.utils.dependencies import get_current_active_user
+from opty_api.utils.dependencies import rate_limit
 from opty_api.utils.dependencies import require_role
 
 
 # --- TYPES ---
+from opty_api.schemas.auth.bulk.endpoint import BulkResultResponse
+from opty_api.schemas.auth.bulk.endpoint import BulkRoleUpdatePayload
+from opty_api.schemas.auth.bulk.endpoint import BulkUsersPayload
+from opty_api.schemas.auth.bulk.endpoint import BulkUsersResponse
 from opty_api.schemas.auth.create_profile.endpoint import CreateProfilePayload
 from opty_api.schemas.auth.login.endpoint import UserLoginPayload
 from opty_api.schemas.auth.login.endpoint import UserLoginResponse
@@ -28,6 +37,13 @@ from opty_api.schemas.token import Token
 from opty_api.schemas.user import User
 from supabase_auth.types import OAuthResponse
 from typing import Dict
+from typing import Literal
+from typing import Optional
+
+
+# --- CONSTANTS ---
+# Export content types
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
 
 
 # --- GLOBAL ---
@@ -36,7 +52,8 @@ router = APIRouter()
 
 
 # --- ENDPOINTS ---
-@router.post('/register', response_model=Dict[str, str], status_code=status.HTTP_201_CREATED)
+@router.post('/register', response_model=Dict[str, str], status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(rate_limit('register'))])
 async def register(payload: UserRegisterPayload):
     """
     Creates a new user account in Supabase Auth and a user profile in MongoDB.
@@ -47,7 +64,7 @@ async def register(payload: UserRegisterPayload):
     await register_user(payload.model_dump())
 
     # Return a success message
-    return JSONResponse(
+    return FastJSONResponse(
         content={
             'response': 'Registration successful! Please check your email to confirm your account before logging in.'
         },
@@ -67,13 +84,13 @@ async def create_profile(payload: CreateProfilePayload):
     created_profile = await create_user_profile(payload.model_dump())
 
     # Return created profile
-    return JSONResponse(
-        content=jsonable_encoder(created_profile),
+    return FastJSONResponse(
+        content=created_profile,
         status_code=status.HTTP_201_CREATED
     )
 
 
-@router.post('/login', response_model=UserLoginResponse)
+@router.post('/login', response_model=UserLoginResponse, dependencies=[Depends(rate_limit('login'))])
 async def login(payload: UserLoginPayload):
     """
     Login with email and password.
@@ -84,8 +101,8 @@ async def login(payload: UserLoginPayload):
     :return: UserLoginResponse containing tokens and user data.
     """
 
-    # Call the login service
-    result = await login_user(
+    # Authenticate and fetch user data from MongoDB concurrently
+    result, user = await login_with_profile(
         email=payload.email,
         password=payload.password
     )
@@ -98,9 +115,6 @@ async def login(payload: UserLoginPayload):
         'expires_in': result.session.expires_in
     }
 
-    # Get user data from MongoDB
-    user = await container['user_repository'].get_by_email(payload.email)
-
     # Build final response
     response = UserLoginResponse(
         token=token,
@@ -108,10 +122,10 @@ async def login(payload: UserLoginPayload):
     )
 
     # Return response
-    return JSONResponse(content=jsonable_encoder(response.model_dump()), status_code=status.HTTP_200_OK)
+    return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
 
 
-@router.get('/oauth/{provider}', response_model=OAuthResponse)
+@router.get('/oauth/{provider}', response_model=OAuthResponse, dependencies=[Depends(rate_limit('oauth'))])
 async def oauth_login(provider: str):   # pylint: disable=W0613
     """
     Initiate OAuth login flow.
@@ -124,7 +138,7 @@ async def oauth_login(provider: str):   # pylint: disable=W0613
     url = await login_with_oauth(provider)
 
     # Return the OAuth URL
-    return JSONResponse(content=url.model_dump(), status_code=status.HTTP_200_OK)
+    return FastJSONResponse(content=url, status_code=status.HTTP_200_OK)
 
 
 @router.get('/me', response_model=User)
@@ -134,7 +148,7 @@ async def get_current_user_profile(current_user: User = Depends(get_current_acti
 
     Returns the authenticated user's profile data.
     """
-    return JSONResponse(content=jsonable_encoder(current_user), status_code=status.HTTP_200_OK)
+    return FastJSONResponse(content=current_user, status_code=status.HTTP_200_OK)
 
 
 @router.put('/me', response_model=User)
@@ -159,7 +173,7 @@ async def update_current_user_profile(
     )
 
     # Return updated user profile
-    return JSONResponse(content=jsonable_encoder(updated_user), status_code=status.HTTP_200_OK)
+    return FastJSONResponse(content=updated_user, status_code=status.HTTP_200_OK)
 
 
 @router.delete('/me')
@@ -175,10 +189,14 @@ async def delete_current_user(current_user: User = Depends(get_current_active_us
     await container['user_repository'].delete_user(supabase_id=current_user['supabase_id'])
 
     # Delete user in Supabase Auth (soft delete)
-    await container['supabase_client'].auth.admin.delete_user(current_user['supabase_id'], should_soft_delete=True)
+    await container['supabase_guard'].call(
+        'admin.delete_user',
+        lambda: container['supabase_client'].auth.admin.delete_user(current_user['supabase_id'],
+                                                                    should_soft_delete=True),
+    )
 
     # Return success message
-    return JSONResponse(
+    return FastJSONResponse(
         content={'message': 'Account deleted successfully'},
         status_code=status.HTTP_200_OK
     )
@@ -186,22 +204,157 @@ async def delete_current_user(current_user: User = Depends(get_current_active_us
 
 @router.get('/users', response_model=list[User])
 async def list_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     supervisor: User = Depends(require_role('supervisor'))  # pylint: disable=W0613
 ):
     """
     Returns a list of all users in the system.
     Only accessible by users with supervisor role.
 
-    :param skip: Number of users to skip (for pagination)
-    :param limit: Maximum number of users to return
+    Pages are ordered by creation date. The cursor of the next page is returned in the
+    'X-Next-Cursor' header; pass it back as 'cursor' to continue. 'skip' is kept for
+    backward compatibility but gets slower the deeper the page.
+
+    :param skip: Number of users to skip (offset pagination)
+    :param limit: Maximum number of users to return (capped server-side)
+    :param cursor: Cursor returned with the previous page (keyset pagination)
 
     :return: List of UserResponse objects
     """
 
-    # Fetch users from the database
-    users_data = await container['user_repository'].get_all(skip=skip, limit=limit)
+    # Cap page size
+    limit = min(limit, container['config'].USERS_PAGE_MAX_LIMIT)
+
+    # Offset pagination requested: fetch users with skip/limit
+    if skip and not cursor:
+        users_data = await container['user_repository'].get_all(skip=skip, limit=limit)
+        return FastJSONResponse(content=users_data, status_code=status.HTTP_200_OK)
+
+    # Fetch page of users from the database
+    users_data, next_cursor = await container['user_repository'].get_all_page(limit=limit, cursor=cursor)
+
+    # Return the list of users with the next page cursor
+    return FastJSONResponse(
+        content=users_data,
+        status_code=status.HTTP_200_OK,
+        headers={'X-Next-Cursor': next_cursor} if next_cursor else None
+    )
+
+
+@router.get('/users/export', response_class=StreamingResponse)
+async def export_users_stream(  # pylint: disable=R0913,R0917
+    export_format: Literal['ndjson', 'csv'] = Query('ndjson', alias='format'),
+    fields: Optional[str] = None,
+    role: Optional[Literal['user', 'supervisor']] = None,
+    active: Literal['true', 'false', 'all'] = 'true',
+    supervisor: User = Depends(require_role('supervisor'))  # pylint: disable=W0613
+):
+    """
+    Streams users as NDJSON or CSV.
+    Only accessible by users with supervisor role.
+
+    Users are read from a MongoDB cursor in batches of USERS_EXPORT_BATCH_SIZE and written as they
+    arrive, so memory stays flat regardless of the collection size.
+
+    :param export_format: 'format' query parameter: 'ndjson' (one JSON object per line) or 'csv'
+    :param fields: Comma-separated fields to export, all fields by default
+    :param role: Only users with this role
+    :param active: 'true' for active users, 'false' for inactive ones, 'all' for both
+
+    :return: Streaming response with the exported users
+
+    :raises HTTPException: If an unknown field is requested
+    """
+
+    # Parse requested fields
+    selected = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    unknown = [field for field in selected or [] if field not in EXPORT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Unknown fields: {", ".join(unknown)}',
+        )
+
+    # Stream users
+    return StreamingResponse(
+        export_users(
+            fields=selected,
+            role=role,
+            is_active={'true': True, 'false': False, 'all': None}[active],
+            export_format=export_format,
+            batch_size=container['config'].USERS_EXPORT_BATCH_SIZE,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="users.{export_format}"'},
+    )
+
+
+@router.post('/users/bulk/lookup', response_model=BulkUsersResponse)
+async def bulk_lookup_users(
+    payload: BulkUsersPayload,
+    supervisor: User = Depends(require_role('supervisor'))  # pylint: disable=W0613
+):
+    """
+    Returns the active users with the given Supabase IDs.
+    Only accessible by users with supervisor role.
+
+    :param payload: Supabase IDs to look up.
+
+    :return: Users found and the IDs that matched no active user.
+    """
+
+    # Fetch users in batches
+    users = await container['user_repository'].bulk_get_by_ids(payload.supabase_ids)
+
+    # Report IDs without an active user
+    found = {user['supabase_id'] for user in users}
+    not_found = [supabase_id for supabase_id in dict.fromkeys(payload.supabase_ids) if supabase_id not in found]
+
+    # Return users
+    return FastJSONResponse(content={'users': users, 'not_found': not_found}, status_code=status.HTTP_200_OK)
+
+
+@router.post('/users/bulk/roles', response_model=BulkResultResponse)
+async def bulk_update_roles(
+    payload: BulkRoleUpdatePayload,
+    supervisor: User = Depends(require_role('supervisor'))  # pylint: disable=W0613
+):
+    """
+    Changes the role of many users at once.
+    Only accessible by users with supervisor role.
+
+    :param payload: Role changes; the last change wins for repeated emails.
+
+    :return: Outcome per email ('updated', 'unchanged' or 'not_found').
+    """
+
+    # Update roles in batches
+    results = await container['user_repository'].bulk_update_roles(
+        {update.email: update.role for update in payload.updates}
+    )
+
+    # Return outcomes
+    return FastJSONResponse(content={'results': results}, status_code=status.HTTP_200_OK)
+
+
+@router.post('/users/bulk/deactivate', response_model=BulkResultResponse)
+async def bulk_deactivate_users(
+    payload: BulkUsersPayload,
+    supervisor: User = Depends(require_role('supervisor'))  # pylint: disable=W0613
+):
+    """
+    Deactivates (soft deletes) many user profiles at once.
+    Only accessible by users with supervisor role. Supabase Auth accounts are left untouched.
+
+    :param payload: Supabase IDs to deactivate.
+
+    :return: Outcome per Supabase ID ('deactivated' or 'not_found').
+    """
+
+    # Deactivate users in batches
+    results = await container['user_repository'].bulk_deactivate(payload.supabase_ids)
 
-    # Return the list of users
-    return JSONResponse(content=jsonable_encoder(users_data), status_code=status.HTTP_200_OK)
+    # Return outcomes
+    return FastJSONResponse(content={'results': results}, status_code=status.HTTP_200_OK)
@@ -4,11 +4,19 @@ System endpoints.
 
 # --- IMPORTS ---
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
+from opty_api.app import container
 from opty_api.app import health
 from opty_api.app import info
 from opty_api.models import Health
 from opty_api.models import Info
+from opty_api.responders.responses import FastJSONResponse
+from opty_api.services.system.health import check_health
+from opty_api.utils.metrics import registry
+
+
+# --- TYPES ---
+from typing import Dict
 
 
 # --- GLOBAL ---
@@ -19,17 +27,57 @@ router = APIRouter()
 # --- CODE ---
 # Health endpoint
 @router.get('/health', response_model = Health)
-def get_health() -> JSONResponse:
+def get_health() -> FastJSONResponse:
     """
     Returns the current system health status.
     """
-    return JSONResponse(health.dict())
+    return FastJSONResponse(health)
+
+
+# Readiness endpoint
+@router.get('/health/ready', response_model = Health)
+async def get_readiness() -> FastJSONResponse:
+    """
+    Probes MongoDB and Supabase and returns per-component status and latency.
+    Results are cached for a few seconds; answers 503 when the service cannot serve requests.
+    """
+    result = await check_health()
+    return FastJSONResponse(result, status_code = 503 if result.status == 'FAILURE' else 200)
 
 
 # Info endpoint
 @router.get('/info', response_model = Info)
-def get_info() -> JSONResponse:
+def get_info() -> FastJSONResponse:
     """
     Returns system information.
     """
-    return JSONResponse(info.dict())
+    return FastJSONResponse(info)
+
+
+# Stats endpoint
+@router.get('/stats', response_model = Dict[str, Dict[str, float]])
+def get_stats() -> FastJSONResponse:
+    """
+    Returns in-process counters for monitoring.
+    """
+    stats = {}
+
+    # Resolved token cache counters
+    if container.get('user_cache'):
+        stats['user_cache'] = container['user_cache'].stats()
+
+    # MongoDB connection pool counters
+    if container.get('mongodb'):
+        stats['mongo_pool'] = container['mongodb'].pool_monitor.stats()
+
+    # Return stats
+    return FastJSONResponse(stats)
+
+
+# Metrics endpoint
+@router.get('/metrics', response_class = PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """
+    Returns metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(registry.render(), media_type = 'text/plain; version=0.0.4')
@@ -0,0 +1,58 @@
+"""
+Bulk user administration endpoint schemas.
+"""
+
+# --- IMPORTS ---
+from pydantic import BaseModel
+from pydantic import EmailStr
+from pydantic import Field
+
+
+# --- TYPES ---
+from opty_api.schemas.user import User
+from typing import Dict
+from typing import List
+from typing import Literal
+
+
+# --- CONSTANTS ---
+# Maximum number of rows accepted per request
+BULK_MAX_SIZE = 1000
+
+
+# --- CODE ---
+class RoleUpdate(BaseModel):
+    """
+    Role change of a single user.
+    """
+    email: EmailStr
+    role: Literal['user', 'supervisor']
+
+
+class BulkRoleUpdatePayload(BaseModel):
+    """
+    Bulk role update request.
+    """
+    updates: List[RoleUpdate] = Field(..., min_length=1, max_length=BULK_MAX_SIZE)
+
+
+class BulkUsersPayload(BaseModel):
+    """
+    Bulk request addressing users by Supabase ID.
+    """
+    supabase_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_SIZE)
+
+
+class BulkResultResponse(BaseModel):
+    """
+    Per-row outcome of a bulk operation.
+    """
+    results: Dict[str, Literal['updated', 'unchanged', 'deactivated', 'not_found']]
+
+
+class BulkUsersResponse(BaseModel):
+    """
+    Users found by a bulk lookup.
+    """
+    users: List[User]
+    not_found: List[str]
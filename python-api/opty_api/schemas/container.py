@@ -3,10 +3,17 @@ Dependency injection schemas.
 """
 
 # --- TYPES ---
+from httpx import AsyncClient as HttpClient
 from opty_api.models import Config
 from opty_api.mongo.repositories.users import UserRepository
 from opty_api.mongo.setup.connection import MongoDBSetup
+from opty_api.mongo.watchers.users import UserChangeWatcher
+from opty_api.utils.cache import UserCache
+from opty_api.utils.ratelimit import RateLimiter
+from opty_api.utils.resilience import CallGuard
+from opty_api.utils.tokens import LocalTokenVerifier
 from supabase import AsyncClient
+from typing import Optional
 from typing import TypedDict
 
 
@@ -17,5 +24,11 @@ class Container(TypedDict):
     """
     config: Config
     supabase_client: AsyncClient
+    supabase_guard: CallGuard
+    http_client: HttpClient
     mongodb: MongoDBSetup
     user_repository: UserRepository
+    token_verifier: Optional[LocalTokenVerifier]
+    user_cache: Optional[UserCache]
+    user_watcher: Optional[UserChangeWatcher]
+    rate_limiter: Optional[RateLimiter]
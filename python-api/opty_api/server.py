@@ -0,0 +1,168 @@
+"""
+Production server launcher.
+
+Runs the API with one worker process per usable CPU core, configured from Config:
+
+  python -m opty_api.server
+
+Workers are uvicorn workers under a gunicorn master that preloads the app (imports are done once
+and shared by the forked workers) and recycles workers with jitter. gunicorn does not run on
+Windows, where it is not installed and uvicorn's own process manager is used instead. uvicorn is
+installed with its 'standard' extra, so uvloop and httptools serve every worker.
+"""
+
+# --- IMPORTS ---
+from opty_api.models import Config
+
+import importlib.util
+import os
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+
+
+# --- CONSTANTS ---
+APP = 'opty_api.main:app'
+
+
+# --- CODE ---
+def cpu_count() -> int:
+    """
+    Get the number of CPU cores this process may run on.
+
+    :returns: Usable cores, at least 1
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+def worker_count(config: Config) -> int:
+    """
+    Get the number of worker processes.
+    Workers are async, so one per core keeps every core busy without oversubscribing it.
+
+    :param config: Application configuration
+
+    :returns: Configured worker count, one per usable core by default
+    """
+    return config.SERVER_WORKERS or cpu_count()
+
+
+def is_installed(module: str) -> bool:
+    """
+    Check whether an optional module is installed.
+
+    :param module: Module name
+
+    :returns: True if importable
+    """
+    return importlib.util.find_spec(module) is not None
+
+
+def gunicorn_options(config: Config) -> Dict[str, Any]:
+    """
+    Build gunicorn settings.
+
+    :param config: Application configuration
+
+    :returns: gunicorn settings
+    """
+    return {
+        'bind': f'{config.SERVER_HOST}:{config.SERVER_PORT}',
+        'workers': worker_count(config),
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        'backlog': config.SERVER_BACKLOG,
+        'keepalive': config.SERVER_KEEPALIVE_SECONDS,
+        'max_requests': config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': config.SERVER_MAX_REQUESTS_JITTER if config.SERVER_MAX_REQUESTS else 0,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        'preload_app': config.SERVER_PRELOAD,
+        'forwarded_allow_ips': config.SERVER_FORWARDED_ALLOW_IPS,
+        'accesslog': None,
+    }
+
+
+def uvicorn_options(config: Config) -> Dict[str, Any]:
+    """
+    Build uvicorn settings.
+
+    :param config: Application configuration
+
+    :returns: uvicorn.run keyword arguments
+    """
+    return {
+        'host': config.SERVER_HOST,
+        'port': config.SERVER_PORT,
+        'workers': worker_count(config),
+        'loop': 'auto',
+        'http': 'auto',
+        'backlog': config.SERVER_BACKLOG,
+        'timeout_keep_alive': config.SERVER_KEEPALIVE_SECONDS,
+        'limit_max_requests': config.SERVER_MAX_REQUESTS or None,
+        'timeout_graceful_shutdown': config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        'proxy_headers': True,
+        'forwarded_allow_ips': config.SERVER_FORWARDED_ALLOW_IPS,
+        'access_log': False,
+    }
+
+
+def run_gunicorn(config: Config) -> None:
+    """
+    Serve with a gunicorn master and uvicorn workers.
+
+    :param config: Application configuration
+    """
+    from gunicorn.app.base import BaseApplication  # pylint: disable=C0415
+
+    class Application(BaseApplication):  # pylint: disable=W0223
+        """
+        gunicorn application configured in code.
+        """
+
+        def load_config(self) -> None:
+            """
+            Apply settings.
+            """
+            for key, value in gunicorn_options(config).items():
+                self.cfg.set(key, value)
+
+
+        def load(self):
+            """
+            Import the app (once in the master when preloading).
+            """
+            from opty_api.main import app  # pylint: disable=C0415
+            return app
+
+    Application().run()
+
+
+def run_uvicorn(config: Config) -> None:
+    """
+    Serve with uvicorn's process manager.
+    Workers are spawned and import the app themselves; recycling has no jitter.
+
+    :param config: Application configuration
+    """
+    import uvicorn  # pylint: disable=C0415
+    uvicorn.run(APP, **uvicorn_options(config))
+
+
+def main() -> None:
+    """
+    Start the production server.
+    """
+    config = Config()
+
+    # Preloading master available (not on Windows): prefer it
+    if is_installed('gunicorn'):
+        run_gunicorn(config)
+    else:
+        run_uvicorn(config)
+
+
+if __name__ == '__main__':
+    main()
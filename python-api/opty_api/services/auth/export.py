@@ -0,0 +1,112 @@
+"""
+User export service.
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from opty_api.app import container
+from opty_api.responders.responses import render_json
+
+import csv
+import io
+
+
+# --- TYPES ---
+from opty_api.schemas.user import User
+from typing import Any
+from typing import AsyncIterator
+from typing import List
+from typing import Literal
+from typing import Optional
+
+
+# --- CONSTANTS ---
+# Exportable fields, in column order
+EXPORT_FIELDS = tuple(User.__annotations__)
+
+# Leading characters that make spreadsheets evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+# --- CODE ---
+def format_cell(value: Any) -> str:
+    """
+    Format a field value as a CSV cell.
+    Text that a spreadsheet would run as a formula is prefixed with a quote, so it stays text.
+
+    :param value: Field value
+
+    :returns: Cell text
+    """
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return str(value)
+
+
+def flush(lines: List[bytes], buffer: io.StringIO) -> bytes:
+    """
+    Take the pending NDJSON lines and CSV text as one chunk.
+
+    :param lines: Pending NDJSON lines, emptied
+    :param buffer: Pending CSV text, emptied
+
+    :returns: Encoded chunk
+    """
+    chunk = b''.join(line + b'\n' for line in lines) + buffer.getvalue().encode('utf-8')
+    lines.clear()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+async def export_users(fields: Optional[List[str]],  # pylint: disable=R0913,R0917
+                       role: Optional[str],
+                       is_active: Optional[bool],
+                       export_format: Literal['ndjson', 'csv'],
+                       batch_size: int) -> AsyncIterator[bytes]:
+    """
+    Stream users as NDJSON lines or CSV rows.
+    At most one batch of documents is held in memory at a time.
+
+    :param fields: Fields to export, None for all of them
+    :param role: Only users with this role, None for every role
+    :param is_active: Only active (True) or inactive (False) users, None for both
+    :param export_format: 'ndjson' or 'csv'
+    :param batch_size: Documents fetched per round trip and written per chunk
+
+    :returns: Async iterator of encoded chunks
+    """
+
+    # Project requested fields only
+    columns = fields or list(EXPORT_FIELDS)
+    projection = {'_id': 0, **{field: 1 for field in fields}} if fields else {'_id': 0}
+
+    # CSV writer over a reusable buffer
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == 'csv':
+        writer.writerow(columns)
+
+    # Encode documents, flushing one chunk per batch
+    lines = []
+    pending = 0
+    async for user in container['user_repository'].iter_users(
+        role=role, is_active=is_active, projection=projection, batch_size=batch_size
+    ):
+        if export_format == 'ndjson':
+            lines.append(render_json(user))
+        else:
+            writer.writerow([format_cell(user.get(column)) for column in columns])
+
+        # Batch complete: flush chunk
+        pending += 1
+        if pending == batch_size:
+            yield flush(lines, buffer)
+            pending = 0
+
+    # Flush remaining documents
+    yield flush(lines, buffer)
@@ -4,13 +4,22 @@ User login service.
 
 # --- IMPORTS ---
 from opty_api.app import container
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.err.not_found_error import NotFoundError
+from opty_api.err.overloaded_error import OverloadedError
 from opty_api.err.supabase_error import SupabaseError
+from opty_api.utils.metrics import LOGIN_DURATION
 from supabase_auth.errors import AuthApiError
 
+import asyncio
+import time
+
 
 # --- TYPES ---
-from supabase_auth.types import AuthResponse
+from opty_api.schemas.user import User  # pylint: disable=C0412
+from supabase_auth.types import AuthResponse  # pylint: disable=C0412
 from supabase_auth.types import OAuthResponse
+from typing import Tuple
 
 
 # --- CODE ---
@@ -29,15 +38,22 @@ async def login_user(email: str, password: str) -> AuthResponse:
 
     # Authenticate with Supabase
     try:
-        auth_response = await container['supabase_client'].auth.sign_in_with_password({
-            'email': email,
-            'password': password,
-        })
+        auth_response = await container['supabase_guard'].call(
+            'sign_in_with_password',
+            lambda: container['supabase_client'].auth.sign_in_with_password({
+                'email': email,
+                'password': password,
+            }),
+        )
 
     # Error in supabase auth: raise custom error
     except AuthApiError as e:
         raise AuthApiError(code=e.code, status=e.status, message=e.message) from e
 
+    # Breaker open, Supabase saturated or request deadline reached: propagate
+    except (DeadlineExceededError, OverloadedError, SupabaseError):
+        raise
+
     # Error in supabase auth: raise custom error
     except Exception as e:
         raise SupabaseError(f'[SUPABASE  ] Login failed: {str(e)}') from e
@@ -46,6 +62,58 @@ async def login_user(email: str, password: str) -> AuthResponse:
     return auth_response
 
 
+async def login_with_profile(email: str, password: str) -> Tuple[AuthResponse, User]:
+    """
+    Login user with email and password and fetch their profile.
+    The Supabase sign-in and the MongoDB profile fetch run concurrently; the profile is only
+    returned once authentication succeeded, and the fetch is cancelled when it fails.
+
+    :param email: User email
+    :param password: User password
+
+    :return: AuthResponse from Supabase and the user profile
+
+    :raises SupabaseError: If there is an error with Supabase authentication
+    :raises AuthApiError: If the credentials are invalid
+    :raises NotFoundError: If the user has no active profile
+    :raises MongoUnavailableError: If the profile fetch fails
+    """
+    started_at = time.perf_counter()
+    outcome = 'error'
+
+    # Start profile fetch in the background
+    profile_task = asyncio.create_task(container['user_repository'].get_by_email(email))
+
+    try:
+        # Authenticate with Supabase
+        try:
+            auth_response = await login_user(email=email, password=password)
+
+        # Authentication failed (or request cancelled): drop the profile fetch
+        except BaseException as e:
+            profile_task.cancel()
+            await asyncio.gather(profile_task, return_exceptions=True)
+            if isinstance(e, AuthApiError):
+                outcome = 'invalid_credentials'
+            raise
+
+        # Authenticated: wait for the profile
+        user = await profile_task
+
+        # No active profile: raise custom error
+        if not user:
+            outcome = 'no_profile'
+            raise NotFoundError('User profile not found')
+
+        # Return auth response and profile
+        outcome = 'success'
+        return auth_response, user
+
+    # Record login latency
+    finally:
+        LOGIN_DURATION.observe(time.perf_counter() - started_at, outcome)
+
+
 async def login_with_oauth(provider: str) -> OAuthResponse:
     """
     Login with OAuth provider (Google, GitHub, etc).
@@ -57,13 +125,20 @@ async def login_with_oauth(provider: str) -> OAuthResponse:
 
     # Authenticate with Supabase OAuth
     try:
-        auth_response = await container['supabase_client'].auth.sign_in_with_oauth({
-            'provider': provider,
-        })
+        auth_response = await container['supabase_guard'].call(
+            'sign_in_with_oauth',
+            lambda: container['supabase_client'].auth.sign_in_with_oauth({
+                'provider': provider,
+            }),
+        )
 
         # Return auth response
         return auth_response
 
+    # Breaker open, Supabase saturated or request deadline reached: propagate
+    except (DeadlineExceededError, OverloadedError, SupabaseError):
+        raise
+
     # Error in supabase auth: raise custom error
     except Exception as e:
         raise SupabaseError(f'[SUPABASE  ] OAuth login failed: {str(e)}') from e
@@ -5,12 +5,21 @@ User registration service.
 # --- IMPORTS ---
 from opty_api.app import container
 from opty_api.err.already_exists_error import AlreadyExistsError
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.err.overloaded_error import OverloadedError
 from opty_api.err.supabase_error import SupabaseError
+from supabase_auth.errors import AuthApiError
+
+import logging
 
 
 # --- TYPES ---
-from opty_api.schemas.user import User
-from supabase_auth.types import AuthResponse
+from opty_api.schemas.user import User  # pylint: disable=C0412
+from supabase_auth.types import AuthResponse  # pylint: disable=C0412
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
 
 
 # --- CODE ---
@@ -18,6 +27,11 @@ async def register_user(user_data: User) -> AuthResponse:
     """
     Register a new user in Supabase and create user profile in MongoDB.
 
+    Duplicates are not looked up beforehand: the profile is inserted optimistically and the
+    unique indexes reject a concurrent or repeated registration. If the insert fails, the
+    Supabase user created by this call is deleted again. A repeated signup of an unconfirmed
+    email returns the existing Supabase user, whose profile already exists: that one is kept.
+
     :param user_data: User data for registration.
 
     :return: AuthResponse from Supabase.
@@ -27,17 +41,25 @@ async def register_user(user_data: User) -> AuthResponse:
     :raises MongoUnavailableError: If MongoDB operation fails.
     """
 
-    # Check if user already exists in MongoDB
-    user = await container['user_repository'].get_by_email(user_data['email'])
-    if user:
-        raise AlreadyExistsError('User with this email already exists')
-
     # Create user in Supabase Auth
     try:
-        auth_response = await container['supabase_client'].auth.sign_up({
-            'email': user_data['email'],
-            'password': user_data['password'],
-        })
+        auth_response = await container['supabase_guard'].call(
+            'sign_up',
+            lambda: container['supabase_client'].auth.sign_up({
+                'email': user_data['email'],
+                'password': user_data['password'],
+            }),
+        )
+
+    # Email already registered in Supabase: raise custom error
+    except AuthApiError as e:
+        if e.code == 'user_already_exists':
+            raise AlreadyExistsError('User with this email already exists') from e
+        raise SupabaseError(f'[SUPABASE  ] registration failed: {str(e)}') from e
+
+    # Breaker open, Supabase saturated or request deadline reached: propagate
+    except (DeadlineExceededError, OverloadedError, SupabaseError):
+        raise
 
     # Supabase registration failed: raise custom error
     except Exception as e:
@@ -50,6 +72,10 @@ async def register_user(user_data: User) -> AuthResponse:
     # Get the created Supabase user
     supabase_user = auth_response.user
 
+    # Email already registered (Supabase answers with an obfuscated user without identities)
+    if supabase_user.identities == []:
+        raise AlreadyExistsError('User with this email already exists')
+
     # Create user profile document
     user_document: User = {
         'supabase_id': supabase_user.id,
@@ -62,8 +88,62 @@ async def register_user(user_data: User) -> AuthResponse:
         'avatar_url': None,
     }
 
-    # Insert user profile into MongoDB
-    await container['user_repository'].add_user(user_document)
+    # Insert user profile into MongoDB, duplicates are rejected by the unique indexes
+    try:
+        await container['user_repository'].add_user(user_document)
+
+    # Profile already exists: remove the Supabase user only if this call created it
+    except AlreadyExistsError as e:
+        if not await has_profile(supabase_user.id):
+            await delete_supabase_user(supabase_user.id)
+        raise AlreadyExistsError('User with this email already exists') from e
+
+    # Insert failed: remove the Supabase user created above
+    except Exception:
+        await delete_supabase_user(supabase_user.id)
+        raise
 
     # Return response
     return auth_response
+
+
+async def has_profile(supabase_id: str) -> bool:
+    """
+    Check whether a Supabase user already owns a profile, i.e. was not created by this registration.
+    When the lookup fails the user is assumed to own one: keeping a stray Supabase user is
+    recoverable, deleting a real account is not.
+
+    :param supabase_id: Supabase user ID
+
+    :returns: True if a profile exists or the lookup failed
+    """
+    try:
+        return await container['user_repository'].get_by_supabase_id(supabase_id) is not None
+
+    # error in MongoDB: log and keep the Supabase user
+    except Exception as e:  # pylint: disable=W0718
+        logger.error('Could not look up profile of conflicting registration: %s', e,
+                     extra={'supabase_id': supabase_id})
+        return True
+
+
+async def delete_supabase_user(supabase_id: str) -> None:
+    """
+    Delete a Supabase user created by a failed registration.
+    Runs outside the request deadline and bulkhead: a registration that failed because the budget ran
+    out must still remove its Supabase user, or the email could never register again.
+    Failures are logged, the registration error is what the caller reports.
+
+    :param supabase_id: Supabase user ID
+    """
+    try:
+        await container['supabase_guard'].call_detached(
+            'admin.delete_user',
+            lambda: container['supabase_client'].auth.admin.delete_user(supabase_id),
+            timeout=container['config'].SUPABASE_COMPENSATION_TIMEOUT_SECONDS,
+        )
+
+    # error in supabase: log for manual cleanup
+    except Exception as e:  # pylint: disable=W0718
+        logger.error('Could not delete Supabase user of failed registration: %s', e,
+                     extra={'supabase_id': supabase_id})
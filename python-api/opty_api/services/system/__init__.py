@@ -0,0 +1,3 @@
+"""
+System services package.
+"""
@@ -0,0 +1,123 @@
+"""
+Readiness check service.
+"""
+
+# --- IMPORTS ---
+from opty_api.app import container
+from opty_api.app import health
+from opty_api.models import ComponentHealth
+
+import asyncio
+import time
+
+
+# --- TYPES ---
+from opty_api.models import Health
+from typing import Awaitable
+from typing import Callable
+
+
+# --- GLOBAL ---
+# Time of the last completed check (monotonic clock)
+_checked_at = float('-inf')
+
+# Serializes checks so concurrent pollers share one probe round
+_check_lock = asyncio.Lock()
+
+
+# --- CODE ---
+async def ping_mongodb() -> None:
+    """
+    Ping the MongoDB server.
+
+    :raises Exception: If the server does not answer
+    """
+    await container['mongodb'].client.admin.command('ping')
+
+
+async def ping_supabase() -> None:
+    """
+    Call the Supabase Auth health endpoint.
+
+    :raises Exception: If Supabase does not answer with a success status
+    """
+    config = container['config']
+    response = await container['http_client'].get(
+        f'{config.SUPABASE_URL.rstrip("/")}/auth/v1/health',
+        headers={'apikey': config.SUPABASE_KEY},
+    )
+    response.raise_for_status()
+
+
+async def probe(check: Callable[[], Awaitable[None]], timeout: float) -> ComponentHealth:
+    """
+    Run a dependency check with a timeout.
+
+    :param check: Check coroutine function, raising on failure
+    :param timeout: Seconds to wait for the check
+
+    :returns: Component status and latency
+    """
+    started_at = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout=timeout)
+        status, error = 'OK', None
+
+    # check too slow: dependency failing
+    except asyncio.TimeoutError:
+        status, error = 'FAILURE', f'No answer within {timeout}s'
+
+    # check failed: dependency failing
+    except Exception as e:  # pylint: disable=W0718
+        status, error = 'FAILURE', str(e)
+
+    # Return component health
+    return ComponentHealth(status=status,
+                           latency_ms=round((time.perf_counter() - started_at) * 1000, 2),
+                           error=error)
+
+
+async def check_health() -> Health:
+    """
+    Probe MongoDB and Supabase concurrently and update the system health.
+    Results are reused for HEALTH_CACHE_TTL_SECONDS so frequent polling does not multiply backend load.
+
+    MongoDB is required by every authenticated endpoint, so its failure is a FAILURE.
+    Supabase failing (or its circuit breaker being open) only breaks sign-in flows, so the service is
+    degraded to WARNING.
+
+    :returns: System health
+    """
+    global _checked_at  # pylint: disable=W0603
+    config = container['config']
+
+    async with _check_lock:
+
+        # Recent result: reuse it
+        if time.monotonic() - _checked_at < config.HEALTH_CACHE_TTL_SECONDS:
+            return health
+
+        # Probe dependencies concurrently
+        mongodb, supabase = await asyncio.gather(
+            probe(ping_mongodb, config.HEALTH_CHECK_TIMEOUT_SECONDS),
+            probe(ping_supabase, config.HEALTH_CHECK_TIMEOUT_SECONDS),
+        )
+
+        # Report Supabase circuit breaker: open means sign-in calls are failing fast
+        supabase.circuit = container['supabase_guard'].breaker.state
+        if supabase.circuit == 'open' and supabase.status == 'OK':
+            supabase.status, supabase.error = 'WARNING', 'Circuit breaker open'
+
+        # Update system health
+        health.components = {'mongodb': mongodb, 'supabase': supabase}
+        if mongodb.status == 'FAILURE':
+            health.status = 'FAILURE'
+        elif supabase.status != 'OK':
+            health.status = 'WARNING'
+        else:
+            health.status = 'OK'
+
+        _checked_at = time.monotonic()
+
+    # Return system health
+    return health
@@ -3,8 +3,13 @@ Auth utility functions.
 """
 
 # --- IMPORTS ---
+from jose.exceptions import JWTError
 from opty_api.app import container
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.err.overloaded_error import OverloadedError
 from opty_api.err.supabase_error import SupabaseError
+from opty_api.utils.cache import hash_token
+from opty_api.utils.singleflight import SingleFlight
 
 
 # --- TYPES ---
@@ -12,10 +17,29 @@ from supabase_auth.types import UserResponse
 from typing import Optional
 
 
+# --- GLOBAL ---
+# Concurrent validations of the same token share one Supabase call
+token_flight = SingleFlight()
+
+
 # --- CODE ---
 async def get_user_from_token(access_token: str) -> Optional[UserResponse]:
     """
     Get user data from access token.
+    Concurrent calls with the same token share a single Supabase request and its outcome.
+
+    :param access_token: JWT access token.
+
+    :return: User data dictionary or None if not found.
+
+    :raises SupabaseError: If there is an error communicating with Supabase.
+    """
+    return await token_flight.do(hash_token(access_token), lambda: fetch_user_from_token(access_token))
+
+
+async def fetch_user_from_token(access_token: str) -> Optional[UserResponse]:
+    """
+    Validate an access token against Supabase.
 
     :param access_token: JWT access token.
 
@@ -25,8 +49,12 @@ async def get_user_from_token(access_token: str) -> Optional[UserResponse]:
     """
     try:
 
-        # Validate token and get user from Supabase
-        supabase_user = await container['supabase_client'].auth.get_user(access_token)
+        # Validate token and get user from Supabase (read-only: retried on transient failures)
+        supabase_user = await container['supabase_guard'].call(
+            'get_user',
+            lambda: container['supabase_client'].auth.get_user(access_token),
+            idempotent=True,
+        )
 
         # Supabase user not found: return None
         if not supabase_user.user:
@@ -35,6 +63,48 @@ async def get_user_from_token(access_token: str) -> Optional[UserResponse]:
         # Return user profile
         return supabase_user
 
+    # Breaker open, Supabase saturated or request deadline reached: propagate
+    except (DeadlineExceededError, OverloadedError, SupabaseError):
+        raise
+
     # Error in supabase: raise custom error
     except Exception as e:
         raise SupabaseError(f'Error getting user from token: {str(e)}') from e
+
+
+async def get_supabase_id_from_token(access_token: str) -> Optional[str]:
+    """
+    Get the Supabase user ID an access token was issued to.
+    Verifies the token locally when configured, otherwise asks Supabase.
+
+    :param access_token: JWT access token.
+
+    :return: Supabase user ID or None if the token is invalid.
+
+    :raises SupabaseError: If there is an error communicating with Supabase.
+    """
+
+    # Get local verifier (only set in 'local' verification mode)
+    verifier = container.get('token_verifier')
+
+    # Token verifiable in-process: check signature and claims locally
+    if verifier and verifier.can_verify(access_token):
+        try:
+            claims = verifier.verify(access_token)
+
+        # Invalid token: return None
+        except JWTError:
+            return None
+
+        # Return token subject
+        return claims['sub']
+
+    # Fall back to Supabase validation
+    supabase_user = await get_user_from_token(access_token)
+
+    # Invalid token: return None
+    if not supabase_user:
+        return None
+
+    # Return Supabase user ID
+    return supabase_user.user.id
@@ -0,0 +1,164 @@
+"""
+Backend bulkheads.
+
+A bulkhead caps the calls in flight to one backend and lets a bounded number of callers wait for a slot.
+Callers beyond the queue, or waiting longer than the queue timeout, are shed at once with OverloadedError
+(503) instead of piling up on a saturated pool: latency stays bounded under a spike and requests that do
+not touch the backend, such as /api/health, keep being served.
+"""
+
+# --- IMPORTS ---
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from opty_api.err.overloaded_error import OverloadedError
+from opty_api.utils.deadline import require_budget
+from opty_api.utils.metrics import BULKHEAD_SHED
+from opty_api.utils.metrics import BULKHEAD_WAIT
+
+import asyncio
+import time
+
+
+# --- TYPES ---
+from typing import AsyncIterator
+from typing import Dict
+
+
+# --- CODE ---
+class Bulkhead:
+    """
+    Concurrency limit with a bounded wait queue.
+    """
+
+    def __init__(self,  # pylint: disable=R0913,R0917
+                 name: str,
+                 max_concurrency: int,
+                 max_queue: int,
+                 queue_timeout: float,
+                 retry_after: float) -> None:
+        """
+        Initialize the bulkhead.
+
+        :param name: Backend name, used in metrics and errors
+        :param max_concurrency: Calls allowed in flight
+        :param max_queue: Callers allowed to wait for a slot
+        :param queue_timeout: Longest wait for a slot, in seconds
+        :param retry_after: Retry-After sent with shed requests, in seconds
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self.active = 0
+        self.queued = 0
+        self.shed_total = 0
+
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Set while the current task holds a slot, so nested calls do not take a second one
+        self.__held: ContextVar[bool] = ContextVar(f'bulkhead_{name}_held', default=False)
+
+
+    def __shed(self, reason: str) -> OverloadedError:
+        """
+        Count a shed call and build its error.
+
+        :param reason: 'queue_full' or 'queue_timeout'
+
+        :returns: Error to raise
+        """
+        self.shed_total += 1
+        BULKHEAD_SHED.inc(self.name, reason)
+        return OverloadedError(f'{self.name} saturated ({reason})', self.retry_after)
+
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of a block.
+        Waits at most the queue timeout, or what is left of the request deadline if shorter.
+
+        :raises OverloadedError: If the queue is full or no slot frees up in time
+        :raises DeadlineExceededError: If the request deadline has passed
+        """
+
+        # Slot already held by this task: run within it
+        if self.__held.get():
+            yield
+            return
+
+        # Free slot: take it without queueing
+        if not self.__semaphore.locked():
+            await self.__semaphore.acquire()
+
+        # Queue full: shed call
+        elif self.queued >= self.max_queue:
+            raise self.__shed('queue_full')
+
+        # Wait for a slot
+        else:
+            budget = require_budget(f'{self.name} slot')
+            timeout = self.queue_timeout if budget is None else min(self.queue_timeout, budget)
+            started_at = time.perf_counter()
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self.__semaphore.acquire(), timeout=timeout)
+
+            # No slot in time: shed call
+            except asyncio.TimeoutError:
+                raise self.__shed('queue_timeout') from None
+
+            finally:
+                self.queued -= 1
+                BULKHEAD_WAIT.observe(time.perf_counter() - started_at, self.name)
+
+        # Run block holding the slot
+        self.active += 1
+        token = self.__held.set(True)
+        try:
+            yield
+        finally:
+            self.__held.reset(token)
+            self.active -= 1
+            self.__semaphore.release()
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get bulkhead counters.
+
+        :returns: Calls in flight, callers queued, limits and calls shed
+        """
+        return {
+            'active': self.active,
+            'queued': self.queued,
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'shed_total': self.shed_total,
+        }
+
+
+def bulkheaded(method):
+    """
+    Decorator running a repository coroutine method in its bulkhead slot.
+    The bulkhead is the instance's 'bulkhead' attribute; methods run unbounded when it is None.
+
+    :param method: Coroutine method
+
+    :returns: Wrapped method
+    """
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+
+        # No bulkhead: run unbounded
+        if self.bulkhead is None:
+            return await method(self, *args, **kwargs)
+
+        async with self.bulkhead.slot():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
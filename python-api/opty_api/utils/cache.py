@@ -0,0 +1,245 @@
+"""
+In-memory cache of resolved access tokens.
+"""
+
+# --- IMPORTS ---
+from collections import OrderedDict
+from jose import jwt
+from jose.exceptions import JWTError
+
+import hashlib
+import time
+
+
+# --- TYPES ---
+from opty_api.schemas.user import User
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+
+# --- CODE ---
+def hash_token(token: str) -> str:
+    """
+    Hash an access token so raw tokens are never kept in memory as keys.
+
+    :param token: JWT access token
+
+    :returns: Hex digest of the token
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_token_expiry(token: str) -> Optional[float]:
+    """
+    Read the 'exp' claim of an already verified token.
+
+    :param token: JWT access token
+
+    :returns: Expiry as a UNIX timestamp, None if absent or unreadable
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get('exp')
+
+    # unreadable token: no expiry known
+    except JWTError:
+        return None
+
+    # Return expiry
+    return float(exp) if exp is not None else None
+
+
+class UserCache:
+    """
+    Bounded LRU cache mapping access tokens to resolved user profiles.
+    Entries expire at the token's 'exp' or after the configured TTL, whichever comes first.
+    Every invalidation bumps a per-user generation: a profile read before an invalidation of its
+    user is not cached afterwards, even though its lookup was still in flight when it happened.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """
+        Initialize the cache.
+
+        :param max_size: Maximum number of entries
+        :param ttl_seconds: Maximum entry lifetime
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self.__entries: OrderedDict[str, Tuple[float, User]] = OrderedDict()
+        self.__by_supabase_id: Dict[str, Set[str]] = {}
+        self.__by_email: Dict[str, Set[str]] = {}
+
+        # Sequence of the last invalidation per Supabase ID, and of the last reset of them all
+        self.__sequence = 0
+        self.__generations: Dict[str, int] = {}
+        self.__cleared_at = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+
+    def get(self, token: str) -> Optional[User]:
+        """
+        Get the cached user for a token.
+
+        :param token: JWT access token
+
+        :returns: User if cached and not expired, None otherwise
+        """
+        key = hash_token(token)
+        entry = self.__entries.get(key)
+
+        # Not cached: count miss
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Expired: drop entry and count miss
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            self.__remove(key)
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        self.__entries.move_to_end(key)
+        self.hits += 1
+
+        # Return cached user
+        return user
+
+
+    def generation(self, supabase_id: str) -> int:
+        """
+        Get the generation of a user, to take before looking its profile up.
+
+        :param supabase_id: Supabase user ID
+
+        :returns: Sequence of the last invalidation that reached the user
+        """
+        return max(self.__generations.get(supabase_id, 0), self.__cleared_at)
+
+
+    def set(self, token: str, user: User, generation: Optional[int] = None) -> None:
+        """
+        Cache the user resolved for a token.
+
+        :param token: Verified JWT access token
+        :param user: Resolved user profile
+        :param generation: User generation taken before the lookup, None to skip the check
+        """
+        key = hash_token(token)
+
+        # User invalidated while being looked up: the profile may predate the change
+        if generation is not None and self.generation(user.get('supabase_id')) != generation:
+            return
+
+        # Entry lifetime: TTL capped by the token expiry
+        ttl = self.ttl_seconds
+        token_expiry = get_token_expiry(token)
+        if token_expiry is not None:
+            ttl = min(ttl, token_expiry - time.time())
+
+        # Token already expired: nothing to cache
+        if ttl <= 0:
+            return
+
+        # Replace existing entry
+        if key in self.__entries:
+            self.__remove(key)
+
+        # Store entry and index it
+        self.__entries[key] = (time.monotonic() + ttl, user)
+        self.__by_supabase_id.setdefault(user.get('supabase_id'), set()).add(key)
+        self.__by_email.setdefault(user.get('email'), set()).add(key)
+
+        # Over capacity: evict least recently used entries
+        while len(self.__entries) > self.max_size:
+            self.__remove(next(iter(self.__entries)))
+            self.evictions += 1
+
+
+    def invalidate(self, supabase_id: Optional[str] = None, email: Optional[str] = None) -> None:
+        """
+        Drop every entry resolved to the given user.
+
+        :param supabase_id: Supabase user ID
+        :param email: User email address
+        """
+
+        # Collect keys from both indexes
+        keys = set()
+        if supabase_id is not None:
+            keys |= self.__by_supabase_id.get(supabase_id, set())
+        if email is not None:
+            keys |= self.__by_email.get(email, set())
+
+        # Bump generation of the user and of every user cached under the keys
+        self.__sequence += 1
+        supabase_ids = {self.__entries[key][1].get('supabase_id') for key in keys}
+        if supabase_id is not None:
+            supabase_ids.add(supabase_id)
+        for changed in supabase_ids:
+            self.__generations[changed] = self.__sequence
+
+        # Too many generations kept: reset them all at once
+        if len(self.__generations) > self.max_size:
+            self.__generations.clear()
+            self.__cleared_at = self.__sequence
+
+        # Remove entries
+        for key in keys:
+            self.__remove(key)
+            self.invalidations += 1
+
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        self.__entries.clear()
+        self.__by_supabase_id.clear()
+        self.__by_email.clear()
+
+        # Invalidate every lookup in flight
+        self.__sequence += 1
+        self.__generations.clear()
+        self.__cleared_at = self.__sequence
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        :returns: Size, hits, misses, evictions and invalidations
+        """
+        return {
+            'size': len(self.__entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+    def __remove(self, key: str) -> None:
+        """
+        Remove an entry and its index references.
+
+        :param key: Token hash
+        """
+        _, user = self.__entries.pop(key)
+
+        # Drop index references
+        for index, value in ((self.__by_supabase_id, user.get('supabase_id')), (self.__by_email, user.get('email'))):
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
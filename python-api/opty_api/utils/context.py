@@ -0,0 +1,109 @@
+"""
+Request-scoped context.
+"""
+
+# --- IMPORTS ---
+from contextvars import ContextVar
+
+
+# --- TYPES ---
+from opty_api.schemas.user import User
+from typing import Optional
+
+
+# --- GLOBAL ---
+# Profile of the user authenticated for the current request
+_request_user: ContextVar[Optional[User]] = ContextVar('request_user', default=None)
+
+# Whether that profile was read from MongoDB during the current request (not served from the token cache)
+_request_user_fresh: ContextVar[bool] = ContextVar('request_user_fresh', default=False)
+
+# Correlation ID of the current request
+_request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# Start of the current request (perf_counter clock)
+_request_started_at: ContextVar[Optional[float]] = ContextVar('request_started_at', default=None)
+
+# Deadline of the current request (monotonic clock)
+_request_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+
+# --- CODE ---
+def get_request_user() -> Optional[User]:
+    """
+    Get the user authenticated for the current request.
+
+    :returns: User profile, None outside an authenticated request
+    """
+    return _request_user.get()
+
+
+def set_request_user(user: Optional[User], fresh: bool = True) -> None:
+    """
+    Set the user authenticated for the current request.
+    Each request runs in its own task, so the value never leaks to other requests.
+
+    :param user: User profile, None to clear it
+    :param fresh: Whether the profile was read from MongoDB during this request
+    """
+    _request_user.set(user)
+    _request_user_fresh.set(fresh and user is not None)
+
+
+def is_request_user_fresh() -> bool:
+    """
+    Check whether the request user was read from MongoDB during this request.
+    Profiles served from the token cache can be stale, so they must not stand in for a read.
+
+    :returns: True if the request user can replace a MongoDB read
+    """
+    return _request_user_fresh.get()
+
+
+def get_request_id() -> Optional[str]:
+    """
+    Get the correlation ID of the current request.
+
+    :returns: Request ID, None outside a request
+    """
+    return _request_id.get()
+
+
+def get_request_started_at() -> Optional[float]:
+    """
+    Get the start time of the current request.
+
+    :returns: time.perf_counter() value, None outside a request
+    """
+    return _request_started_at.get()
+
+
+def get_request_deadline() -> Optional[float]:
+    """
+    Get the deadline of the current request.
+
+    :returns: time.monotonic() value, None outside a request or when the route has no deadline
+    """
+    return _request_deadline.get()
+
+
+def set_request_deadline(deadline: Optional[float]) -> None:
+    """
+    Set the deadline of the current request.
+
+    :param deadline: time.monotonic() value, None for no deadline
+    """
+    _request_deadline.set(deadline)
+
+
+def start_request(request_id: str, started_at: float) -> None:
+    """
+    Initialize the context of a new request.
+
+    :param request_id: Correlation ID
+    :param started_at: time.perf_counter() value
+    """
+    _request_id.set(request_id)
+    _request_started_at.set(started_at)
+    _request_user.set(None)
+    _request_user_fresh.set(False)
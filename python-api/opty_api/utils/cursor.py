@@ -0,0 +1,55 @@
+"""
+Opaque keyset pagination cursors.
+"""
+
+# --- IMPORTS ---
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from opty_api.err.invalid_cursor_error import InvalidCursorError
+
+import base64
+import binascii
+import json
+
+
+# --- TYPES ---
+from typing import Tuple
+
+
+# --- CODE ---
+def encode_cursor(created_at: datetime, object_id: ObjectId) -> str:
+    """
+    Encode the sort key of the last returned document as an opaque cursor.
+
+    :param created_at: Document creation timestamp
+    :param object_id: Document _id
+
+    :returns: URL-safe cursor token
+    """
+    payload = json.dumps([created_at.isoformat(), str(object_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    :param cursor: Cursor token
+
+    :returns: (created_at, _id) sort key
+
+    :raises InvalidCursorError: If the cursor is malformed
+    """
+    try:
+
+        # restore padding and decode payload
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, object_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        # return sort key
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+
+    # malformed cursor: raise custom error
+    except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+        raise InvalidCursorError(f'Malformed pagination cursor: {cursor}') from e
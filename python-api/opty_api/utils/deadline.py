@@ -0,0 +1,89 @@
+"""
+Request deadline budget.
+
+DeadlineMiddleware sets a deadline per request; every backend call takes its timeout from what is left
+of it, so a slow dependency cannot hold a worker coroutine or a pool connection past the request's budget.
+MongoDB operations run under pymongo's client-side timeout, which sends the remaining budget as maxTimeMS
+with every command; Supabase calls cap their own timeout with it.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.utils.context import get_request_deadline
+from pymongo.errors import PyMongoError
+
+import functools
+import pymongo
+import time
+
+
+# --- TYPES ---
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+
+# --- CONSTANTS ---
+T = TypeVar('T')
+
+
+# --- CODE ---
+def remaining_budget() -> Optional[float]:
+    """
+    Get the time left before the current request's deadline.
+
+    :returns: Seconds left (negative once passed), None when there is no deadline
+    """
+    deadline = get_request_deadline()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def require_budget(operation: str) -> Optional[float]:
+    """
+    Get the time left for a backend call, failing fast when none is.
+
+    :param operation: Operation about to run, for the error detail
+
+    :returns: Seconds left, None when there is no deadline
+
+    :raises DeadlineExceededError: If the deadline has passed
+    """
+    budget = remaining_budget()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceededError(f'No time left for {operation}')
+    return budget
+
+
+def mongo_deadline(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorator bounding a repository coroutine by the request deadline.
+    Commands get the remaining budget as maxTimeMS, and server selection, pool checkout and socket
+    reads are bounded by it too. Inside the block every driver timeout comes from the budget, so it
+    is reported as DeadlineExceededError instead of a MongoDB failure.
+
+    :param method: Repository coroutine method
+
+    :returns: Wrapped method
+    """
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs) -> T:
+
+        # No deadline: run unbounded
+        budget = require_budget(method.__name__)
+        if budget is None:
+            return await method(*args, **kwargs)
+
+        try:
+            with pymongo.timeout(budget):
+                return await method(*args, **kwargs)
+
+        # MongoDB timed out because the budget ran out: raise deadline error
+        except Exception as e:
+            cause = e if isinstance(e, PyMongoError) else e.__cause__
+            if isinstance(cause, PyMongoError) and cause.timeout:  # pylint: disable=E1101
+                raise DeadlineExceededError(f'{method.__name__} timed out: {cause}') from cause
+            raise
+
+    return wrapper
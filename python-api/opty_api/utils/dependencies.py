@@ -5,12 +5,14 @@ FastAPI dependencies for authentication and authorization.
 # --- IMPORTS ---
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Request
 from fastapi import status
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.security import HTTPBearer
 from opty_api.app import container
 from opty_api.schemas.user import User
-from opty_api.utils.auth import get_user_from_token
+from opty_api.utils.auth import get_supabase_id_from_token
+from opty_api.utils.context import set_request_user
 
 
 # --- GLOBAL ---
@@ -23,6 +25,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     """
     Dependency to get the current authenticated user.
     Validates the JWT token and returns the user profile from MongoDB.
+    The profile is also published as the request identity so services and repositories reuse it.
 
     :param credentials: HTTP authorization credentials.
     :return: Current user profile.
@@ -33,19 +36,30 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     # Extract token from credentials
     token = credentials.credentials
 
-    # Validate token with Supabase and get user
-    supabase_user = await get_user_from_token(token)
+    # Token already resolved: return cached user profile
+    user_cache = container.get('user_cache')
+    if user_cache:
+        cached_user = user_cache.get(token)
+        if cached_user:
+            set_request_user(cached_user, fresh=False)
+            return cached_user
+
+    # Validate token and get Supabase user ID
+    supabase_id = await get_supabase_id_from_token(token)
 
     # Invalid token: raise 401 exception
-    if not supabase_user:
+    if not supabase_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid authentication credentials',
             headers={'WWW-Authenticate': 'Bearer'},
         )
 
+    # Take user generation, so a change made during the lookup is not cached
+    generation = user_cache.generation(supabase_id) if user_cache else None
+
     # Get user profile from MongoDB
-    user = await container['user_repository'].get_by_supabase_id(supabase_user.user.id)
+    user = await container['user_repository'].get_by_supabase_id(supabase_id)
 
     # User profile not found: raise 404 exception
     if not user:
@@ -54,6 +68,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail='User profile not found',
         )
 
+    # Cache resolved user profile
+    if user_cache:
+        user_cache.set(token, user, generation=generation)
+
+    # Publish request identity
+    set_request_user(user)
+
     # Return user profile
     return user
 
@@ -109,3 +130,37 @@ def require_role(required_role: str):
 
     # Return the role checker function
     return role_checker
+
+
+def rate_limit(route: str):
+    """
+    Dependency factory applying the rate limit rules of a route.
+    The 'ip' scope is keyed by client address, the 'user' scope by the email in the JSON body.
+    Behind a proxy the client address comes from X-Forwarded-For, trusted for SERVER_FORWARDED_ALLOW_IPS only.
+
+    :param route: Route name in RATE_LIMIT_RULES.
+    :return: Dependency function.
+
+    :raises RateLimitedError: If a limit of the route is exceeded.
+    """
+    async def limit(request: Request) -> None:
+
+        # Rate limiting disabled: allow request
+        limiter = container.get('rate_limiter')
+        if not limiter:
+            return
+
+        # Identify caller
+        identities = {'ip': request.client.host if request.client else None}
+        if 'user' in limiter.rules.get(route, {}):
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+            email = body.get('email') if isinstance(body, dict) else None
+            identities['user'] = email.strip().lower() if isinstance(email, str) else None
+
+        # Take tokens
+        await limiter.check(route, identities)
+
+    return limit
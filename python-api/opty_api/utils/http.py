@@ -0,0 +1,94 @@
+"""
+Shared outbound HTTP client.
+
+One long-lived httpx.AsyncClient per worker carries every call to Supabase (and the readiness probe),
+so TLS sessions and keep-alive connections are reused across requests instead of renegotiated.
+Pool limits, timeouts and HTTP/2 come from Config.
+"""
+
+# --- IMPORTS ---
+from opty_api.models import Config
+
+import httpx
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+
+
+# --- CODE ---
+class ConnectionStats:
+    """
+    Counts requests and new connections through the httpcore trace extension.
+    Every request that did not open a connection reused a pooled one.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize counters.
+        """
+        self.requests = 0
+        self.connections_opened = 0
+
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """
+        Request event hook: attach the tracer to an outgoing request.
+
+        :param request: Outgoing request
+        """
+        self.requests += 1
+        request.extensions['trace'] = self.trace
+
+
+    async def trace(self, event_name: str, info: Dict[str, Any]) -> None:  # pylint: disable=W0613
+        """
+        httpcore trace callback.
+
+        :param event_name: Connection or protocol event
+        :param info: Event details
+        """
+        if event_name == 'connection.connect_tcp.complete':
+            self.connections_opened += 1
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get connection reuse counters.
+
+        :returns: Requests, connections opened, requests served on a reused connection and reuse ratio
+        """
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            'requests': self.requests,
+            'connections_opened': self.connections_opened,
+            'reused': reused,
+            'reuse_ratio': round(reused / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+def build_http_client(config: Config, connection_stats: ConnectionStats) -> httpx.AsyncClient:
+    """
+    Build the shared outbound HTTP client.
+
+    :param config: Application configuration
+    :param connection_stats: Connection reuse counters fed by the client
+
+    :returns: Configured client, to be closed on shutdown
+    """
+    return httpx.AsyncClient(
+        http2=config.HTTP_CLIENT_HTTP2,
+        limits=httpx.Limits(
+            max_connections=config.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            connect=config.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+            read=config.HTTP_CLIENT_READ_TIMEOUT_SECONDS,
+            write=config.HTTP_CLIENT_WRITE_TIMEOUT_SECONDS,
+            pool=config.HTTP_CLIENT_POOL_TIMEOUT_SECONDS,
+        ),
+        event_hooks={'request': [connection_stats.on_request]},
+    )
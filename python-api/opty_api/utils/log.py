@@ -0,0 +1,224 @@
+"""
+Structured, non-blocking logging.
+
+Records are put on a bounded in-memory queue by the event loop and written as JSON lines by a
+background thread. When the queue is full (e.g. during an error storm) records are dropped and
+counted instead of blocking request handling.
+"""
+
+# --- IMPORTS ---
+from datetime import datetime
+from datetime import timezone
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from opty_api.utils.context import get_request_id
+from opty_api.utils.context import get_request_user
+
+import json
+import logging
+import os
+import queue
+import random
+import sys
+
+
+# --- TYPES ---
+from typing import Dict
+
+
+# --- CONSTANTS ---
+# Attributes every LogRecord has; anything else was passed through 'extra'
+RESERVED_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+# --- GLOBAL ---
+# Background writer, under 'listener' while running
+WRITER: Dict[str, QueueListener] = {}
+
+
+# --- CODE ---
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record.
+
+        :param record: Log record
+
+        :returns: JSON line
+        """
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+
+        # Structured fields passed through 'extra' or added by the queue handler
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRIBUTES and value is not None:
+                entry[key] = value
+
+        # Exception details
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        # Return JSON line
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a configurable fraction of records per level.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        """
+        Initialize the filter.
+
+        :param rates: Fraction of records kept per level name; missing levels keep everything
+        """
+        super().__init__()
+        self.rates = {level.upper(): rate for level, rate in rates.items()}
+
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether a record is kept.
+
+        :param record: Log record
+
+        :returns: True to keep the record
+        """
+        rate = self.rates.get(record.levelname, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full.
+    Request correlation fields are captured here, in the caller's context.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        """
+        Initialize the handler.
+
+        :param log_queue: Bounded queue read by the background writer
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Attach request correlation fields.
+        Formatting is left to the background writer.
+
+        :param record: Log record
+
+        :returns: The same record
+        """
+        if getattr(record, 'request_id', None) is None:
+            record.request_id = get_request_id()
+        if getattr(record, 'user_id', None) is None:
+            request_user = get_request_user()
+            record.user_id = request_user.get('supabase_id') if request_user else None
+        return record
+
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put a record on the queue without waiting.
+
+        :param record: Log record
+        """
+        try:
+            self.queue.put_nowait(record)
+
+        # queue full: drop record
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    Queue listener whose stop waits for room in a full queue, so pending records are flushed.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Signal the writer thread to stop after the pending records.
+        """
+        self.queue.put(self._sentinel)
+
+
+def setup_logging(level: str, queue_size: int, sampling: Dict[str, float]) -> NonBlockingQueueHandler:
+    """
+    Route the 'opty_api' loggers through the queue and start the background writer.
+
+    :param level: Minimum level name
+    :param queue_size: Maximum number of pending records
+    :param sampling: Fraction of records kept per level name
+
+    :returns: Queue handler, exposing the dropped records counter
+    """
+    # Background writer: JSON lines on stdout
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    # Front handler: bounded queue with sampling
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sampling))
+
+    # Attach to package logger
+    logger = logging.getLogger('opty_api')
+    logger.handlers = [queue_handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    # Start writer thread
+    WRITER['listener'] = DrainingQueueListener(log_queue, stream_handler, respect_handler_level=True)
+    WRITER['listener'].start()
+
+    # Forked workers (preloaded app) do not inherit the writer thread: start their own
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=lambda: restart_after_fork(queue_handler, stream_handler, queue_size))
+
+    # Return queue handler
+    return queue_handler
+
+
+def restart_after_fork(queue_handler: NonBlockingQueueHandler,
+                       stream_handler: logging.Handler,
+                       queue_size: int) -> None:
+    """
+    Give a forked process a fresh queue and writer thread.
+    The parent's queue may have been locked by its writer at fork time, so it is not reused.
+
+    :param queue_handler: Front handler inherited from the parent
+    :param stream_handler: Writer handler inherited from the parent
+    :param queue_size: Maximum number of pending records
+    """
+
+    # Parent writer was stopped already: nothing to restart
+    if 'listener' not in WRITER:
+        return
+
+    # New queue and writer thread
+    queue_handler.queue = queue.Queue(maxsize=queue_size)
+    WRITER['listener'] = DrainingQueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    WRITER['listener'].start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flush pending records and stop the background writer.
+    """
+    listener = WRITER.pop('listener', None)
+    if listener:
+        listener.stop()
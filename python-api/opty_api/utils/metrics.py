@@ -0,0 +1,311 @@
+"""
+Lightweight in-process metrics registry with Prometheus text exposition.
+
+Metrics are only touched from the event loop thread, so updates are plain dict and list
+operations with no locking.
+"""
+
+# --- IMPORTS ---
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+import time
+
+
+# --- TYPES ---
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+
+# --- CONSTANTS ---
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --- CODE ---
+def escape_label_value(value: object) -> str:
+    """
+    Escape a label value for the exposition format.
+
+    :param value: Label value
+
+    :returns: Value with backslashes, double quotes and newlines escaped
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labelnames: Sequence[str], labels: Tuple[str, ...], extra: str = '') -> str:
+    """
+    Format a label set for the exposition format.
+
+    :param labelnames: Label names
+    :param labels: Label values
+    :param extra: Additional pre-formatted label (e.g. 'le="0.5"')
+
+    :returns: '{name="value",...}' or an empty string
+    """
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """
+    Monotonic counter per label set.
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()) -> None:
+        """
+        Initialize the counter.
+
+        :param name: Metric name
+        :param description: Metric help text
+        :param labelnames: Label names
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Increment the counter.
+
+        :param labels: Label values
+        :param amount: Increment
+        """
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+    def render(self) -> List[str]:
+        """
+        Render samples.
+        """
+        return [f'{self.name}{format_labels(self.labelnames, labels)} {value}' for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down per label set.
+    """
+    kind = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """
+        Decrement the gauge.
+
+        :param labels: Label values
+        :param amount: Decrement
+        """
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+    def set(self, *labels: str, value: float) -> None:
+        """
+        Set the gauge.
+
+        :param labels: Label values
+        :param value: New value
+        """
+        self.values[labels] = value
+
+
+class Histogram:
+    """
+    Cumulative histogram per label set.
+    """
+    kind = 'histogram'
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the histogram.
+
+        :param name: Metric name
+        :param description: Metric help text
+        :param labelnames: Label names
+        :param buckets: Upper bounds of the buckets, ascending
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+        # label set -> [per-bucket counts (last one is +Inf), sum, count]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+
+        :param value: Observed value
+        :param labels: Label values
+        """
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+        # Count in the first bucket whose bound is >= value
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """
+        Observe the duration of a block, including when it raises.
+
+        :param labels: Label values
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, *labels)
+
+
+    def render(self) -> List[str]:
+        """
+        Render samples.
+        """
+        lines = []
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_labels = format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.labelnames, labels)} {total}')
+            lines.append(f'{self.name}_count{format_labels(self.labelnames, labels)} {count}')
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics and stats collectors.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        """
+        Initialize the registry.
+
+        :param prefix: Prefix of collected stats names
+        """
+        self.prefix = prefix
+        self.metrics: List[object] = []
+        self.collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+    def register(self, metric):
+        """
+        Register a metric.
+
+        :param metric: Counter, Gauge or Histogram
+
+        :returns: The registered metric
+        """
+        self.metrics.append(metric)
+        return metric
+
+
+    def register_collector(self, section: str, collect: Callable[[], Dict[str, float]]) -> None:
+        """
+        Register a callback whose stats are exported on every scrape.
+
+        :param section: Stats section, used in metric names
+        :param collect: Callback returning a flat dict of numbers
+        """
+        self.collectors[section] = collect
+
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        :returns: Exposition text
+        """
+        lines = []
+
+        # Registered metrics
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+
+        # Collected stats
+        for section, collect in self.collectors.items():
+            for key, value in collect().items():
+                lines.append(f'# TYPE {self.prefix}_{section}_{key} untyped')
+                lines.append(f'{self.prefix}_{section}_{key} {value}')
+
+        # Return exposition text
+        return '\n'.join(lines) + '\n'
+
+
+def timed(histogram: Histogram):
+    """
+    Decorator observing the duration of a coroutine function, labelled with its name.
+
+    :param histogram: Histogram with a single label
+
+    :returns: Decorator
+    """
+    def decorator(func):
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with histogram.time(func.__name__):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# --- GLOBAL ---
+# Registry
+registry = Registry(prefix='opty')
+
+# HTTP metrics
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    'opty_http_requests_in_flight', 'HTTP requests being handled'))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    'opty_http_request_duration_seconds', 'HTTP request latency', ('method', 'route', 'status')))
+
+# Backend metrics
+MONGO_OPERATION_DURATION = registry.register(Histogram(
+    'opty_mongo_operation_duration_seconds', 'UserRepository operation latency', ('method',)))
+SUPABASE_CALL_DURATION = registry.register(Histogram(
+    'opty_supabase_call_duration_seconds', 'Supabase Auth call latency', ('method',)))
+
+# Flow metrics
+LOGIN_DURATION = registry.register(Histogram(
+    'opty_login_duration_seconds', 'End-to-end login latency (Supabase sign-in and profile fetch)', ('outcome',)))
+
+# Bulkhead metrics
+BULKHEAD_WAIT = registry.register(Histogram(
+    'opty_bulkhead_wait_seconds', 'Time spent queued for a backend concurrency slot', ('backend',)))
+BULKHEAD_SHED = registry.register(Counter(
+    'opty_bulkhead_shed_total', 'Calls shed because a backend was saturated', ('backend', 'reason')))
+
+# Rate limiting metrics
+RATE_LIMITED = registry.register(Counter(
+    'opty_rate_limited_total', 'Requests rejected by the rate limiter', ('route', 'scope')))
+
+# Error metrics
+ERRORS = registry.register(Counter(
+    'opty_errors_total', 'Errors mapped to HTTP responses', ('error',)))
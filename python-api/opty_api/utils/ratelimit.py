@@ -0,0 +1,193 @@
+"""
+Token bucket rate limiting.
+
+Every (route, scope, identity) has a bucket holding up to N tokens that refills at N per period;
+a request takes one token or is rejected with the time until the next one. Buckets live in
+process memory by default, or in MongoDB so every worker and replica shares them.
+"""
+
+# --- IMPORTS ---
+from collections import OrderedDict
+from opty_api.err.rate_limited_error import RateLimitedError
+from opty_api.utils.metrics import RATE_LIMITED
+from pymongo import ReturnDocument
+
+import logging
+import time
+
+
+# --- TYPES ---
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+
+# --- CONSTANTS ---
+# Rule periods, in seconds
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+def parse_rule(rule: str) -> Tuple[float, float]:
+    """
+    Parse a rule such as '5/minute'.
+
+    :param rule: '<requests>/<second|minute|hour|day>'
+
+    :returns: Bucket capacity and refill rate in tokens per second
+
+    :raises ValueError: If the rule is malformed
+    """
+    count, _, period = rule.partition('/')
+    if period not in PERIODS or not count.isdigit() or int(count) < 1:
+        raise ValueError(f'Invalid rate limit rule: {rule!r}')
+    return float(count), int(count) / PERIODS[period]
+
+
+class MemoryBackend:
+    """
+    Buckets in process memory, bounded to the most recently used keys.
+    """
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        """
+        Initialize the backend.
+
+        :param max_keys: Maximum number of buckets kept; the least recently used are dropped
+        """
+        self.max_keys = max_keys
+        self.__buckets: OrderedDict = OrderedDict()
+
+
+    async def take(self, key: str, capacity: float, refill_rate: float) -> float:
+        """
+        Take a token from a bucket.
+
+        :param key: Bucket key
+        :param capacity: Bucket capacity
+        :param refill_rate: Tokens added per second
+
+        :returns: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+
+        # Refill bucket for the elapsed time (new buckets start full)
+        bucket = self.__buckets.pop(key, None)
+        tokens = capacity if bucket is None else min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+
+        # Take a token if there is one
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / refill_rate
+
+        # Store bucket as most recently used and drop the oldest ones
+        self.__buckets[key] = (tokens, now)
+        while len(self.__buckets) > self.max_keys:
+            self.__buckets.popitem(last=False)
+
+        # Return wait time
+        return wait
+
+
+class MongoBackend:
+    """
+    Buckets in a MongoDB collection, shared by every worker.
+    Each decision is a single atomic find_one_and_update using the server clock; idle buckets
+    expire through a TTL index on 'expires_at'.
+    """
+
+    def __init__(self, collection) -> None:
+        """
+        Initialize the backend.
+
+        :param collection: Collection holding the buckets
+        """
+        self.collection = collection
+
+
+    async def take(self, key: str, capacity: float, refill_rate: float) -> float:
+        """
+        Take a token from a bucket.
+        Fails open: if MongoDB cannot be reached the request is allowed.
+
+        :param key: Bucket key
+        :param capacity: Bucket capacity
+        :param refill_rate: Tokens added per second
+
+        :returns: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = {'$divide': [{'$toLong': '$$NOW'}, 1000]}
+        elapsed = {'$subtract': [now, {'$ifNull': ['$updated_at', now]}]}
+
+        # Refill, take a token if there is one, push expiry past the time a full refill takes
+        pipeline = [
+            {'$set': {
+                'tokens': {'$min': [capacity, {'$add': [{'$ifNull': ['$tokens', capacity]},
+                                                        {'$multiply': [elapsed, refill_rate]}]}]},
+                'updated_at': now,
+            }},
+            {'$set': {'allowed': {'$gte': ['$tokens', 1]}}},
+            {'$set': {
+                'tokens': {'$cond': ['$allowed', {'$subtract': ['$tokens', 1]}, '$tokens']},
+                'expires_at': {'$add': ['$$NOW', int(capacity / refill_rate * 1000)]},
+            }},
+        ]
+
+        try:
+            bucket = await self.collection.find_one_and_update(
+                {'_id': key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
+
+        # error in MongoDB: allow request
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Rate limit check failed, allowing request: %s', e)
+            return 0.0
+
+        # Return wait time
+        return 0.0 if bucket['allowed'] else (1 - bucket['tokens']) / refill_rate
+
+
+class RateLimiter:
+    """
+    Applies the configured rules of each route.
+    """
+
+    def __init__(self, backend, rules: Dict[str, Dict[str, str]]) -> None:
+        """
+        Initialize the limiter.
+
+        :param backend: MemoryBackend or MongoBackend
+        :param rules: Rule per scope ('ip', 'user') per route, e.g. {'login': {'ip': '20/minute'}}
+
+        :raises ValueError: If a rule is malformed
+        """
+        self.backend = backend
+        self.rules = {route: {scope: parse_rule(rule) for scope, rule in scopes.items()}
+                      for route, scopes in rules.items()}
+
+
+    async def check(self, route: str, identities: Dict[str, Optional[str]]) -> None:
+        """
+        Take a token from every bucket of a request.
+
+        :param route: Route name
+        :param identities: Identity per scope, scopes without identity are skipped
+
+        :raises RateLimitedError: If a bucket is empty
+        """
+        for scope, (capacity, refill_rate) in self.rules.get(route, {}).items():
+            identity = identities.get(scope)
+            if not identity:
+                continue
+
+            # Bucket empty: reject request
+            wait = await self.backend.take(f'{route}:{scope}:{identity}', capacity, refill_rate)
+            if wait > 0:
+                RATE_LIMITED.inc(route, scope)
+                raise RateLimitedError(f'Rate limit of {route} exceeded ({scope})', wait)
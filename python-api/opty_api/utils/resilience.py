@@ -0,0 +1,285 @@
+"""
+Failure isolation for calls to external services.
+
+CallGuard wraps every call with a per-operation timeout, jittered retries for idempotent
+operations and a circuit breaker. After a run of consecutive failures the breaker opens and
+calls fail fast with SupabaseError instead of piling up on the event loop; after a recovery
+delay a single trial call is let through to decide whether to close it again. With a bulkhead,
+each attempt also holds one of the service's concurrency slots.
+"""
+
+# --- IMPORTS ---
+from contextlib import nullcontext
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.err.supabase_error import SupabaseError
+from opty_api.utils.bulkhead import Bulkhead
+from opty_api.utils.context import set_request_deadline
+from opty_api.utils.deadline import require_budget
+from opty_api.utils.metrics import SUPABASE_CALL_DURATION
+from supabase_auth.errors import AuthApiError
+from supabase_auth.errors import AuthRetryableError
+from supabase_auth.errors import AuthUnknownError
+
+import asyncio
+import httpx
+import logging
+import random
+import time
+
+
+# --- TYPES ---
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import TypeVar
+
+
+# --- CONSTANTS ---
+T = TypeVar('T')
+
+# Breaker states, exported as numbers on the metrics endpoint
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+def is_transient(error: BaseException) -> bool:
+    """
+    Check whether an error means the service is unhealthy, as opposed to a rejected request.
+
+    :param error: Raised error
+
+    :returns: True for timeouts, network errors and server-side failures
+    """
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError, AuthRetryableError, AuthUnknownError)):
+        return True
+    if isinstance(error, AuthApiError):
+        return (error.status or 0) >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float) -> None:
+        """
+        Initialize the breaker.
+
+        :param failure_threshold: Consecutive failures that open the breaker
+        :param recovery_seconds: Time the breaker stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+        self.opened_total = 0
+        self.rejected_total = 0
+
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        :returns: False while the breaker is open or a trial call is running
+        """
+
+        # Closed: every call proceeds
+        if self.state == CLOSED:
+            return True
+
+        # Open and recovery delay elapsed: let one trial call through
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+            self.state = HALF_OPEN
+
+        if self.state == HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+
+        # Fail fast
+        self.rejected_total += 1
+        return False
+
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the breaker.
+        """
+        if self.state != CLOSED:
+            logger.info('Circuit breaker closed')
+        self.state = CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the breaker past the threshold or after a failed trial.
+        """
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.opened_total += 1
+            logger.warning('Circuit breaker opened after %s consecutive failures', self.failures)
+
+
+    def release(self) -> None:
+        """
+        Record a call that ended without telling whether the service is healthy.
+        """
+        self.trial_in_flight = False
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get breaker counters.
+
+        :returns: State (0 closed, 1 half open, 2 open), consecutive failures, openings and rejections
+        """
+        return {
+            'state': STATE_VALUES[self.state],
+            'consecutive_failures': self.failures,
+            'opened_total': self.opened_total,
+            'rejected_total': self.rejected_total,
+        }
+
+
+class CallGuard:
+    """
+    Applies timeouts, retries, a circuit breaker and a bulkhead to the calls of one service.
+    """
+
+    def __init__(self,  # pylint: disable=R0913,R0917
+                 breaker: CircuitBreaker,
+                 timeouts: Dict[str, float],
+                 default_timeout: float,
+                 retries: int,
+                 backoff_seconds: float,
+                 bulkhead: Optional[Bulkhead] = None) -> None:
+        """
+        Initialize the guard.
+
+        :param breaker: Circuit breaker of the service
+        :param timeouts: Timeout per operation, in seconds
+        :param default_timeout: Timeout of operations without their own
+        :param retries: Retries of idempotent operations after a transient failure
+        :param backoff_seconds: Base of the exponential backoff between retries
+        :param bulkhead: Concurrency limit of the calls, None for unbounded
+        """
+        self.breaker = breaker
+        self.timeouts = timeouts
+        self.default_timeout = default_timeout
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.bulkhead = bulkhead
+
+
+    async def call(self, operation: str, func: Callable[[], Awaitable[T]], idempotent: bool = False) -> T:
+        """
+        Run a call.
+
+        :param operation: Operation name, used for its timeout and latency metric
+        :param func: Zero-argument coroutine function performing the call
+        :param idempotent: Whether the call may be retried after a transient failure
+
+        :returns: Result of the call
+
+        :raises SupabaseError: If the breaker is open
+        :raises OverloadedError: If the bulkhead is saturated
+        :raises DeadlineExceededError: If the request deadline passes before the call completes
+        :raises Exception: Whatever the last attempt raised
+        """
+        attempts = 1 + (self.retries if idempotent else 0)
+
+        for attempt in range(attempts):
+
+            # Retry: back off with full jitter, outside the bulkhead
+            if attempt:
+                await asyncio.sleep(random.uniform(0, self.backoff_seconds * 2 ** (attempt - 1)))
+
+            async with self.bulkhead.slot() if self.bulkhead else nullcontext():
+
+                # Timeout: operation's own, capped by what is left of the request deadline
+                timeout = self.timeouts.get(operation, self.default_timeout)
+                budget = require_budget(operation)
+                capped = budget is not None and budget < timeout
+                if capped:
+                    timeout = budget
+
+                # Breaker open: fail fast
+                if not self.breaker.allow():
+                    raise SupabaseError(f'[SUPABASE  ] {operation} skipped: circuit breaker open')
+
+                try:
+                    with SUPABASE_CALL_DURATION.time(operation):
+                        result = await asyncio.wait_for(func(), timeout=timeout)
+
+                # Call failed
+                except Exception as e:  # pylint: disable=W0718
+
+                    # Request deadline reached: not a sign of an unhealthy service
+                    if capped and isinstance(e, asyncio.TimeoutError):
+                        self.breaker.release()
+                        raise DeadlineExceededError(f'{operation} timed out') from e
+
+                    # Request rejected: the service answered, so it is healthy
+                    if not is_transient(e):
+                        self.breaker.record_success()
+                        raise
+
+                    # Service unhealthy: record failure, retry idempotent calls
+                    self.breaker.record_failure()
+                    if attempt == attempts - 1:
+                        raise
+                    continue
+
+                # Call cancelled (client gone, shutdown): free the trial slot without an outcome
+                except BaseException:
+                    self.breaker.release()
+                    raise
+
+                # Call succeeded: return result
+                self.breaker.record_success()
+                return result
+
+        # Unreachable: the last attempt returns or raises
+        raise SupabaseError(f'[SUPABASE  ] {operation} failed')
+
+
+    async def call_detached(self, operation: str, func: Callable[[], Awaitable[T]], timeout: float) -> T:
+        """
+        Run a call that must not be skipped, such as a compensating delete.
+        It runs in its own task, outside the request deadline and the bulkhead and shielded from the
+        request's cancellation, bounded only by its own timeout.
+
+        :param operation: Operation name, used for its latency metric
+        :param func: Zero-argument coroutine function performing the call
+        :param timeout: Timeout of the call, in seconds
+
+        :returns: Result of the call
+
+        :raises Exception: Whatever the call raised
+        """
+
+        async def run() -> T:
+
+            # Task context is a copy: clearing the deadline does not affect the request
+            set_request_deadline(None)
+            with SUPABASE_CALL_DURATION.time(operation):
+                return await asyncio.wait_for(func(), timeout=timeout)
+
+        return await asyncio.shield(asyncio.ensure_future(run()))
@@ -0,0 +1,141 @@
+"""
+Coalescing of concurrent identical calls.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.utils.context import set_request_deadline
+from opty_api.utils.deadline import remaining_budget
+
+import asyncio
+import contextvars
+import time
+
+
+# --- TYPES ---
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import TypeVar
+
+
+# --- CONSTANTS ---
+T = TypeVar('T')
+
+
+# --- CODE ---
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+    Callers arriving while a call for their key is in flight await it instead of starting their
+    own, and every waiter gets its outcome, result or exception. The call is shielded, so a
+    cancelled waiter does not cancel it for the others.
+
+    The call belongs to no request: it runs in a fresh context, without the first caller's
+    deadline or bulkhead slots, bounded by its own timeout. Each waiter stops waiting when its
+    own request deadline passes.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """
+        Initialize the group.
+
+        :param timeout: Deadline of each call, in seconds, None for none
+        """
+        self.timeout = timeout
+
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call, or join the one already in flight for the same key.
+
+        :param key: Call identity
+        :param func: Zero-argument coroutine function performing the call
+
+        :returns: Outcome of the call
+
+        :raises DeadlineExceededError: If the request deadline passes before the call completes
+        :raises Exception: Whatever the call raised
+        """
+        call = self.__calls.get(key)
+
+        # Call in flight: join it
+        if call is not None:
+            self.coalesced += 1
+
+        # First caller: start the call in a fresh context
+        else:
+            self.calls += 1
+            call = contextvars.Context().run(asyncio.ensure_future, self.__run(func))
+            self.__calls[key] = call
+            call.add_done_callback(lambda done: self.__forget(key, done))
+
+        # No deadline: wait for the shared outcome
+        budget = remaining_budget()
+        if budget is None:
+            return await asyncio.shield(call)
+
+        # Wait for the shared outcome, no longer than the request deadline
+        if budget > 0:
+            await asyncio.wait([call], timeout=budget)
+        if not call.done():
+            raise DeadlineExceededError('Deadline passed waiting for a shared call')
+        return call.result()
+
+
+    async def __run(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call under its own deadline.
+
+        :param func: Zero-argument coroutine function performing the call
+
+        :returns: Outcome of the call
+        """
+        set_request_deadline(time.monotonic() + self.timeout if self.timeout else None)
+        return await func()
+
+
+    def discard(self, match: Callable[[Hashable], bool]) -> None:
+        """
+        Detach the calls in flight for matching keys, so later callers start fresh ones.
+        Their current waiters still get their outcome.
+
+        :param match: Predicate selecting the keys to detach
+        """
+        for key in [key for key in self.__calls if match(key)]:
+            del self.__calls[key]
+
+
+    def __forget(self, key: Hashable, call: asyncio.Future) -> None:
+        """
+        Drop a finished call, so the next caller starts a fresh one.
+
+        :param key: Call identity
+        :param call: Finished call
+        """
+        if self.__calls.get(key) is call:
+            del self.__calls[key]
+
+        # Mark the exception as retrieved, in case every waiter was cancelled
+        if not call.cancelled():
+            call.exception()
+
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get coalescing counters.
+
+        :returns: Calls started, calls joined and calls in flight
+        """
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self.__calls),
+        }
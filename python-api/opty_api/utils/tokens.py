@@ -0,0 +1,206 @@
+"""
+Local access token verification.
+"""
+
+# --- IMPORTS ---
+from jose import jwt
+from jose.exceptions import JWTError
+
+import asyncio
+import httpx
+import logging
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+# --- CONSTANTS ---
+SYMMETRIC_ALGORITHMS = ('HS256', 'HS384', 'HS512')
+JWKS_FETCH_TIMEOUT = 5.0
+
+
+# --- GLOBAL ---
+logger = logging.getLogger(__name__)
+
+
+# --- CODE ---
+class LocalTokenVerifier:
+    """
+    Verifies Supabase access tokens in-process.
+    Checks signature, expiry, audience and issuer without calling Supabase.
+    """
+
+    def __init__(self,  # pylint: disable=R0913,R0917
+                 algorithms: List[str],
+                 audience: str,
+                 issuer: str,
+                 secret: Optional[str] = None,
+                 jwks_url: Optional[str] = None,
+                 jwks_refresh_seconds: int = 600,
+                 leeway_seconds: int = 0) -> None:
+        """
+        Initialize the verifier.
+
+        :param algorithms: Accepted signing algorithms
+        :param audience: Expected 'aud' claim
+        :param issuer: Expected 'iss' claim
+        :param secret: Shared secret for HS* algorithms
+        :param jwks_url: JWKS endpoint for asymmetric algorithms
+        :param jwks_refresh_seconds: Interval between JWKS refreshes
+        :param leeway_seconds: Clock skew tolerated on time claims
+        """
+        self.algorithms = algorithms
+        self.audience = audience
+        self.issuer = issuer
+        self.__secret = secret
+        self.__jwks_url = jwks_url
+        self.__jwks_refresh_seconds = jwks_refresh_seconds
+        self.__leeway_seconds = leeway_seconds
+
+        self.__keys: Dict[str, Dict[str, Any]] = {}
+        self.__refresh_task: Optional[asyncio.Task] = None
+
+
+    @property
+    def uses_jwks(self) -> bool:
+        """
+        Whether any accepted algorithm needs keys from the JWKS endpoint.
+        """
+        return any(algorithm not in SYMMETRIC_ALGORITHMS for algorithm in self.algorithms)
+
+
+    async def start(self) -> None:
+        """
+        Fetch the JWKS and schedule its background refresh.
+        Failures are logged: tokens that cannot be verified locally fall back to Supabase.
+        """
+
+        # Nothing to fetch: only shared secret algorithms configured
+        if not self.uses_jwks or not self.__jwks_url:
+            return
+
+        # Initial fetch
+        try:
+            await self.refresh_jwks()
+
+        # error fetching keys: log warning
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Could not fetch JWKS: %s', e)
+
+        # Schedule background refresh
+        self.__refresh_task = asyncio.create_task(self.__refresh_loop())
+
+
+    def stop(self) -> None:
+        """
+        Cancel the background JWKS refresh.
+        """
+        if self.__refresh_task:
+            self.__refresh_task.cancel()
+            self.__refresh_task = None
+
+
+    async def refresh_jwks(self) -> None:
+        """
+        Fetch the JWKS and replace the cached signing keys.
+
+        :raises httpx.HTTPError: If the JWKS endpoint cannot be read
+        """
+
+        # Fetch key set
+        async with httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT) as client:
+            response = await client.get(self.__jwks_url)
+            response.raise_for_status()
+
+        # Index keys by key id
+        self.__keys = {key['kid']: key for key in response.json().get('keys', []) if 'kid' in key}
+
+
+    async def __refresh_loop(self) -> None:
+        """
+        Periodically refresh the JWKS.
+        """
+        while True:
+            await asyncio.sleep(self.__jwks_refresh_seconds)
+
+            # Refresh keys, keeping the previous set on failure
+            try:
+                await self.refresh_jwks()
+
+            # error fetching keys: log warning
+            except Exception as e:  # pylint: disable=W0718
+                logger.warning('Could not refresh JWKS: %s', e)
+
+
+    def __get_key(self, token: str) -> Optional[Any]:
+        """
+        Get the verification key for a token.
+
+        :param token: JWT access token
+
+        :returns: Secret or JWK, None if no key is available locally
+
+        :raises JWTError: If the token header is malformed
+        """
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get('alg')
+
+        # Algorithm not accepted: nothing to verify with
+        if algorithm not in self.algorithms:
+            return None
+
+        # Shared secret algorithm: an empty secret counts as none
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            return self.__secret or None
+
+        # Asymmetric algorithm: look up key by id
+        return self.__keys.get(header.get('kid'))
+
+
+    def can_verify(self, token: str) -> bool:
+        """
+        Check whether a token can be verified locally.
+
+        :param token: JWT access token
+
+        :returns: True if a key for the token is available
+        """
+        try:
+            return bool(self.__get_key(token))
+
+        # malformed header: let verify() reject it
+        except JWTError:
+            return True
+
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token and return its claims.
+
+        :param token: JWT access token
+
+        :returns: Token claims
+
+        :raises JWTError: If the token is malformed, expired, or fails any check
+        """
+
+        # Get verification key
+        key = self.__get_key(token)
+
+        # No key available: reject
+        if not key:
+            raise JWTError('No verification key available')
+
+        # Verify signature and registered claims
+        return jwt.decode(
+            token,
+            key,
+            algorithms=self.algorithms,
+            audience=self.audience,
+            issuer=self.issuer,
+            options={'require_exp': True, 'require_sub': True, 'leeway': self.__leeway_seconds},
+        )
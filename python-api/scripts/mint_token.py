@@ -0,0 +1,117 @@
+"""
+Script to mint Supabase-compatible access tokens for local testing.
+
+Tokens carry the same registered claims Supabase issues ('sub', 'aud', 'iss', 'exp', 'iat', 'role', 'email'),
+so they are accepted by the API when AUTH_TOKEN_VERIFICATION=local.
+
+Usage:
+  python scripts/mint_token.py <supabase_id> [--email EMAIL] [--ttl SECONDS]       # HS256 with SUPABASE_JWT_SECRET
+  python scripts/mint_token.py <supabase_id> --key private.pem --alg ES256 --kid k1  # asymmetric key
+  python scripts/mint_token.py <supabase_id> --ttl -60                               # already expired token
+"""
+
+# --- IMPORTS ---
+from dotenv import load_dotenv
+from jose import jwt
+
+import argparse
+import os
+import sys
+import time
+
+
+# --- TYPES ---
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+
+# --- GLOBALS ---
+load_dotenv()
+
+
+# --- CODE ---
+def mint_token(supabase_id: str,  # pylint: disable=R0913,R0917
+               key: str,
+               algorithm: str = 'HS256',
+               audience: str = 'authenticated',
+               issuer: Optional[str] = None,
+               ttl: int = 3600,
+               kid: Optional[str] = None,
+               email: Optional[str] = None,
+               extra_claims: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Mint a signed access token.
+
+    :param supabase_id: Token subject (Supabase user ID)
+    :param key: HS* secret or PEM private key
+    :param algorithm: Signing algorithm
+    :param audience: 'aud' claim
+    :param issuer: 'iss' claim, defaults to the Supabase Auth URL
+    :param ttl: Seconds until expiry (negative for an expired token)
+    :param kid: Key ID placed in the token header
+    :param email: 'email' claim
+    :param extra_claims: Additional claims
+
+    :returns: Encoded JWT
+    """
+    now = int(time.time())
+
+    # Default issuer: Supabase Auth URL
+    if issuer is None:
+        issuer = f'{os.getenv("SUPABASE_URL", "http://localhost").rstrip("/")}/auth/v1'
+
+    # Build claims
+    claims = {
+        'sub': supabase_id,
+        'aud': audience,
+        'iss': issuer,
+        'iat': now,
+        'exp': now + ttl,
+        'role': 'authenticated',
+        'email': email,
+        **(extra_claims or {}),
+    }
+
+    # Sign token
+    return jwt.encode(claims, key, algorithm=algorithm, headers={'kid': kid} if kid else None)
+
+
+if __name__ == '__main__':
+    """
+    Main entry point for the script.
+    """
+    parser = argparse.ArgumentParser(description='Mint a Supabase-compatible access token.')
+    parser.add_argument('supabase_id')
+    parser.add_argument('--email')
+    parser.add_argument('--ttl', type=int, default=3600)
+    parser.add_argument('--alg', default='HS256')
+    parser.add_argument('--key', help='PEM private key file (asymmetric algorithms)')
+    parser.add_argument('--kid')
+    parser.add_argument('--audience', default=os.getenv('SUPABASE_JWT_AUDIENCE', 'authenticated'))
+    parser.add_argument('--issuer', default=os.getenv('SUPABASE_JWT_ISSUER'))
+    args = parser.parse_args()
+
+    # Get signing key
+    if args.key:
+        with open(args.key, encoding='utf-8') as key_file:
+            signing_key = key_file.read()
+    else:
+        signing_key = os.getenv('SUPABASE_JWT_SECRET')
+
+    # No key available: print error and exit
+    if not signing_key:
+        print('❌ Error: SUPABASE_JWT_SECRET is not set and no --key was given.')
+        sys.exit(1)
+
+    # Mint and print token
+    print(mint_token(
+        supabase_id=args.supabase_id,
+        key=signing_key,
+        algorithm=args.alg,
+        audience=args.audience,
+        issuer=args.issuer,
+        ttl=args.ttl,
+        kid=args.kid,
+        email=args.email,
+    ))
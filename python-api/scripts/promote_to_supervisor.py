@@ -5,6 +5,7 @@ Usage:
   python scripts/promote_to_supervisor.py promote <email>   # Promote user to supervisor
   python scripts/promote_to_supervisor.py demote <email>    # Demote supervisor to user
   python scripts/promote_to_supervisor.py list              # List all supervisors
+  python scripts/promote_to_supervisor.py batch <csv|->     # Set roles from CSV rows 'email[,role]'
 """
 
 # --- IMPORTS ---
@@ -13,6 +14,7 @@ from opty_api.mongo.setup.connection import MongoDBSetup
 from opty_api.mongo.repositories.users import UserRepository
 
 import asyncio
+import csv
 import sys
 import os
 
@@ -49,12 +51,12 @@ async def promote_user(email: str) -> bool:
             return True
 
         # Update user role to supervisor
-        success = await user_repository.update_role(email, 'supervisor')
+        await user_repository.update_role(email, 'supervisor')
 
         # Print success message
         print(f'✅ Successfully promoted "{email}" to supervisor!')
-        print(f'   Name: {user.name}')
-        print(f'   Supabase ID: {user.supabase_id}')
+        print(f'   Name: {user["name"]}')
+        print(f'   Supabase ID: {user["supabase_id"]}')
 
         # Return success status
         return True
@@ -66,7 +68,7 @@ async def promote_user(email: str) -> bool:
 
     # Close MongoDB connection
     finally:
-        mongodb.close_db()
+        await mongodb.close_db()
 
 
 async def demote_user(email: str) -> bool:
@@ -85,7 +87,7 @@ async def demote_user(email: str) -> bool:
             return False
 
         # User already regular user: print and return True
-        if user.role == 'user':
+        if user['role'] == 'user':
             print(f'ℹ️  User "{email}" is already a regular user.')
             return True
 
@@ -94,8 +96,8 @@ async def demote_user(email: str) -> bool:
 
         # Print success message
         print(f'✅ Successfully demoted "{email}" to regular user!')
-        print(f'   Name: {user.name}')
-        print(f'   Supabase ID: {user.supabase_id}')
+        print(f'   Name: {user["name"]}')
+        print(f'   Supabase ID: {user["supabase_id"]}')
 
         # Return success status
         return True
@@ -107,7 +109,7 @@ async def demote_user(email: str) -> bool:
 
     # Close MongoDB connection
     finally:
-        mongodb.close_db()
+        await mongodb.close_db()
 
 
 async def list_supervisors() -> None:
@@ -127,10 +129,10 @@ async def list_supervisors() -> None:
         print(f'\n📋 Supervisors ({len(supervisors)}):')
         print('=' * 80)
         for supervisor in supervisors:
-            status = '✅ Active' if supervisor.is_active else '❌ Inactive'
-            print(f'  • {supervisor.name} ({supervisor.email})')
+            status = '✅ Active' if supervisor['is_active'] else '❌ Inactive'
+            print(f'  • {supervisor["name"]} ({supervisor["email"]})')
             print(f'    Status: {status}')
-            print(f'    Created: {supervisor.created_at}')
+            print(f'    Created: {supervisor["created_at"]}')
             print()
 
     # Error occurred: print message
@@ -139,7 +141,91 @@ async def list_supervisors() -> None:
 
     # Close MongoDB connection
     finally:
-        mongodb.close_db()
+        await mongodb.close_db()
+
+
+def read_roles(source: str) -> tuple:
+    """
+    Read role changes from a CSV file or stdin.
+    Rows are 'email[,role]'; the role defaults to supervisor and an 'email' header row is skipped.
+
+    :param source: CSV file path, '-' for stdin
+
+    :returns: Role by email and invalid rows as (line number, reason)
+    """
+    roles = {}
+    invalid = []
+
+    # Open source
+    stream = sys.stdin if source == '-' else open(source, newline='', encoding='utf-8')  # pylint: disable=R1732
+
+    try:
+        for line_number, row in enumerate(csv.reader(stream), start=1):
+            cells = [cell.strip() for cell in row]
+
+            # Blank line or header: skip
+            if not cells or not cells[0] or cells[0].lower() == 'email':
+                continue
+
+            # Unknown role: report row
+            role = cells[1].lower() if len(cells) > 1 and cells[1] else 'supervisor'
+            if role not in ('user', 'supervisor'):
+                invalid.append((line_number, f'{cells[0]}: invalid role "{role}"'))
+                continue
+
+            # Last row wins for repeated emails
+            roles[cells[0]] = role
+
+    # Close file
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    # Return rows
+    return roles, invalid
+
+
+async def batch_update_roles(source: str) -> bool:
+    """
+    Set the role of every user listed in a CSV file, a thousand users per round trip.
+
+    :param source: CSV file path, '-' for stdin
+    """
+    try:
+        # Read rows
+        roles, invalid = read_roles(source)
+        for line_number, reason in invalid:
+            print(f'❌ Line {line_number}: {reason}')
+
+        # Nothing to update: return
+        if not roles:
+            print('ℹ️  No rows to process.')
+            return not invalid
+
+        # Update roles in bulk
+        results = await user_repository.bulk_update_roles(roles)
+
+        # Print per-row results
+        icons = {'updated': '✅', 'unchanged': 'ℹ️ ', 'not_found': '❌'}
+        for email, result in results.items():
+            print(f'{icons[result]} {email}: {result} ({roles[email]})')
+
+        # Print summary
+        counts = {result: list(results.values()).count(result) for result in icons}
+        print(f'\n📋 {len(results)} users: {counts["updated"]} updated, {counts["unchanged"]} unchanged, '
+              f'{counts["not_found"]} not found, {len(invalid)} invalid rows')
+
+        # Return success status
+        return not invalid and not counts['not_found']
+
+    # Error occurred: print and return False
+    except Exception as e:
+        print(f'❌ Error: {str(e)}')
+        return False
+
+    # Close MongoDB connection
+    finally:
+        await mongodb.close_db()
 
 
 def print_usage() -> None:
@@ -153,11 +239,14 @@ Usage:
   python scripts/promote_to_supervisor.py promote <email>   # Promote user to supervisor
   python scripts/promote_to_supervisor.py demote <email>    # Demote supervisor to user
   python scripts/promote_to_supervisor.py list              # List all supervisors
+  python scripts/promote_to_supervisor.py batch <csv|->     # Set roles from CSV rows 'email[,role]'
 
 Examples:
   python scripts/promote_to_supervisor.py promote admin@example.com
   python scripts/promote_to_supervisor.py demote admin@example.com
   python scripts/promote_to_supervisor.py list
+  python scripts/promote_to_supervisor.py batch supervisors.csv
+  cut -d, -f1 emails.csv | python scripts/promote_to_supervisor.py batch -
 
 Environment Variables:
   MONGODB_URL      - MongoDB connection string
@@ -223,6 +312,21 @@ if __name__ == '__main__':
         # Exit
         sys.exit(0)
 
+    # Set roles from CSV
+    elif command == 'batch':
+
+        # Check if source argument is provided
+        if len(sys.argv) < 3:
+            print('❌ Error: CSV file (or - for stdin) required.')
+            print('Usage: python scripts/promote_to_supervisor.py batch <csv|->')
+            sys.exit(1)
+
+        # Update roles
+        success = asyncio.run(batch_update_roles(sys.argv[2]))
+
+        # Exit
+        sys.exit(0 if success else 1)
+
     # Unknown command: print usage and exit
     else:
         print(f'❌ Unknown command: {command}')
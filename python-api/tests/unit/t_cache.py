@@ -0,0 +1,113 @@
+"""
+Unit tests of the access token cache.
+"""
+
+# --- IMPORTS ---
+from jose import jwt
+from opty_api.utils.cache import UserCache
+
+import time
+import unittest
+
+
+# --- CODE ---
+class UserCacheTest(unittest.TestCase):
+    """
+    UserCache expiry, eviction and invalidation.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a cache.
+        """
+        self.cache = UserCache(max_size=2, ttl_seconds=60)
+        self.user = {'supabase_id': 'user-1', 'email': 'user@test.local'}
+
+
+    def test_get_returns_cached_user(self) -> None:
+        """
+        A cached token resolves to its user.
+        """
+        self.cache.set('token', self.user)
+
+        self.assertEqual(self.cache.get('token'), self.user)
+        self.assertIsNone(self.cache.get('other'))
+        self.assertEqual((self.cache.stats()['hits'], self.cache.stats()['misses']), (1, 1))
+
+
+    def test_expired_token_is_not_cached(self) -> None:
+        """
+        A token past its 'exp' claim is not stored.
+        """
+        token = jwt.encode({'exp': int(time.time()) - 10}, 'secret', algorithm='HS256')
+
+        self.cache.set(token, self.user)
+
+        self.assertIsNone(self.cache.get(token))
+
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        """
+        Over capacity the least recently used token goes.
+        """
+        self.cache.set('a', {'supabase_id': 'a', 'email': 'a@test.local'})
+        self.cache.set('b', {'supabase_id': 'b', 'email': 'b@test.local'})
+        self.cache.get('a')
+        self.cache.set('c', {'supabase_id': 'c', 'email': 'c@test.local'})
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+
+    def test_invalidate_drops_entries_by_supabase_id_and_email(self) -> None:
+        """
+        Invalidation reaches every token of the user through either index.
+        """
+        self.cache.set('a', self.user)
+        self.cache.set('b', self.user)
+
+        self.cache.invalidate(email='user@test.local')
+
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+
+
+    def test_fill_after_invalidate_is_rejected(self) -> None:
+        """
+        A profile looked up before an invalidation of its user is not cached.
+        """
+        generation = self.cache.generation('user-1')
+        self.cache.invalidate(supabase_id='user-1')
+
+        self.cache.set('token', self.user, generation)
+
+        self.assertIsNone(self.cache.get('token'))
+
+
+    def test_fill_after_clear_is_rejected(self) -> None:
+        """
+        A profile looked up before a clear is not cached.
+        """
+        generation = self.cache.generation('user-1')
+        self.cache.clear()
+
+        self.cache.set('token', self.user, generation)
+
+        self.assertIsNone(self.cache.get('token'))
+
+
+    def test_fill_after_other_user_invalidated_is_kept(self) -> None:
+        """
+        Invalidating another user does not reject the fill.
+        """
+        generation = self.cache.generation('user-1')
+        self.cache.invalidate(supabase_id='user-2')
+
+        self.cache.set('token', self.user, generation)
+
+        self.assertEqual(self.cache.get('token'), self.user)
+
+
+if __name__ == '__main__':
+    unittest.main()
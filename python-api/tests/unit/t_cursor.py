@@ -0,0 +1,69 @@
+"""
+Unit tests of pagination cursors.
+"""
+
+# --- IMPORTS ---
+from bson import ObjectId
+from datetime import datetime
+from datetime import timezone
+from opty_api.err.invalid_cursor_error import InvalidCursorError
+from opty_api.utils.cursor import decode_cursor
+from opty_api.utils.cursor import encode_cursor
+
+import base64
+import unittest
+
+
+# --- CODE ---
+def raw_cursor(payload: bytes) -> str:
+    """
+    Encode arbitrary bytes the way cursors are.
+
+    :param payload: Cursor payload
+
+    :returns: Cursor token
+    """
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+class CursorTest(unittest.TestCase):
+    """
+    Cursor round trip and rejection of malformed cursors.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        A cursor decodes to the sort key it was made from.
+        """
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+        object_id = ObjectId()
+
+        cursor = encode_cursor(created_at, object_id)
+
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), (created_at, object_id))
+
+
+    def test_malformed_cursors_are_rejected(self) -> None:
+        """
+        Anything that is not a cursor raises InvalidCursorError.
+        """
+        cursors = (
+            '',
+            'a',
+            '!!!!',
+            raw_cursor(b'not json'),
+            raw_cursor(b'\xff\xfe'),
+            raw_cursor(b'{"created_at": 1}'),
+            raw_cursor(b'[1, 2]'),
+            raw_cursor(b'["2025-01-02T03:04:05", "not-an-id"]'),
+            raw_cursor(b'["not-a-date", "5f1d7f1e9b1e8b0a1c2d3e4f"]'),
+            raw_cursor(b'["2025-01-02T03:04:05", "5f1d7f1e9b1e8b0a1c2d3e4f", 3]'),
+        )
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursorError):
+                decode_cursor(cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit tests of the metrics exposition.
+"""
+
+# --- IMPORTS ---
+from opty_api.utils.metrics import Counter
+from opty_api.utils.metrics import Histogram
+from opty_api.utils.metrics import Registry
+
+import unittest
+
+
+# --- CODE ---
+class RegistryTest(unittest.TestCase):
+    """
+    Prometheus text exposition.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a registry.
+        """
+        self.registry = Registry('test')
+
+
+    def test_label_values_are_escaped(self) -> None:
+        """
+        Backslashes, double quotes and newlines in label values cannot break the line.
+        """
+        counter = self.registry.register(Counter('test_total', 'Test counter', ['route']))
+        counter.inc('/a"b\\c\nd')
+
+        self.assertIn('test_total{route="/a\\"b\\\\c\\nd"} 1', self.registry.render().splitlines())
+
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """
+        Every bucket counts the observations up to its bound.
+        """
+        histogram = self.registry.register(Histogram('test_seconds', 'Test histogram', ['op'], buckets=(0.1, 1.0)))
+        histogram.observe(0.05, 'x')
+        histogram.observe(0.5, 'x')
+        histogram.observe(5, 'x')
+
+        lines = self.registry.render().splitlines()
+
+        self.assertIn('test_seconds_bucket{op="x",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{op="x",le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{op="x",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{op="x"} 3', lines)
+
+
+    def test_collectors_are_rendered_with_prefix(self) -> None:
+        """
+        Collected stats are exported under the registry prefix and their section.
+        """
+        self.registry.register_collector('cache', lambda: {'hits': 3})
+
+        self.assertIn('test_cache_hits 3', self.registry.render().splitlines())
+
+
+if __name__ == '__main__':
+    unittest.main()
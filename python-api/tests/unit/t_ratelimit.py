@@ -0,0 +1,163 @@
+"""
+Unit tests of rate limiting.
+"""
+
+# --- IMPORTS ---
+from starlette.requests import Request
+from types import SimpleNamespace
+from unittest import mock
+
+import os
+import unittest
+
+
+# --- GLOBAL ---
+# Settings read when the app is imported: local stand-ins only, the same as t_register
+# pylint: disable=R0801
+os.environ.setdefault('SUPABASE_URL', 'http://supabase.test')
+os.environ.setdefault('SUPABASE_KEY', 'test.service.key')
+os.environ.setdefault('MONGODB_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('MONGODB_DB_NAME', 'opty_test')
+os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+
+from opty_api.err.rate_limited_error import RateLimitedError  # pylint: disable=C0413
+from opty_api.responders.errors import rate_limited_error_handler  # pylint: disable=C0413
+from opty_api.utils.ratelimit import MemoryBackend  # pylint: disable=C0413
+from opty_api.utils.ratelimit import RateLimiter  # pylint: disable=C0413
+from opty_api.utils.ratelimit import parse_rule  # pylint: disable=C0413
+
+
+# --- CODE ---
+class ParseRuleTest(unittest.TestCase):
+    """
+    Rule parsing.
+    """
+
+    def test_valid_rule(self) -> None:
+        """
+        A rule gives the bucket capacity and its refill rate per second.
+        """
+        self.assertEqual(parse_rule('5/minute'), (5.0, 5 / 60))
+        self.assertEqual(parse_rule('2/second'), (2.0, 2.0))
+
+
+    def test_malformed_rule(self) -> None:
+        """
+        Malformed rules are rejected.
+        """
+        for rule in ('5', '0/minute', '-1/minute', 'five/minute', '5/week'):
+            with self.assertRaises(ValueError):
+                parse_rule(rule)
+
+
+class MemoryBackendTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Token bucket math of the in-memory backend.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a backend on a fake clock.
+        """
+        self.now = 1000.0
+        clock = mock.patch('opty_api.utils.ratelimit.time', SimpleNamespace(monotonic=lambda: self.now))
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.backend = MemoryBackend()
+
+
+    async def test_full_bucket_then_wait_for_next_token(self) -> None:
+        """
+        A new bucket allows its capacity, then reports the time until the next token.
+        """
+        results = [await self.backend.take('key', 3, 3 / 60) for _ in range(4)]
+
+        self.assertEqual(results[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(results[3], 20.0)
+
+
+    async def test_wait_shrinks_as_bucket_refills(self) -> None:
+        """
+        The wait accounts for the partial token refilled since the last request.
+        """
+        await self.backend.take('key', 1, 1 / 60)
+
+        self.now += 45
+        self.assertAlmostEqual(await self.backend.take('key', 1, 1 / 60), 15.0)
+
+        self.now += 15
+        self.assertEqual(await self.backend.take('key', 1, 1 / 60), 0.0)
+
+
+    async def test_refill_is_capped_at_capacity(self) -> None:
+        """
+        An idle bucket never holds more than its capacity.
+        """
+        await self.backend.take('key', 2, 1.0)
+
+        self.now += 3600
+        results = [await self.backend.take('key', 2, 1.0) for _ in range(3)]
+
+        self.assertEqual(results[:2], [0.0, 0.0])
+        self.assertAlmostEqual(results[2], 1.0)
+
+
+    async def test_least_recently_used_bucket_is_dropped(self) -> None:
+        """
+        Over the key limit the oldest bucket is forgotten and starts full again.
+        """
+        backend = MemoryBackend(max_keys=1)
+        await backend.take('a', 1, 1 / 60)
+        await backend.take('b', 1, 1 / 60)
+
+        self.assertEqual(await backend.take('a', 1, 1 / 60), 0.0)
+
+
+class RateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Route rules and the 429 response.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a limiter.
+        """
+        self.limiter = RateLimiter(MemoryBackend(), {'login': {'ip': '1/minute', 'user': '5/minute'}})
+
+
+    async def test_empty_bucket_raises_with_retry_after(self) -> None:
+        """
+        A request over the limit raises with the wait until the next token.
+        """
+        await self.limiter.check('login', {'ip': '10.0.0.1', 'user': None})
+
+        with self.assertRaises(RateLimitedError) as raised:
+            await self.limiter.check('login', {'ip': '10.0.0.1', 'user': None})
+
+        self.assertAlmostEqual(raised.exception.retry_after, 60.0, places=2)
+
+
+    async def test_identities_have_buckets_of_their_own(self) -> None:
+        """
+        Other addresses, scopes without identity and routes without rules are not limited.
+        """
+        await self.limiter.check('login', {'ip': '10.0.0.1'})
+        await self.limiter.check('login', {'ip': '10.0.0.2'})
+        await self.limiter.check('login', {})
+        await self.limiter.check('register', {'ip': '10.0.0.1'})
+
+
+    async def test_retry_after_header_rounds_up(self) -> None:
+        """
+        Retry-After is the wait rounded up to whole seconds, at least one.
+        """
+        request = Request({'type': 'http', 'method': 'POST', 'path': '/auth/login', 'headers': []})
+
+        for retry_after, header in ((0.2, '1'), (1.0, '1'), (1.01, '2'), (59.5, '60')):
+            response = await rate_limited_error_handler(request, RateLimitedError('limited', retry_after))
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], header)
+
+
+if __name__ == '__main__':
+    unittest.main()
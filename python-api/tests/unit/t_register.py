@@ -0,0 +1,168 @@
+"""
+Unit tests of the registration service.
+"""
+
+# --- IMPORTS ---
+from types import SimpleNamespace
+
+import asyncio
+import os
+import unittest
+
+
+# --- GLOBAL ---
+# Settings read when the app is imported: local stand-ins only
+os.environ.setdefault('SUPABASE_URL', 'http://supabase.test')
+os.environ.setdefault('SUPABASE_KEY', 'test.service.key')
+os.environ.setdefault('MONGODB_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('MONGODB_DB_NAME', 'opty_test')
+os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+
+from opty_api.app import container  # pylint: disable=C0413
+from opty_api.err.already_exists_error import AlreadyExistsError  # pylint: disable=C0413
+from opty_api.err.mongodb_unavailable_error import MongoUnavailableError  # pylint: disable=C0413
+from opty_api.services.auth.register import register_user  # pylint: disable=C0413
+from opty_api.utils.resilience import CallGuard  # pylint: disable=C0413
+from opty_api.utils.resilience import CircuitBreaker  # pylint: disable=C0413
+
+
+# --- CODE ---
+class FakeAuth:
+    """
+    Supabase Auth stand-in: every signup gets a user of its own unless the email is pinned to one.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the fake.
+        """
+        self.existing = {}
+        self.created = []
+        self.deleted = []
+        self.admin = self
+
+
+    async def sign_up(self, credentials):
+        """
+        Sign up, returning the pinned user of the email if any.
+        """
+        await asyncio.sleep(0)
+        user_id = self.existing.get(credentials['email'])
+        if user_id is None:
+            user_id = f'supabase-{len(self.created)}'
+            self.created.append(user_id)
+        return SimpleNamespace(user=SimpleNamespace(id=user_id, identities=[{'provider': 'email'}]))
+
+
+    async def delete_user(self, user_id):
+        """
+        Delete a user.
+        """
+        self.deleted.append(user_id)
+
+
+class FakeUserRepository:
+    """
+    User repository stand-in enforcing the unique email and supabase_id indexes.
+    """
+
+    def __init__(self, error: Exception = None) -> None:
+        """
+        Initialize the fake.
+
+        :param error: Error raised by every insert, None to insert
+        """
+        self.users = []
+        self.error = error
+
+
+    async def add_user(self, user):
+        """
+        Insert a profile.
+        """
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        if any(existing['email'] == user['email'] or existing['supabase_id'] == user['supabase_id']
+               for existing in self.users):
+            raise AlreadyExistsError('User with this email already exists')
+        self.users.append(user)
+        return user
+
+
+    async def get_by_supabase_id(self, supabase_id):
+        """
+        Find a profile by Supabase ID.
+        """
+        return next((user for user in self.users if user['supabase_id'] == supabase_id), None)
+
+
+class RegisterUserTest(unittest.IsolatedAsyncioTestCase):
+    """
+    register_user compensation of the Supabase signup.
+    """
+
+    def setUp(self) -> None:
+        """
+        Wire fakes into the container.
+        """
+        self.auth = FakeAuth()
+        self.repository = FakeUserRepository()
+        container.update({
+            'supabase_client': SimpleNamespace(auth=self.auth),
+            'user_repository': self.repository,
+            'supabase_guard': CallGuard(breaker=CircuitBreaker(failure_threshold=5, recovery_seconds=30),
+                                        timeouts={}, default_timeout=5, retries=0, backoff_seconds=0),
+        })
+
+
+    @staticmethod
+    def user_data(email: str):
+        """
+        Build a registration payload.
+        """
+        return {'email': email, 'password': 'secret', 'name': 'Test User', 'phone': None, 'birthday': None}
+
+
+    async def test_duplicate_email_race_deletes_losers_supabase_users(self) -> None:
+        """
+        Concurrent signups of one email: one profile, the other Supabase users are deleted.
+        """
+        results = await asyncio.gather(*(register_user(self.user_data('race@test.local')) for _ in range(3)),
+                                       return_exceptions=True)
+
+        self.assertEqual(sum(1 for result in results if not isinstance(result, Exception)), 1)
+        self.assertEqual(sum(1 for result in results if isinstance(result, AlreadyExistsError)), 2)
+        self.assertEqual(len(self.repository.users), 1)
+        winner = self.repository.users[0]['supabase_id']
+        self.assertCountEqual(self.auth.deleted, [user_id for user_id in self.auth.created if user_id != winner])
+
+
+    async def test_repeated_signup_keeps_existing_account(self) -> None:
+        """
+        Signup returning the existing (unconfirmed) user of the email: the account is not deleted.
+        """
+        self.auth.existing['known@test.local'] = 'supabase-known'
+        self.repository.users.append({'supabase_id': 'supabase-known', 'email': 'known@test.local'})
+
+        with self.assertRaises(AlreadyExistsError):
+            await register_user(self.user_data('known@test.local'))
+
+        self.assertEqual(self.auth.deleted, [])
+        self.assertEqual(len(self.repository.users), 1)
+
+
+    async def test_failed_insert_deletes_supabase_user(self) -> None:
+        """
+        Insert failing for another reason: the Supabase user created by the call is deleted.
+        """
+        self.repository.error = MongoUnavailableError('down')
+
+        with self.assertRaises(MongoUnavailableError):
+            await register_user(self.user_data('down@test.local'))
+
+        self.assertEqual(self.auth.deleted, self.auth.created)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Unit tests of the Supabase call guard and circuit breaker.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.err.supabase_error import SupabaseError
+from opty_api.utils.context import set_request_deadline
+from opty_api.utils.resilience import CLOSED
+from opty_api.utils.resilience import HALF_OPEN
+from opty_api.utils.resilience import OPEN
+from opty_api.utils.resilience import CallGuard
+from opty_api.utils.resilience import CircuitBreaker
+
+import asyncio
+import httpx
+import time
+import unittest
+
+
+# --- CODE ---
+class CircuitBreakerTest(unittest.TestCase):
+    """
+    CircuitBreaker state transitions.
+    """
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        """
+        The threshold of consecutive failures opens the breaker, a success in between resets it.
+        """
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+
+    def test_half_open_lets_one_trial_through(self) -> None:
+        """
+        After the recovery delay a single trial call proceeds.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0)
+        breaker.record_failure()
+
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+
+
+    def test_failed_trial_reopens(self) -> None:
+        """
+        A failed trial opens the breaker again.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60)
+        breaker.record_failure()
+        breaker.opened_at -= 60
+
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+
+class CallGuardTest(unittest.IsolatedAsyncioTestCase):
+    """
+    CallGuard outcomes and their effect on the breaker.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a guard.
+        """
+        self.breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0)
+        self.guard = CallGuard(breaker=self.breaker, timeouts={}, default_timeout=5, retries=2, backoff_seconds=0)
+
+
+    async def test_cancelled_trial_releases_half_open_slot(self) -> None:
+        """
+        A trial call cancelled mid-flight frees the slot for the next one.
+        """
+        self.breaker.record_failure()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        trial = asyncio.create_task(self.guard.call('op', hang))
+        await started.wait()
+        self.assertTrue(self.breaker.trial_in_flight)
+
+        trial.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await trial
+
+        self.assertFalse(self.breaker.trial_in_flight)
+        self.assertTrue(self.breaker.allow())
+
+
+    async def test_deadline_timeout_does_not_count_as_failure(self) -> None:
+        """
+        A call cut short by the request deadline raises without opening the breaker.
+        """
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def run():
+            set_request_deadline(time.monotonic() + 0.01)
+            await self.guard.call('op', slow)
+
+        with self.assertRaises(DeadlineExceededError):
+            await asyncio.create_task(run())
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+    async def test_transient_failure_is_retried_when_idempotent(self) -> None:
+        """
+        Idempotent calls are retried after a transient failure.
+        """
+        self.breaker.failure_threshold = 5
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise httpx.ConnectError('refused')
+            return 'ok'
+
+        self.assertEqual(await self.guard.call('op', flaky, idempotent=True), 'ok')
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(self.breaker.failures, 0)
+
+
+    async def test_transient_failure_opens_breaker(self) -> None:
+        """
+        A transient failure of a non-idempotent call is raised and recorded, later calls fail fast.
+        """
+        async def down():
+            raise httpx.ConnectError('refused')
+
+        with self.assertRaises(httpx.ConnectError):
+            await self.guard.call('op', down)
+
+        self.breaker.recovery_seconds = 60
+        with self.assertRaises(SupabaseError):
+            await self.guard.call('op', down)
+
+
+if __name__ == '__main__':
+    unittest.main()
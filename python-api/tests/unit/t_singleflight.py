@@ -0,0 +1,139 @@
+"""
+Unit tests of call coalescing.
+"""
+
+# --- IMPORTS ---
+from opty_api.err.deadline_exceeded_error import DeadlineExceededError
+from opty_api.utils.context import get_request_deadline
+from opty_api.utils.context import set_request_deadline
+from opty_api.utils.singleflight import SingleFlight
+
+import asyncio
+import time
+import unittest
+
+
+# --- CODE ---
+async def within(seconds: float, func):
+    """
+    Await a coroutine function under a request deadline of its own.
+
+    :param seconds: Request budget
+    :param func: Zero-argument coroutine function
+
+    :returns: Outcome of the function
+    """
+    set_request_deadline(time.monotonic() + seconds)
+    return await func()
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    """
+    SingleFlight sharing, detaching and deadlines.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a group and a call gated by an event.
+        """
+        self.group = SingleFlight(timeout=5)
+        self.release = asyncio.Event()
+        self.started = 0
+
+
+    async def call(self):
+        """
+        Count the start and wait for the release.
+        """
+        self.started += 1
+        started = self.started
+        await self.release.wait()
+        return started
+
+
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        """
+        Callers of one key await the same call and get the same result.
+        """
+        waiters = [asyncio.create_task(self.group.do('key', self.call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await asyncio.gather(*waiters), [1, 1, 1])
+        self.assertEqual(self.group.stats(), {'calls': 1, 'coalesced': 2, 'in_flight': 0})
+
+
+    async def test_exception_reaches_every_waiter(self) -> None:
+        """
+        A failed call raises its exception in every waiter.
+        """
+        async def fail():
+            await self.release.wait()
+            raise ValueError('boom')
+
+        waiters = [asyncio.create_task(self.group.do('key', fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+
+    async def test_discard_detaches_call_in_flight(self) -> None:
+        """
+        After a discard the next caller starts a fresh call, earlier waiters keep theirs.
+        """
+        first = asyncio.create_task(self.group.do('key', self.call))
+        await asyncio.sleep(0)
+
+        self.group.discard(lambda key: key == 'key')
+        second = asyncio.create_task(self.group.do('key', self.call))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual((await first, await second), (1, 2))
+
+
+    async def test_cancelled_waiter_does_not_cancel_call(self) -> None:
+        """
+        Cancelling one waiter leaves the call running for the others.
+        """
+        cancelled = asyncio.create_task(self.group.do('key', self.call))
+        waiter = asyncio.create_task(self.group.do('key', self.call))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await waiter, 1)
+
+
+    async def test_waiter_stops_at_its_own_deadline(self) -> None:
+        """
+        A waiter out of budget raises, the call goes on for the waiters with budget left.
+        """
+        patient = asyncio.create_task(within(5, lambda: self.group.do('key', self.call)))
+        hasty = asyncio.create_task(within(0.01, lambda: self.group.do('key', self.call)))
+
+        with self.assertRaises(DeadlineExceededError):
+            await hasty
+
+        self.release.set()
+        self.assertEqual(await patient, 1)
+
+
+    async def test_call_runs_under_its_own_deadline(self) -> None:
+        """
+        The call does not inherit the deadline of the caller that started it.
+        """
+        async def deadline():
+            return get_request_deadline() - time.monotonic()
+
+        budget = await within(0.5, lambda: self.group.do('key', deadline))
+
+        self.assertGreater(budget, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()